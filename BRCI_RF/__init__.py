@@ -1,2 +1,6 @@
 from .brick_list import *
-from .functions import *
\ No newline at end of file
+from .functions import *
+from .property_codecs import *
+from .brick_columns import *
+from .brick_search import *
+from .peek import *
@@ -0,0 +1,782 @@
+import struct
+import weakref
+from collections.abc import ItemsView, Iterable, Mapping, MutableMapping, MutableSequence, Sequence, ValuesView
+from copy import deepcopy
+
+from .brick_list import br_brick_list
+from .functions import BrickProperties, _immutable_property_types, _shared_property_items, numpy_features_enabled
+
+if numpy_features_enabled:
+    from .functions import np
+
+
+# Name of the slots of BrickColumns whose brick was removed
+_removed_brick = object()
+
+# Value of a default property removed from a brick of BrickColumns. The same object once pickled
+class _DeletedProperty:
+
+    def __reduce__(self):
+        return '_deleted_property'
+
+    def __repr__(self) -> str:
+        return '<deleted property>'
+
+
+_deleted_property = _DeletedProperty()
+
+# Properties of a brick of BrickColumns that have their own column
+_transform_properties: tuple[str, ...] = ('gbn', 'Position', 'Rotation')
+
+
+# Values of a float32 column. Values too large for a float32 raise OverflowError (like struct would) instead of
+# becoming inf
+def _float32_values(values) -> 'np.ndarray':
+    values_f64 = np.asarray(values, dtype=np.float64)
+    with np.errstate(over='ignore'):
+        values_f32 = values_f64.astype(np.float32)
+    if np.any(np.isinf(values_f32) & np.isfinite(values_f64)):
+        raise OverflowError('float too large to pack with f format')
+    return values_f32
+
+
+# Values of one brick (3 floats) rounded to float32, faster than _float32_values() for one brick
+def _float32_vector(values) -> tuple[float, float, float]:
+    return struct.unpack('<3f', struct.pack('<3f', *values))
+
+
+# Bricks ([name, properties]) of BRCI.bricks stored by column instead of as a list and a dict per brick, see
+# BRCI(columnar=True). Requires NumPy. Brick types are interned in a uint16 column, positions and rotations are float32
+# columns (like in .brv files), and any other property is only stored for the bricks it was given to
+# (property key -> {slot of the brick: value}). Default values are shared by all bricks of a type, like create_brick().
+# It can be used (and modified) like any list of bricks: bricks are BrickColumnsRow, only made when they're accessed,
+# reading and writing the columns. write_brv() and load_brv() use the columns directly.
+# Removed bricks leave an empty slot, reused once there are too many of them or a brick is accessed by its index.
+class BrickColumns(MutableSequence):
+
+    def __init__(self, bricks: Iterable[list] = ()):
+        if not numpy_features_enabled:
+            raise ImportError('NumPy is required to store bricks by column.')
+        # Name of the brick of each slot, _removed_brick if it is empty
+        self._names: list = []
+        self._holes: int = 0
+        # Brick name -> slot of the brick, or slots if several bricks have this name
+        self._brick_slots: dict[any, int | list[int]] = {}
+        # Brick types, by brick type ID, and their default properties (gbn, Position and Rotation for unknown types)
+        self._brick_types: list[str] = []
+        self._brick_type_ids: dict[str, int] = {}
+        self._brick_type_defaults: list[dict] = []
+        # By slot. Arrays are larger than needed, so adding a brick doesn't copy them
+        self._type_ids: np.ndarray = np.zeros(0, dtype=np.uint16)
+        self._positions: np.ndarray = np.zeros((0, 3), dtype=np.float32)
+        self._rotations: np.ndarray = np.zeros((0, 3), dtype=np.float32)
+        # Property key -> slot -> value, for every property but gbn, Position and Rotation
+        self._properties: dict[str, dict[int, any]] = {}
+        # Slot -> brick made for it, while it is used
+        self._rows: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        # Incremented each time bricks or their properties are modified (see BrickSearchIndex)
+        self._changes: int = 0
+
+        for brick in bricks:
+            self.append(brick)
+
+    # --------------------------------------------------
+    # COLUMNS
+    # --------------------------------------------------
+
+    # Names of the bricks, in order
+    @property
+    def names(self) -> list:
+        self._compact()
+        return list(self._names)
+
+    # Brick types used (or once used) by the bricks. type_ids are indexes in it
+    @property
+    def brick_types(self) -> list[str]:
+        return list(self._brick_types)
+
+    # Brick type ID of each brick, (N,) uint16. Read-only view: valid until bricks are added or removed
+    @property
+    def type_ids(self) -> 'np.ndarray':
+        return self._column_view(self._type_ids)
+
+    # Position and rotation (X, Y, Z) of each brick, (N, 3) float32. Read-only views: valid until bricks are added or
+    # removed
+    @property
+    def positions(self) -> 'np.ndarray':
+        return self._column_view(self._positions)
+
+    @property
+    def rotations(self) -> 'np.ndarray':
+        return self._column_view(self._rotations)
+
+    def _column_view(self, column: 'np.ndarray') -> 'np.ndarray':
+        self._compact()
+        column_view = column[:len(self._names)]
+        column_view.flags.writeable = False
+        return column_view
+
+    # Property key -> index of the brick -> value, for every property but gbn, Position and Rotation, and only for the
+    # bricks it was given to: the others use the default value of their brick type
+    def property_columns(self) -> dict[str, dict[int, any]]:
+        self._compact()
+        property_columns: dict[str, dict[int, any]] = {}
+        for property_key, column in self._properties.items():
+            values: dict[int, any] = {slot: value for slot, value in column.items() if value is not _deleted_property}
+            if values:
+                property_columns[property_key] = values
+        return property_columns
+
+    # Every property key bricks may have: gbn, Position, Rotation, default properties of the brick types, and the other
+    # properties given to bricks
+    def property_keys(self) -> list[str]:
+        property_keys: dict[str, None] = dict.fromkeys(_transform_properties)
+        for default_properties in self._brick_type_defaults:
+            property_keys.update(dict.fromkeys(default_properties))
+        property_keys.update(dict.fromkeys(self._properties))
+        return list(property_keys)
+
+    # Indexes of the bricks having property_key, in order, and the value of each of them. Default values aren't copied
+    def property_values(self, property_key: str) -> tuple[list[int], list]:
+        self._compact()
+        brick_count: int = len(self._names)
+        if property_key == 'gbn':
+            return list(range(brick_count)), [self._brick_types[type_id]
+                                              for type_id in self._type_ids[:brick_count].tolist()]
+        if property_key in ('Position', 'Rotation'):
+            column: np.ndarray = self._positions if property_key == 'Position' else self._rotations
+            return list(range(brick_count)), column[:brick_count].tolist()
+
+        property_values: dict[int, any] = {slot: value for slot, value in self._properties.get(property_key, {}).items()
+                                           if value is not _deleted_property}
+        type_ids: list[int] = self._type_ids[:brick_count].tolist()
+        for slot in self.default_value_indexes(property_key).tolist():
+            property_values[slot] = self._brick_type_defaults[type_ids[slot]][property_key]
+        brick_indexes: list[int] = sorted(property_values)
+        return brick_indexes, [property_values[slot] for slot in brick_indexes]
+
+    # Indexes of the bricks using the default value of property_key: their brick type has it, and they weren't given
+    # another value (and didn't have it removed)
+    def default_value_indexes(self, property_key: str) -> 'np.ndarray':
+        self._compact()
+        default_type_ids: list[int] = [type_id for type_id, default_properties in enumerate(self._brick_type_defaults)
+                                       if property_key in default_properties]
+        uses_default: np.ndarray = np.isin(self._type_ids[:len(self._names)], default_type_ids)
+        column = self._properties.get(property_key)
+        if column:
+            uses_default[list(column.keys())] = False
+        return np.flatnonzero(uses_default)
+
+    # Adding bricks from their columns, without making anything per brick.
+    # names: name of each brick. brick_types: brick types type_ids refers to. type_ids: brick type of each brick, as an
+    # index in brick_types. positions and rotations: (N, 3) (X, Y, Z). properties: property key -> index of the brick
+    # in names -> value, for the bricks not using the default value (values are stored as they are)
+    def extend_columns(self, names: list, brick_types: list[str], type_ids, positions, rotations,
+                       properties: Mapping[str, Mapping[int, any]] | None = None) -> None:
+
+        brick_count: int = len(names)
+        type_ids = np.asarray(type_ids, dtype=np.int64).reshape(brick_count)
+        positions = _float32_values(positions).reshape(brick_count, 3)
+        rotations = _float32_values(rotations).reshape(brick_count, 3)
+        if brick_count and (type_ids.min() < 0 or type_ids.max() >= len(brick_types)):
+            raise IndexError(f'brick type ID out of range: there are {len(brick_types)} brick types.')
+
+        first_slot: int = len(self._names)
+        self._reserve(first_slot + brick_count)
+        brick_type_ids = np.asarray([self._type_id(brick_type) for brick_type in brick_types], dtype=np.uint16)
+        if brick_count:
+            self._type_ids[first_slot:first_slot + brick_count] = brick_type_ids[type_ids]
+        self._positions[first_slot:first_slot + brick_count] = positions
+        self._rotations[first_slot:first_slot + brick_count] = rotations
+
+        self._names.extend(names)
+        for slot in range(first_slot, first_slot + brick_count):
+            self._index_brick(self._names[slot], slot)
+
+        for property_key, values in (properties or {}).items():
+            if property_key in _transform_properties:
+                raise ValueError(f'{property_key} has its own column.')
+            column = self._properties.setdefault(property_key, {})
+            for brick_index, value in values.items():
+                column[first_slot + brick_index] = value
+
+    # --------------------------------------------------
+    # SLOTS
+    # --------------------------------------------------
+
+    def _type_id(self, brick_type: str) -> int:
+        type_id = self._brick_type_ids.get(brick_type)
+        if type_id is None:
+            type_id = self._brick_type_ids[brick_type] = len(self._brick_types)
+            self._brick_types.append(brick_type)
+            self._brick_type_defaults.append(br_brick_list.get(brick_type) or {
+                'gbn': brick_type, 'Position': [0.0, 0.0, 0.0], 'Rotation': [0.0, 0.0, 0.0]})
+        return type_id
+
+    # Making sure arrays have room for slot_count slots
+    def _reserve(self, slot_count: int) -> None:
+        capacity: int = len(self._type_ids)
+        if slot_count <= capacity:
+            return
+        capacity = max(slot_count, 2 * capacity, 64)
+        for column_name in ('_type_ids', '_positions', '_rotations'):
+            column: np.ndarray = getattr(self, column_name)
+            resized_column = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            resized_column[:len(column)] = column
+            setattr(self, column_name, resized_column)
+
+    # The brick of a slot, made if it isn't used anywhere
+    def _row(self, slot: int) -> 'BrickColumnsRow':
+        row = self._rows.get(slot)
+        if row is None:
+            row = self._rows[slot] = BrickColumnsRow(self, slot)
+        return row
+
+    # Rebuilding where the bricks of each name are
+    def reindex(self) -> None:
+        self._brick_slots = {}
+        for slot, brick_name in enumerate(self._names):
+            if brick_name is not _removed_brick:
+                self._index_brick(brick_name, slot)
+
+    def _index_brick(self, brick_name, slot: int) -> None:
+        self._changes += 1
+        brick_slots = self._brick_slots.get(brick_name)
+        if brick_slots is None:
+            self._brick_slots[brick_name] = slot
+        elif type(brick_slots) is int:
+            self._brick_slots[brick_name] = [brick_slots, slot]
+        else:
+            brick_slots.append(slot)
+
+    def _unindex_brick(self, brick_name, slot: int) -> None:
+        self._changes += 1
+        brick_slots = self._brick_slots.get(brick_name)
+        if brick_slots == slot:
+            del self._brick_slots[brick_name]
+        elif type(brick_slots) is list:
+            brick_slots.remove(slot)
+            if len(brick_slots) == 1:
+                self._brick_slots[brick_name] = brick_slots[0]
+
+    def _slots(self, brick_name) -> list[int]:
+        brick_slots = self._brick_slots.get(brick_name)
+        if brick_slots is None:
+            return []
+        return [brick_slots] if type(brick_slots) is int else list(brick_slots)
+
+    # Moving the bricks of old_slots to new_slots, in slot_count slots. Other slots are left empty
+    def _move_slots(self, old_slots: 'np.ndarray', new_slots: 'np.ndarray', slot_count: int) -> None:
+
+        capacity: int = max(slot_count, 64)
+        for column_name in ('_type_ids', '_positions', '_rotations'):
+            column: np.ndarray = getattr(self, column_name)
+            moved_column = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            moved_column[new_slots] = column[old_slots]
+            setattr(self, column_name, moved_column)
+
+        slot_table: dict[int, int] = dict(zip(old_slots.tolist(), new_slots.tolist()))
+        names: list = [_removed_brick] * slot_count
+        for old_slot, new_slot in slot_table.items():
+            names[new_slot] = self._names[old_slot]
+        self._names = names
+        self._holes = slot_count - len(slot_table)
+
+        self._properties = {property_key: {slot_table[slot]: value for slot, value in column.items()}
+                            for property_key, column in self._properties.items()}
+
+        rows = weakref.WeakValueDictionary()
+        for slot, row in list(self._rows.items()):
+            row._slot = slot_table[slot]
+            rows[row._slot] = row
+        self._rows = rows
+
+        self.reindex()
+
+    # Removing empty slots, so the slot of each brick is its index
+    def _compact(self) -> None:
+        if self._holes:
+            old_slots = np.asarray([slot for slot, brick_name in enumerate(self._names)
+                                    if brick_name is not _removed_brick], dtype=np.int64)
+            self._move_slots(old_slots, np.arange(len(old_slots)), len(old_slots))
+
+    # Getting (name, brick type ID, position, rotation, properties, deleted default properties) of a brick, checking
+    # them before anything is modified
+    def _prepare(self, brick) -> tuple:
+
+        brick_name, brick_properties = brick[0], brick[1]
+        if isinstance(brick_properties, BrickColumnsProperties):
+            brick_properties = brick_properties.copy()
+
+        type_id: int = self._type_id(brick_properties['gbn'])
+        position = _float32_vector(brick_properties['Position'])
+        rotation = _float32_vector(brick_properties['Rotation'])
+
+        # Default properties of create_brick() are already the ones of the brick type
+        if type(brick_properties) is BrickProperties and brick_properties._defaults is self._brick_type_defaults[type_id]:
+            property_items = list(brick_properties._overrides.items())
+            deleted_properties = list(brick_properties._deleted or ())
+        else:
+            property_items = list(_shared_property_items(brick_properties))
+            deleted_properties = []
+
+        return brick_name, type_id, position, rotation, property_items, deleted_properties
+
+    def _set_brick(self, slot: int, type_id: int, position: tuple[float, float, float],
+                   rotation: tuple[float, float, float],
+                   property_items: list[tuple[str, any]], deleted_properties: list[str]) -> None:
+        self._changes += 1
+        self._type_ids[slot] = type_id
+        self._positions[slot] = position
+        self._rotations[slot] = rotation
+        for property_key, property_value in property_items:
+            if property_key not in _transform_properties:
+                self._set_property(slot, property_key, property_value)
+        for property_key in deleted_properties:
+            self._properties.setdefault(property_key, {})[slot] = _deleted_property
+
+    # Putting a brick (see _prepare()) in an empty slot
+    def _fill(self, slot: int, prepared_brick: tuple) -> None:
+        brick_name = prepared_brick[0]
+        self._names[slot] = brick_name
+        self._holes -= 1
+        self._index_brick(brick_name, slot)
+        self._set_brick(slot, *prepared_brick[1:])
+
+    # Emptying the slot of a brick. The brick made for it (if any) keeps a copy of it
+    def _empty_slot(self, slot: int) -> None:
+        row = self._rows.pop(slot, None)
+        if row is not None:
+            row._detach()
+        for column in self._properties.values():
+            column.pop(slot, None)
+        self._unindex_brick(self._names[slot], slot)
+        self._names[slot] = _removed_brick
+        self._holes += 1
+
+    # Inserting bricks (see _prepare()) at index. Slots must be compacted
+    def _insert_bricks(self, index: int, prepared_bricks: list[tuple]) -> None:
+        slot_count: int = len(self._names)
+        if index < slot_count:
+            old_slots = np.arange(slot_count)
+            self._move_slots(old_slots, old_slots + len(prepared_bricks) * (old_slots >= index),
+                             slot_count + len(prepared_bricks))
+        else:
+            self._reserve(slot_count + len(prepared_bricks))
+            self._names.extend([_removed_brick] * len(prepared_bricks))
+            self._holes += len(prepared_bricks)
+        for i, prepared_brick in enumerate(prepared_bricks):
+            self._fill(index + i, prepared_brick)
+
+    # --------------------------------------------------
+    # PROPERTIES OF A BRICK (see BrickColumnsProperties)
+    # --------------------------------------------------
+
+    def _get_property(self, slot: int, property_key: str):
+
+        if property_key == 'gbn':
+            return self._brick_types[self._type_ids[slot]]
+        if property_key == 'Position':
+            return self._positions[slot].tolist()
+        if property_key == 'Rotation':
+            return self._rotations[slot].tolist()
+
+        column = self._properties.get(property_key)
+        if column is not None and slot in column:
+            property_value = column[slot]
+            if property_value is _deleted_property:
+                raise KeyError(property_key)
+            return property_value
+
+        default_properties: dict = self._brick_type_defaults[self._type_ids[slot]]
+        if property_key not in default_properties:
+            raise KeyError(property_key)
+        property_value = default_properties[property_key]
+        # Like BrickProperties: default values that may be modified in place are copied for the brick
+        if type(property_value) not in _immutable_property_types:
+            property_value = self._properties.setdefault(property_key, {})[slot] = deepcopy(property_value)
+        return property_value
+
+    def _has_property(self, slot: int, property_key: str) -> bool:
+        if property_key in _transform_properties:
+            return True
+        column = self._properties.get(property_key)
+        if column is not None and slot in column:
+            return column[slot] is not _deleted_property
+        return property_key in self._brick_type_defaults[self._type_ids[slot]]
+
+    def _set_property(self, slot: int, property_key: str, property_value) -> None:
+
+        self._changes += 1
+        if property_key == 'gbn':
+            self._type_ids[slot] = self._type_id(property_value)
+            return
+        if property_key == 'Position':
+            self._positions[slot] = _float32_vector(property_value)
+            return
+        if property_key == 'Rotation':
+            self._rotations[slot] = _float32_vector(property_value)
+            return
+
+        column = self._properties.get(property_key)
+
+        # Default values that can't be modified in place aren't stored
+        default_properties: dict = self._brick_type_defaults[self._type_ids[slot]]
+        if (type(property_value) in _immutable_property_types and property_key in default_properties
+                and type(default_properties[property_key]) is type(property_value)
+                and default_properties[property_key] == property_value):
+            if column is not None:
+                column.pop(slot, None)
+            return
+
+        if column is None:
+            column = self._properties[property_key] = {}
+        column[slot] = property_value
+
+    def _del_property(self, slot: int, property_key: str) -> None:
+        if property_key in _transform_properties:
+            raise TypeError(f"{property_key} can't be removed from a brick stored by column.")
+        if not self._has_property(slot, property_key):
+            raise KeyError(property_key)
+        self._changes += 1
+        if property_key in self._brick_type_defaults[self._type_ids[slot]]:
+            self._properties.setdefault(property_key, {})[slot] = _deleted_property
+        else:
+            del self._properties[property_key][slot]
+
+    # Properties of a brick, in the same order as BrickProperties: default properties first, then the other ones.
+    # Like _get_property(), default values that may be modified in place are copied for the brick, unless
+    # copy_defaults is False (values are then shared with other bricks and must only be read)
+    def _property_items(self, slot: int, copy_defaults: bool = True):
+
+        type_id: int = int(self._type_ids[slot])
+        default_properties: dict = self._brick_type_defaults[type_id]
+        properties: dict[str, dict[int, any]] = self._properties
+
+        for property_key, property_value in default_properties.items():
+            if property_key in _transform_properties:
+                yield property_key, self._get_property(slot, property_key)
+                continue
+            column = properties.get(property_key)
+            if column is not None and slot in column:
+                property_value = column[slot]
+                if property_value is _deleted_property:
+                    continue
+            elif copy_defaults and type(property_value) not in _immutable_property_types:
+                property_value = properties.setdefault(property_key, {})[slot] = deepcopy(property_value)
+            yield property_key, property_value
+
+        for property_key, column in properties.items():
+            if slot in column and property_key not in default_properties:
+                yield property_key, column[slot]
+
+    # Copy of the properties of a brick, as BrickProperties
+    def _brick_properties(self, slot: int) -> BrickProperties:
+
+        overrides: dict = {'Position': self._positions[slot].tolist(), 'Rotation': self._rotations[slot].tolist()}
+        deleted_properties: set[str] = set()
+        for property_key, column in self._properties.items():
+            if slot in column:
+                if column[slot] is _deleted_property:
+                    deleted_properties.add(property_key)
+                else:
+                    overrides[property_key] = column[slot]
+
+        brick_properties = BrickProperties(self._brick_type_defaults[self._type_ids[slot]], overrides)
+        brick_properties._deleted = deleted_properties or None
+        return brick_properties
+
+    def _rename(self, slot: int, brick_name) -> None:
+        self._unindex_brick(self._names[slot], slot)
+        self._names[slot] = brick_name
+        self._index_brick(brick_name, slot)
+
+    def _replace_properties(self, slot: int, brick_properties) -> None:
+        prepared_brick = self._prepare([self._names[slot], brick_properties])
+        for column in self._properties.values():
+            column.pop(slot, None)
+        self._set_brick(slot, *prepared_brick[1:])
+
+    # --------------------------------------------------
+    # LIST OF BRICKS
+    # --------------------------------------------------
+
+    # Bricks named brick_name, in order
+    def find(self, brick_name) -> list['BrickColumnsRow']:
+        return [self._row(slot) for slot in sorted(self._slots(brick_name))]
+
+    # Bricks named any of brick_names, in order
+    def find_any(self, brick_names: Iterable) -> list['BrickColumnsRow']:
+        return [self._row(slot) for slot in sorted(slot for brick_name in set(brick_names)
+                                                   for slot in self._slots(brick_name))]
+
+    # Removing a brick (the brick itself, not an equal one). It keeps a copy of its name and properties
+    def discard(self, brick: 'BrickColumnsRow') -> None:
+        if not isinstance(brick, BrickColumnsRow) or brick._columns is not self:
+            raise ValueError(f'{brick[0]!r} is not in the list.')
+        self._empty_slot(brick._slot)
+        if self._holes > 64 and self._holes * 2 > len(self._names):
+            self._compact()
+
+    def remove(self, value) -> None:
+        if isinstance(value, BrickColumnsRow) and value._columns is self:
+            self.discard(value)
+        else:
+            super().remove(value)
+
+    def __len__(self) -> int:
+        return len(self._names) - self._holes
+
+    def __getitem__(self, index: int | slice):
+        self._compact()
+        if isinstance(index, slice):
+            slots = range(len(self._names))[index]
+            slot_table: dict[int, int] = {slot: i for i, slot in enumerate(slots)}
+            brick_columns = BrickColumns()
+            brick_columns.extend_columns(
+                [self._names[slot] for slot in slots], self._brick_types, self._type_ids[slots],
+                self._positions[slots], self._rotations[slots],
+                {property_key: {slot_table[slot]: value for slot, value in column.items() if slot in slot_table}
+                 for property_key, column in self._properties.items()})
+            return brick_columns
+        return self._row(range(len(self._names))[index])
+
+    def __setitem__(self, index: int | slice, value) -> None:
+        self._compact()
+
+        if isinstance(index, slice):
+            slots = range(len(self._names))[index]
+            prepared_bricks: list[tuple] = [self._prepare(brick) for brick in value]
+            if slots.step == 1:
+                for slot in slots:
+                    self._empty_slot(slot)
+                self._compact()
+                self._insert_bricks(slots.start, prepared_bricks)
+            else:
+                if len(prepared_bricks) != len(slots):
+                    raise ValueError(f'attempt to assign sequence of size {len(prepared_bricks)} '
+                                     f'to extended slice of size {len(slots)}')
+                for slot, prepared_brick in zip(slots, prepared_bricks):
+                    self._empty_slot(slot)
+                    self._fill(slot, prepared_brick)
+            return
+
+        slot: int = range(len(self._names))[index]
+        prepared_brick = self._prepare(value)
+        self._empty_slot(slot)
+        self._fill(slot, prepared_brick)
+
+    def __delitem__(self, index: int | slice) -> None:
+        self._compact()
+        if isinstance(index, slice):
+            for slot in range(len(self._names))[index]:
+                self._empty_slot(slot)
+        else:
+            self._empty_slot(range(len(self._names))[index])
+
+    def insert(self, index: int, value: list) -> None:
+        if index >= len(self):
+            self.append(value)
+            return
+        self._compact()
+        self._insert_bricks(max(0, len(self._names) + index) if index < 0 else index, [self._prepare(value)])
+
+    def append(self, value: list) -> None:
+        prepared_brick = self._prepare(value)
+        slot: int = len(self._names)
+        self._reserve(slot + 1)
+        self._names.append(_removed_brick)
+        self._holes += 1
+        self._fill(slot, prepared_brick)
+
+    def clear(self) -> None:
+        for slot in list(self._rows.keys()):
+            self._empty_slot(slot)
+        self._names = []
+        self._holes = 0
+        self._brick_slots = {}
+        self._properties = {}
+        self._changes += 1
+
+    def __iter__(self):
+        slot: int = 0
+        while slot < len(self._names):
+            if self._names[slot] is not _removed_brick:
+                yield self._row(slot)
+            slot += 1
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MutableSequence) and list(self) == list(other)
+
+    def __reduce__(self):
+        self._compact()
+        brick_count: int = len(self._names)
+        return BrickColumns._from_columns, (self._names, self._brick_types, self._type_ids[:brick_count],
+                                            self._positions[:brick_count], self._rotations[:brick_count],
+                                            self._properties)
+
+    @staticmethod
+    def _from_columns(names: list, brick_types: list[str], type_ids, positions, rotations,
+                      properties: dict[str, dict[int, any]]) -> 'BrickColumns':
+        brick_columns = BrickColumns()
+        brick_columns.extend_columns(names, brick_types, type_ids, positions, rotations, properties)
+        return brick_columns
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+# A brick of BrickColumns, used like [name, properties]: brick[1] is a BrickColumnsProperties reading and writing the
+# columns. Once removed from them, it keeps a copy of its name and properties
+class BrickColumnsRow(Sequence):
+
+    __slots__ = ('_columns', '_slot', '_brick', '__weakref__')
+
+    def __init__(self, brick_columns: BrickColumns, slot: int):
+        self._columns: BrickColumns | None = brick_columns
+        self._slot: int = slot
+        # [name, BrickProperties] once removed from the columns
+        self._brick: list | None = None
+
+    def _detach(self) -> None:
+        self._brick = [self._columns._names[self._slot], self._columns._brick_properties(self._slot)]
+        self._columns = None
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, index: int | slice):
+        if self._columns is None:
+            return self._brick[index]
+        if isinstance(index, slice):
+            return [self[i] for i in range(2)[index]]
+        if range(2)[index] == 0:
+            return self._columns._names[self._slot]
+        return BrickColumnsProperties(self)
+
+    def __setitem__(self, index: int, value) -> None:
+        if self._columns is None:
+            self._brick[index] = value
+        elif range(2)[index] == 0:
+            self._columns._rename(self._slot, value)
+        else:
+            self._columns._replace_properties(self._slot, value)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, (list, BrickColumnsRow)) and list(self) == list(other)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+# Properties of a brick of BrickColumns. It can be used like a dict, and keeps the same order as BrickProperties.
+# Like with BrickProperties, default values that may be modified in place are copied for the brick when accessed with
+# brick[key], but Position and Rotation are returned as new lists: assign them instead of modifying them in place.
+class BrickColumnsProperties(MutableMapping):
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row: BrickColumnsRow):
+        self._row: BrickColumnsRow = row
+
+    def __getitem__(self, key):
+        row = self._row
+        if row._columns is None:
+            return row._brick[1][key]
+        return row._columns._get_property(row._slot, key)
+
+    def __setitem__(self, key, value) -> None:
+        row = self._row
+        if row._columns is None:
+            row._brick[1][key] = value
+        else:
+            row._columns._set_property(row._slot, key, value)
+
+    def __delitem__(self, key) -> None:
+        row = self._row
+        if row._columns is None:
+            del row._brick[1][key]
+        else:
+            row._columns._del_property(row._slot, key)
+
+    def __contains__(self, key) -> bool:
+        row = self._row
+        if row._columns is None:
+            return key in row._brick[1]
+        return row._columns._has_property(row._slot, key)
+
+    def __iter__(self):
+        for key, _ in self._shared_items():
+            yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._shared_items())
+
+    def items(self) -> ItemsView:
+        return _BrickColumnsPropertiesItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _BrickColumnsPropertiesValuesView(self)
+
+    # Same as items(), but default values are never copied (see BrickProperties._shared_items())
+    def _shared_items(self):
+        row = self._row
+        if row._columns is None:
+            return _shared_property_items(row._brick[1])
+        return row._columns._property_items(row._slot, copy_defaults=False)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self._shared_items()) == dict(_shared_property_items(other))
+
+    # Copy of the properties, as BrickProperties
+    def copy(self) -> BrickProperties:
+        row = self._row
+        if row._columns is None:
+            return row._brick[1].copy()
+        return row._columns._brick_properties(row._slot)
+
+    def __deepcopy__(self, memo: dict) -> BrickProperties:
+        return deepcopy(self.copy(), memo)
+
+    # Same as with dicts: brick | properties, properties | brick and brick |= properties
+    def __or__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.copy() | other
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(other) | {key: self[key] for key in self}
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        return self.copy().__reduce__()
+
+    def __repr__(self) -> str:
+        return repr(dict(self._shared_items()))
+
+
+class _BrickColumnsPropertiesItemsView(ItemsView):
+
+    def __iter__(self):
+        row = self._mapping._row
+        if row._columns is None:
+            yield from row._brick[1].items()
+        else:
+            yield from row._columns._property_items(row._slot)
+
+
+class _BrickColumnsPropertiesValuesView(ValuesView):
+
+    def __iter__(self):
+        for _, value in self._mapping.items():
+            yield value
@@ -0,0 +1,443 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, MutableSequence
+from math import floor, isfinite
+from numbers import Real
+from operator import itemgetter
+
+from .brick_columns import BrickColumns
+from .functions import BrickList, BrickProperties, _shared_property_items
+
+
+# Marks lists in the keys of _PropertyIndex.equal_bricks, so [1, 2] and (1, 2) don't have the same key
+class _ListKey:
+    pass
+
+
+# Value standing for property_value in dict keys: lists become tuples (equal lists give equal keys).
+# Raises TypeError if it can't be hashed
+def _value_key(property_value):
+    if type(property_value) is list:
+        value_key = _ListKey, tuple(property_value)
+        try:
+            hash(value_key)
+        except TypeError:
+            # Lists in the list
+            return _ListKey, tuple(_value_key(item) for item in property_value)
+        return value_key
+    hash(property_value)
+    return property_value
+
+
+# Value of the properties of a brick missing a property
+_missing = object()
+
+
+# Value of a property of a brick (BrickProperties or dict), _missing if it doesn't have it. Unlike
+# brick_properties[property_key], default values of BrickProperties aren't copied
+def _property_value(brick_properties: BrickProperties | dict, property_key: str):
+    if type(brick_properties) is dict:
+        return brick_properties.get(property_key, _missing)
+    property_value = brick_properties._overrides.get(property_key, _missing)
+    if property_value is _missing and property_key in brick_properties._defaults and \
+            not (brick_properties._deleted and property_key in brick_properties._deleted):
+        property_value = brick_properties._defaults[property_key]
+    return property_value
+
+
+# Numbers compared with a tolerance by BRCI.search_brick(). Other values are compared with ==
+def _is_number(property_value) -> bool:
+    return type(property_value) in (int, float)
+
+
+# Where the values of a property are, by index of the brick in BrickSearchIndex.bricks
+class _PropertyIndex:
+
+    __slots__ = ('bricks', 'number_values', 'number_bricks', 'equal_bricks', 'other_values')
+
+    # brick_indexes: bricks with the property, in order. property_values: value of the property for each of them
+    def __init__(self, brick_indexes: list[int] | None = None, property_values: list | None = None):
+        # Bricks that have the property
+        self.bricks: list[int] = brick_indexes or []
+        # Key of any value but numbers (see _value_key()) -> bricks with this value
+        self.equal_bricks: dict[any, list[int]] = {}
+        # Values that can't be hashed (e.g. BrickInput()), and their brick
+        self.other_values: list[tuple[any, int]] = []
+        # Numbers (int and float), sorted, and the brick of each of them
+        self.number_values: list[int | float] = []
+        self.number_bricks: list[int] = []
+
+        # Key of the lists seen, by id: default values are the same list for every brick of a type
+        list_keys: dict[int, any] = {}
+        for brick_index, property_value in zip(self.bricks, property_values or ()):
+            value_type = type(property_value)
+            if value_type is int or value_type is float:
+                # NaN isn't equal to anything
+                if property_value == property_value:
+                    self.number_values.append(property_value)
+                    self.number_bricks.append(brick_index)
+                continue
+            try:
+                if value_type is list:
+                    value_key = list_keys.get(id(property_value))
+                    if value_key is None:
+                        value_key = list_keys[id(property_value)] = _value_key(property_value)
+                else:
+                    value_key = _value_key(property_value)
+            except TypeError:
+                self.other_values.append((property_value, brick_index))
+                continue
+            equal_bricks = self.equal_bricks.get(value_key)
+            if equal_bricks is None:
+                self.equal_bricks[value_key] = [brick_index]
+            else:
+                equal_bricks.append(brick_index)
+
+        number_order: list[int] = sorted(range(len(self.number_values)), key=self.number_values.__getitem__)
+        self.number_values = [self.number_values[i] for i in number_order]
+        self.number_bricks = [self.number_bricks[i] for i in number_order]
+
+    # Bricks whose value is a number between minimum and maximum (included)
+    def between(self, minimum: int | float, maximum: int | float) -> set[int]:
+        if not minimum <= maximum:
+            return set()
+        return set(self.number_bricks[bisect_left(self.number_values, minimum):
+                                      bisect_right(self.number_values, maximum)])
+
+    # Bricks whose value is equal to property_value. Numbers are equal if they're within
+    # tolerance_factor * property_value of each other
+    def matching(self, property_value, tolerance_factor: float) -> set[int]:
+        if _is_number(property_value):
+            tolerance: float = tolerance_factor * abs(property_value)
+            matching_bricks: set[int] = self.between(property_value - tolerance, property_value + tolerance)
+        elif isinstance(property_value, Real):
+            # bool or NumPy number, compared with == to numbers (True == 1)
+            matching_bricks = self.between(property_value, property_value)
+        else:
+            matching_bricks = set()
+
+        try:
+            matching_bricks.update(self.equal_bricks.get(_value_key(property_value), ()))
+        except TypeError:
+            # Values that can't be hashed are only equal to values that can't be hashed either
+            pass
+        matching_bricks.update(brick_index for other_value, brick_index in self.other_values
+                               if other_value == property_value)
+        return matching_bricks
+
+
+# Indexes of a list of bricks used by BRCI.search_brick(): where the bricks of each name are, and for each property,
+# which bricks have it and with which value (numbers sorted, to find numbers in a range, other values by key, see
+# _value_key()). They're built the first time they're needed, and are only valid as long as bricks don't change (see
+# is_valid()). Sets of brick indexes (by index in bricks) are then combined to evaluate search criteria.
+class BrickSearchIndex:
+
+    def __init__(self, bricks: MutableSequence):
+        self.bricks: MutableSequence = bricks
+        if isinstance(bricks, (BrickList, BrickColumns)):
+            # Filling the holes of removed bricks now, as it counts as a modification
+            bricks._compact()
+        # Modifications of bricks counted by BrickList, LazyBrickList and BrickColumns. None: never valid
+        self._changes: int | None = getattr(bricks, '_changes', None)
+        self._brick_count: int = len(bricks)
+        # Brick name -> indexes of the bricks with this name
+        self._brick_names: dict[any, list[int]] | None = None
+        # Property key -> _PropertyIndex. Keys not in the dict weren't indexed yet, unless _all_properties is True
+        self._properties: dict[str, _PropertyIndex] = {}
+        self._all_properties: bool = False
+
+    # If bricks weren't added, replaced or removed since the indexes were made. Bricks modified in place
+    # (brick[1][key] = value) can't be seen: BRCI.mark_brick_dirty() drops the indexes instead
+    def is_valid(self) -> bool:
+        return self._changes is not None and self.bricks._changes == self._changes
+
+    # Every brick
+    def every_brick(self) -> set[int]:
+        return set(range(self._brick_count))
+
+    # Bricks with the given indexes, in order
+    def get_bricks(self, brick_indexes: Iterable[int]) -> list[list]:
+        return [self.bricks[brick_index] for brick_index in sorted(brick_indexes)]
+
+    def _property_indexes(self, property_keys: Iterable[str] | None) -> list[_PropertyIndex]:
+        # Indexing every property not indexed yet in one pass over the bricks. property_keys None: every property
+        if property_keys is None:
+            missing_keys: set[str] | None = None if not self._all_properties else set()
+        else:
+            property_keys = list(property_keys)
+            missing_keys = set() if self._all_properties else \
+                {property_key for property_key in property_keys if property_key not in self._properties}
+
+        if isinstance(self.bricks, BrickColumns) and (missing_keys is None or missing_keys):
+            # Read from the columns, without making any brick
+            for property_key in self.bricks.property_keys() if missing_keys is None else missing_keys:
+                if property_key not in self._properties:
+                    self._properties[property_key] = _PropertyIndex(*self.bricks.property_values(property_key))
+            if missing_keys is None:
+                self._all_properties = True
+        elif missing_keys is None or missing_keys:
+            # Property key -> bricks with the property, and their value
+            brick_indexes: dict[str, list[int]] = {}
+            brick_values: dict[str, list] = {}
+            indexed_keys: dict[str, _PropertyIndex] = self._properties
+            for brick_index, brick in enumerate(self.bricks):
+                brick_properties = brick[1]
+                # Only looking up the missing properties if there are a few of them
+                if missing_keys is not None and type(brick_properties) in (BrickProperties, dict):
+                    brick_items = ((property_key, _property_value(brick_properties, property_key))
+                                   for property_key in missing_keys)
+                else:
+                    brick_items = _shared_property_items(brick_properties)
+                for property_key, property_value in brick_items:
+                    if property_value is _missing:
+                        continue
+                    if missing_keys is None:
+                        if property_key in indexed_keys:
+                            continue
+                    elif property_key not in missing_keys:
+                        continue
+                    property_bricks = brick_indexes.get(property_key)
+                    if property_bricks is None:
+                        brick_indexes[property_key] = [brick_index]
+                        brick_values[property_key] = [property_value]
+                    else:
+                        property_bricks.append(brick_index)
+                        brick_values[property_key].append(property_value)
+            for property_key, property_bricks in brick_indexes.items():
+                self._properties[property_key] = _PropertyIndex(property_bricks, brick_values[property_key])
+            if missing_keys is None:
+                self._all_properties = True
+            else:
+                # Properties no brick has
+                for property_key in missing_keys - brick_values.keys():
+                    self._properties[property_key] = _PropertyIndex()
+
+        if property_keys is None:
+            return list(self._properties.values())
+        return [self._properties.get(property_key) or _PropertyIndex() for property_key in property_keys]
+
+    # Bricks named any of brick_names
+    def named(self, brick_names: Iterable) -> set[int]:
+        if self._brick_names is None:
+            self._brick_names = {}
+            for brick_index, brick_name in enumerate(self.bricks.names if isinstance(self.bricks, BrickColumns) else
+                                                     (brick[0] for brick in self.bricks)):
+                self._brick_names.setdefault(brick_name, []).append(brick_index)
+        return {brick_index for brick_name in brick_names for brick_index in self._brick_names.get(brick_name, ())}
+
+    # Bricks of any of brick_types
+    def of_type(self, brick_types: Iterable[str]) -> set[int]:
+        gbn_index: _PropertyIndex = self._property_indexes(['gbn'])[0]
+        return {brick_index for brick_type in brick_types
+                for brick_index in gbn_index.equal_bricks.get(brick_type, ())}
+
+    # Bricks having any of property_keys
+    def having_property(self, property_keys: Iterable[str]) -> set[int]:
+        return {brick_index for property_index in self._property_indexes(property_keys)
+                for brick_index in property_index.bricks}
+
+    # Bricks having any property equal to property_value
+    def having_value(self, property_value, tolerance_factor: float) -> set[int]:
+        matching_bricks: set[int] = set()
+        for property_index in self._property_indexes(None):
+            matching_bricks |= property_index.matching(property_value, tolerance_factor)
+        return matching_bricks
+
+    # Bricks having any property with a number between minimum and maximum
+    def having_value_in_range(self, minimum: int | float, maximum: int | float) -> set[int]:
+        matching_bricks: set[int] = set()
+        for property_index in self._property_indexes(None):
+            matching_bricks |= property_index.between(minimum, maximum)
+        return matching_bricks
+
+    # Bricks having every property of properties, with this value
+    def having_items(self, properties: dict[str, any], tolerance_factor: float) -> set[int]:
+        matching_bricks: set[int] | None = None
+        for property_index, property_value in zip(self._property_indexes(properties.keys()), properties.values()):
+            property_bricks = property_index.matching(property_value, tolerance_factor)
+            matching_bricks = property_bricks if matching_bricks is None else matching_bricks & property_bricks
+        return self.every_brick() if matching_bricks is None else matching_bricks
+
+    # Bricks having every property of properties, with a number between the 2 given numbers
+    def having_items_in_range(self, properties: dict[str, tuple[int | float, int | float]]) -> set[int]:
+        matching_bricks: set[int] | None = None
+        for property_index, (minimum, maximum) in zip(self._property_indexes(properties.keys()), properties.values()):
+            property_bricks = property_index.between(minimum, maximum)
+            matching_bricks = property_bricks if matching_bricks is None else matching_bricks & property_bricks
+        return self.every_brick() if matching_bricks is None else matching_bricks
+
+
+# Position of a brick as 3 floats, None if it doesn't have any (or if there is NaN or infinity in it)
+def _brick_position(brick: list) -> tuple[float, float, float] | None:
+    brick_properties = brick[1]
+    position = _property_value(brick_properties, 'Position') \
+        if type(brick_properties) in (BrickProperties, dict) else brick_properties.get('Position', _missing)
+    if position is _missing:
+        return None
+    position = (float(position[0]), float(position[1]), float(position[2]))
+    if not (isfinite(position[0]) and isfinite(position[1]) and isfinite(position[2])):
+        return None
+    return position
+
+
+# Squared distance between 2 positions
+def _squared_distance(position: tuple[float, float, float], other_position: tuple[float, float, float]) -> float:
+    return (position[0] - other_position[0]) ** 2 + (position[1] - other_position[1]) ** 2 + \
+        (position[2] - other_position[2]) ** 2
+
+
+# Where the bricks of a list of bricks are, used by BRCI.bricks_in_box(), BRCI.bricks_in_radius() and
+# BRCI.nearest_brick(). Space is cut into cubes of cell_size (uniform grid), and bricks are kept in the cube their
+# position is in, so only the cubes around a query are looked at. Bricks can be added, moved and removed one by one.
+# Like BrickSearchIndex, it's only valid as long as bricks don't change any other way (see is_valid()). Positions
+# modified in place (brick[1]['Position'] = ...) can't be seen: BRCI.mark_brick_dirty() moves these bricks.
+class BrickSpatialIndex:
+
+    def __init__(self, bricks: MutableSequence, cell_size: float = 100.0):
+        self.bricks: MutableSequence = bricks
+        self.cell_size: float = cell_size
+        # Cell (3 ints) -> id of the brick -> brick
+        self._cells: dict[tuple[int, int, int], dict[int, list]] = {}
+        # id of the brick -> (position of the brick, order of the brick, cell), order being its place in bricks
+        self._entries: dict[int, tuple[tuple[float, float, float], int, tuple[int, int, int]]] = {}
+        self._next_order: int = 0
+        for brick in bricks:
+            self.add(brick)
+        self.synchronize()
+
+    # If bricks weren't modified since synchronize() (other than by add(), move() and remove())
+    def is_valid(self) -> bool:
+        return self._changes is not None and getattr(self.bricks, '_changes', None) == self._changes
+
+    # Telling the index it's up to date with bricks
+    def synchronize(self) -> None:
+        self._changes: int | None = getattr(self.bricks, '_changes', None)
+
+    # Bricks are found by id(), which changes once pickled: the unpickled index isn't valid, and is made again
+    def __getstate__(self) -> dict:
+        return {'bricks': self.bricks, 'cell_size': self.cell_size, '_cells': {}, '_entries': {}, '_next_order': 0,
+                '_changes': None}
+
+    def _cell(self, position: tuple[float, float, float]) -> tuple[int, int, int]:
+        cell_size: float = self.cell_size
+        return floor(position[0] / cell_size), floor(position[1] / cell_size), floor(position[2] / cell_size)
+
+    # Adding a brick (after the others). Bricks without a position (or with NaN or infinity in it) aren't added
+    def add(self, brick: list) -> None:
+        self._add(brick, self._next_order)
+        self._next_order += 1
+
+    def _add(self, brick: list, order: int) -> None:
+        position = _brick_position(brick)
+        if position is None:
+            return
+        cell = self._cell(position)
+        self._entries[id(brick)] = position, order, cell
+        cell_bricks = self._cells.get(cell)
+        if cell_bricks is None:
+            self._cells[cell] = {id(brick): brick}
+        else:
+            cell_bricks[id(brick)] = brick
+
+    # Removing a brick (the brick itself, not an equal one). Does nothing if it isn't in the index
+    def remove(self, brick: list) -> None:
+        entry = self._entries.pop(id(brick), None)
+        if entry is None:
+            return
+        cell_bricks = self._cells[entry[2]]
+        del cell_bricks[id(brick)]
+        if not cell_bricks:
+            del self._cells[entry[2]]
+
+    # Reading the position of a brick again, once it was modified
+    def move(self, brick: list) -> None:
+        entry = self._entries.get(id(brick))
+        if entry is None:
+            self.add(brick)
+            return
+        self.remove(brick)
+        self._add(brick, entry[1])
+
+    # Cells overlapping the box between minimum and maximum (cells of bricks only, if it has more cells than that)
+    def _cells_in_box(self, minimum: Iterable[float], maximum: Iterable[float]):
+        minimum_cell, maximum_cell = self._cell(tuple(minimum)), self._cell(tuple(maximum))
+        cell_count: int = 1
+        for minimum_coordinate, maximum_coordinate in zip(minimum_cell, maximum_cell):
+            cell_count *= max(0, maximum_coordinate - minimum_coordinate + 1)
+        if cell_count > len(self._cells):
+            return [cell_bricks for cell, cell_bricks in self._cells.items()
+                    if all(minimum_cell[axis] <= cell[axis] <= maximum_cell[axis] for axis in range(3))]
+        cells = self._cells
+        return [cells[(x, y, z)]
+                for x in range(minimum_cell[0], maximum_cell[0] + 1)
+                for y in range(minimum_cell[1], maximum_cell[1] + 1)
+                for z in range(minimum_cell[2], maximum_cell[2] + 1) if (x, y, z) in cells]
+
+    # Bricks whose position is between minimum and maximum (included), in order
+    def in_box(self, minimum: Iterable[float], maximum: Iterable[float]) -> list[list]:
+        minimum, maximum = tuple(map(float, minimum)), tuple(map(float, maximum))
+        entries = self._entries
+        found_bricks: list[tuple[int, list]] = []
+        for cell_bricks in self._cells_in_box(minimum, maximum):
+            for brick_id, brick in cell_bricks.items():
+                position, order, _ = entries[brick_id]
+                if minimum[0] <= position[0] <= maximum[0] and minimum[1] <= position[1] <= maximum[1] and \
+                        minimum[2] <= position[2] <= maximum[2]:
+                    found_bricks.append((order, brick))
+        found_bricks.sort(key=itemgetter(0))
+        return [brick for _, brick in found_bricks]
+
+    # Bricks whose position is within radius of center, from the nearest to the farthest
+    def in_radius(self, center: Iterable[float], radius: float) -> list[list]:
+        center = tuple(map(float, center))
+        entries = self._entries
+        squared_radius: float = radius * radius
+        found_bricks: list[tuple[float, int, list]] = []
+        for cell_bricks in self._cells_in_box([coordinate - radius for coordinate in center],
+                                              [coordinate + radius for coordinate in center]):
+            for brick_id, brick in cell_bricks.items():
+                position, order, _ = entries[brick_id]
+                squared_distance: float = (position[0] - center[0]) ** 2 + (position[1] - center[1]) ** 2 + \
+                    (position[2] - center[2]) ** 2
+                if squared_distance <= squared_radius:
+                    found_bricks.append((squared_distance, order, brick))
+        found_bricks.sort(key=itemgetter(0, 1))
+        return [brick for _, _, brick in found_bricks]
+
+    # Brick whose position is the nearest to position (the first one if several are), None if there is no brick
+    def nearest(self, position: Iterable[float]) -> list | None:
+        position = tuple(map(float, position))
+        entries = self._entries
+        center_cell = self._cell(position)
+        nearest_brick: tuple[float, int, list] | None = None
+
+        def look_at(cell_bricks: dict[int, list]) -> None:
+            nonlocal nearest_brick
+            for brick_id, brick in cell_bricks.items():
+                brick_position, order, _ = entries[brick_id]
+                squared_distance: float = (brick_position[0] - position[0]) ** 2 + \
+                    (brick_position[1] - position[1]) ** 2 + (brick_position[2] - position[2]) ** 2
+                if nearest_brick is None or (squared_distance, order) < nearest_brick[:2]:
+                    nearest_brick = squared_distance, order, brick
+
+        # Looking at cells further and further away (ring: cells ring cells away from center_cell on some axis).
+        # Bricks of the next rings are at least ring * cell_size away
+        ring: int = 0
+        while self._cells:
+            if (2 * ring + 1) ** 3 > len(self._cells):
+                # Fewer cells with bricks than cells to look at: looking at every brick instead
+                for cell_bricks in self._cells.values():
+                    look_at(cell_bricks)
+                break
+            for x in range(center_cell[0] - ring, center_cell[0] + ring + 1):
+                for y in range(center_cell[1] - ring, center_cell[1] + ring + 1):
+                    on_ring: bool = abs(x - center_cell[0]) == ring or abs(y - center_cell[1]) == ring
+                    for z in (range(center_cell[2] - ring, center_cell[2] + ring + 1) if on_ring else
+                              {center_cell[2] - ring, center_cell[2] + ring}):
+                        cell_bricks = self._cells.get((x, y, z))
+                        if cell_bricks is not None:
+                            look_at(cell_bricks)
+            if nearest_brick is not None and nearest_brick[0] <= (ring * self.cell_size) ** 2:
+                break
+            ring += 1
+
+        return None if nearest_brick is None else nearest_brick[2]
@@ -1,5 +1,13 @@
+import io
+import mmap
+import os
 import struct
-from dataclasses import dataclass
+import traceback
+from collections.abc import ItemsView, Iterable, Mapping, MutableMapping, MutableSequence, ValuesView
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Iterator
 from datetime import datetime
 
 
@@ -74,6 +82,22 @@ class FM:
     def warning_with_header(header, text):
         print(f"{FM.warning} {header}{FM.remove_reverse} \n{text}")
 
+# Precompiled little endian codecs. Faster than unsigned_int() / bin_float() when (un)packing a lot of values
+struct_uint8 = struct.Struct('<B')
+struct_int8 = struct.Struct('<b')
+struct_uint16 = struct.Struct('<H')
+struct_int16 = struct.Struct('<h')
+struct_uint32 = struct.Struct('<I')
+struct_uint64 = struct.Struct('<Q')
+struct_float = struct.Struct('<f')
+struct_3_float = struct.Struct('<3f')
+struct_3_uint8 = struct.Struct('<3B')
+struct_4_uint8 = struct.Struct('<4B')
+struct_3_uint16 = struct.Struct('<3H')
+struct_property_pair = struct.Struct('<HH')      # Property key ID, property value ID
+struct_brick_header = struct.Struct('<HIB')      # Brick type ID, brick data length, number of properties
+struct_brick_transform = struct.Struct('<6f')    # Position (X, Y, Z), Rotation (Y, Z, X)
+
 def get_64_time_100ns() -> int:
     return int((datetime.now() - datetime(1, 1, 1)).total_seconds() * 1e7)
 
@@ -152,6 +176,31 @@ def copy_file(source_path, destination_path):
         destination_file.write(cp_data)
 
 
+# Tag for property value keys that aren't the value itself. Nothing a user writes can be equal to it.
+_property_key_tag = object()
+
+
+# Function to get a hashable key for a property value, so identical values can be found in O(1).
+# Lists become tuples and floats become their packed bytes (so -0.0 and 0.0 are kept apart),
+# except whole floats which share their key with the equivalent int, like == does.
+def property_value_key(value):
+
+    if isinstance(value, float):
+        if value.is_integer() and struct.pack('<d', value) != b'\x00\x00\x00\x00\x00\x00\x00\x80':
+            return int(value)
+        return _property_key_tag, struct.pack('<d', value)
+
+    if isinstance(value, (list, tuple)):
+        return tuple(property_value_key(sub_value) for sub_value in value)
+
+    # Anything else (str, int, bytes, custom functions...) is compared as is. Unhashable values use their identity
+    try:
+        hash(value)
+    except TypeError:
+        return _property_key_tag, id(value)
+    return value
+
+
 def append_multiple(var, keys, value, gbn=False):
     for key in keys:
 
@@ -169,6 +218,163 @@ def b_pop(byte_array, len):
     return removed_bytes
 
 
+# Reads little endian values from a buffer (e.g. the content of a .brv file) without copying or modifying it:
+# each read unpacks values at offset, then moves offset forward. Unlike b_pop(), reading is O(1) whatever the file size.
+class BinaryReader:
+
+    __slots__ = ('buffer', 'offset')
+
+    def __init__(self, data: bytes | bytearray | memoryview, offset: int = 0):
+        self.buffer: memoryview = data if isinstance(data, memoryview) else memoryview(data)
+        self.offset: int = offset
+
+    # Number of bytes left to read
+    def remaining(self) -> int:
+        return len(self.buffer) - self.offset
+
+    # Reading the values of a precompiled struct (e.g. struct_brick_transform)
+    def unpack(self, struct_format: struct.Struct) -> tuple:
+        try:
+            values = struct_format.unpack_from(self.buffer, self.offset)
+        except struct.error:
+            raise EOFError(f'Unexpected end of file: {struct_format.size} byte(s) requested at offset {self.offset}, '
+                           f'{self.remaining()} left.') from None
+        self.offset += struct_format.size
+        return values
+
+    def uint8(self) -> int:
+        return self.unpack(struct_uint8)[0]
+
+    def int16(self) -> int:
+        return self.unpack(struct_int16)[0]
+
+    def uint16(self) -> int:
+        return self.unpack(struct_uint16)[0]
+
+    def uint32(self) -> int:
+        return self.unpack(struct_uint32)[0]
+
+    def uint64(self) -> int:
+        return self.unpack(struct_uint64)[0]
+
+    def float32(self) -> float:
+        return self.unpack(struct_float)[0]
+
+    # Reading byte_len bytes. The returned memoryview shares the buffer: nothing is copied
+    def read(self, byte_len: int) -> memoryview:
+        if byte_len > self.remaining():
+            raise EOFError(f'Unexpected end of file: {byte_len} byte(s) requested at offset {self.offset}, '
+                           f'{self.remaining()} left.')
+        self.offset += byte_len
+        return self.buffer[self.offset - byte_len:self.offset]
+
+    def skip(self, byte_len: int) -> None:
+        self.read(byte_len)
+
+    # Reading a utf-8 string of byte_len bytes
+    def small_str(self, byte_len: int) -> str:
+        return str(self.read(byte_len), 'utf-8')
+
+    # Reading a utf-16 string (without BOM) of char_len characters
+    def str16(self, char_len: int) -> str:
+        return str(self.read(char_len * 2), 'utf-16-le')
+
+
+# Same as BinaryReader, but reads from a binary stream (e.g. an opened file, a socket file) as values are read,
+# so only the values being read are kept in memory. offset is the number of bytes read so far
+class BinaryStreamReader(BinaryReader):
+
+    __slots__ = ('stream',)
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__(b'')
+        self.stream: BinaryIO = stream
+
+    # The size of a stream isn't known
+    def remaining(self) -> int:
+        raise io.UnsupportedOperation('The number of bytes left in a stream is unknown.')
+
+    def _read_exactly(self, byte_len: int) -> bytes:
+        data: bytes = self.stream.read(byte_len)
+        # Some streams (e.g. sockets) may return less than requested before the end
+        while len(data) < byte_len:
+            more_data: bytes = self.stream.read(byte_len - len(data))
+            if not more_data:
+                raise EOFError(f'Unexpected end of file: {byte_len} byte(s) requested at offset {self.offset}, '
+                               f'{len(data)} left.')
+            data += more_data
+        self.offset += byte_len
+        return data
+
+    def unpack(self, struct_format: struct.Struct) -> tuple:
+        return struct_format.unpack(self._read_exactly(struct_format.size))
+
+    def read(self, byte_len: int) -> memoryview:
+        return memoryview(self._read_exactly(byte_len))
+
+    # Seekable streams (e.g. files) skip bytes without reading them, others read them in chunks.
+    # Skipping past the end of a seekable stream raises EOFError on the next read
+    def skip(self, byte_len: int) -> None:
+        if self.stream.seekable():
+            self.stream.seek(byte_len, io.SEEK_CUR)
+            self.offset += byte_len
+            return
+        while byte_len > 0:
+            chunk_len: int = min(byte_len, 1 << 16)
+            self._read_exactly(chunk_len)
+            byte_len -= chunk_len
+
+
+# Sending the items of an iterable to worker processes by chunks of chunk_size, with at most max_in_flight chunks
+# waiting or being processed (None: 2 per process), so only these chunks are kept in memory. items is read as chunks
+# are sent. worker(chunk, *worker_args) is called on a process for each chunk (it must be picklable, e.g. a function
+# of a module). Yields (chunk, what worker returned, None) for each chunk as they're done, or
+# (chunk, None, traceback of the error) if the worker itself failed (e.g. it was killed)
+def process_in_chunks(worker: Callable, items: Iterable, worker_args: tuple = (), workers: int | None = None,
+                      chunk_size: int = 16, max_in_flight: int | None = None) -> Iterator[tuple[list, any, str | None]]:
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = workers * 2
+    if chunk_size < 1 or max_in_flight < 1:
+        raise ValueError(f'chunk_size and max_in_flight must be at least 1, not {chunk_size} and {max_in_flight}.')
+
+    # Chunk being processed -> its items
+    in_flight: dict[Future, list] = {}
+
+    def collect(done_futures: set[Future]) -> Iterator[tuple[list, any, str | None]]:
+        for done_future in done_futures:
+            chunk: list = in_flight.pop(done_future)
+            try:
+                chunk_results = done_future.result()
+            except Exception:
+                yield chunk, None, traceback.format_exc()
+            else:
+                yield chunk, chunk_results, None
+
+    def chunks() -> Iterator[list]:
+        chunk: list = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        for chunk in chunks():
+            # Wait for a chunk to be done before sending more
+            while len(in_flight) >= max_in_flight:
+                yield from collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+            in_flight[executor.submit(worker, chunk, *worker_args)] = chunk
+
+        while in_flight:
+            yield from collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+
+
 @dataclass
 class BrickInput:
 
@@ -177,13 +383,18 @@ class BrickInput:
     prefix: str = ''
 
 
-    def properties(self):
+    # Get the properties this input stands for. It does not modify the BrickInput.
+    # prefix: name of the property, if unspecified, self.prefix is used
+    def properties(self, prefix: str | None = None):
+
+        if prefix is None:
+            prefix = self.prefix
 
         match self.brick_input_type:
 
             # None
             case 'None':
-                return {f'{self.prefix}.InputAxis': self.brick_input_type}
+                return {f'{prefix}.InputAxis': self.brick_input_type}
 
             # For Always On (Constant Value)
             case 'AlwaysOn':
@@ -193,29 +404,543 @@ class BrickInput:
                     if float(self.brick_input) != 1.0:
                         # Return both properties
                         return {
-                            f'{self.prefix}.InputAxis': self.brick_input_type,
-                            f'{self.prefix}.Value': float(self.brick_input)
+                            f'{prefix}.InputAxis': self.brick_input_type,
+                            f'{prefix}.Value': float(self.brick_input)
                         }
                     # If it's the default value
                     # Return type only
-                    else: return { f'{self.prefix}.InputAxis': self.brick_input_type }
+                    else: return { f'{prefix}.InputAxis': self.brick_input_type }
                 # Or if its invalid
                 # Return type only
-                else: return { f'{self.prefix}.InputAxis': self.brick_input_type }
+                else: return { f'{prefix}.InputAxis': self.brick_input_type }
 
             # Anything having as an input multiple bricks
             case _:
-                if self.brick_input is None:
-                    self.brick_input: list = []
-                if isinstance(self.brick_input, list):
-                    if self.brick_input: return {
-                        f'{self.prefix}.InputAxis': self.brick_input_type,
-                        f'{self.prefix}.SourceBricks': self.brick_input
+                # None means no source bricks
+                brick_input = [] if self.brick_input is None else self.brick_input
+                if isinstance(brick_input, list):
+                    if brick_input: return {
+                        f'{prefix}.InputAxis': self.brick_input_type,
+                        f'{prefix}.SourceBricks': brick_input
                     }
-                    else: return { f'{self.prefix}.InputAxis': self.brick_input_type }
+                    else: return { f'{prefix}.InputAxis': self.brick_input_type }
                 else: return 'invalid_source_bricks'
 
 
+# Default values of these types can't be modified in place: they're never copied for a brick
+_immutable_property_types: frozenset[type] = frozenset({str, int, float, bool, bytes, type(None)})
+
+
+# Properties of a brick (see create_brick()): the values it was given (overrides) layered over the default properties of
+# its brick type, which are shared by every brick of this type instead of being copied for each of them.
+# It can be used like a dict, and keeps the same order: default properties first, then the other ones.
+# A default value that may be modified in place (list, BrickInput()...) is copied for the brick the first time it is
+# accessed with brick[key], items() or values(), so modifying it never affects other bricks.
+class BrickProperties(MutableMapping):
+
+    __slots__ = ('_defaults', '_overrides', '_deleted')
+
+    def __init__(self, defaults: dict, overrides: dict | None = None):
+        self._defaults: dict = defaults
+        self._overrides: dict = {} if overrides is None else overrides
+        # Default properties removed from the brick, None if there is none
+        self._deleted: set | None = None
+
+    def __getitem__(self, key):
+        try:
+            return self._overrides[key]
+        except KeyError:
+            if key not in self._defaults or (self._deleted and key in self._deleted):
+                raise KeyError(key) from None
+
+        value = self._defaults[key]
+        if type(value) not in _immutable_property_types:
+            value = self._overrides[key] = deepcopy(value)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self._overrides[key] = value
+        if self._deleted:
+            self._deleted.discard(key)
+
+    def __delitem__(self, key) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overrides.pop(key, None)
+        if key in self._defaults:
+            if self._deleted is None:
+                self._deleted = set()
+            self._deleted.add(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._overrides or (key in self._defaults and not (self._deleted and key in self._deleted))
+
+    def __iter__(self):
+        for key, _ in self._shared_items():
+            yield key
+
+    def __len__(self) -> int:
+        return (len(self._defaults) - (len(self._deleted) if self._deleted else 0)
+                + sum(key not in self._defaults for key in self._overrides))
+
+    def items(self) -> ItemsView:
+        return _BrickPropertiesItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _BrickPropertiesValuesView(self)
+
+    # Same as items(), but default values are never copied: they're shared by every brick of this type and must not be
+    # modified. Used to read bricks (e.g. to write them) without copying anything
+    def _shared_items(self):
+        overrides, defaults, deleted = self._overrides, self._defaults, self._deleted
+        for key, value in defaults.items():
+            if not (deleted and key in deleted):
+                yield key, overrides.get(key, value)
+        for key, value in overrides.items():
+            if key not in defaults:
+                yield key, value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self._shared_items()) == dict(_shared_property_items(other))
+
+    def copy(self) -> 'BrickProperties':
+        brick_properties_copy = BrickProperties(self._defaults, self._overrides.copy())
+        if self._deleted:
+            brick_properties_copy._deleted = self._deleted.copy()
+        return brick_properties_copy
+
+    def __deepcopy__(self, memo: dict) -> 'BrickProperties':
+        brick_properties_copy = BrickProperties(self._defaults, deepcopy(self._overrides, memo))
+        if self._deleted:
+            brick_properties_copy._deleted = self._deleted.copy()
+        return brick_properties_copy
+
+    # Same as with dicts: brick | properties, properties | brick and brick |= properties
+    def __or__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        brick_properties_copy = self.copy()
+        brick_properties_copy.update(other)
+        return brick_properties_copy
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(other) | {key: self[key] for key in self}
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        return BrickProperties._from_state, (self._defaults, self._overrides, self._deleted)
+
+    @staticmethod
+    def _from_state(defaults: dict, overrides: dict, deleted: set | None) -> 'BrickProperties':
+        brick_properties = BrickProperties(defaults, overrides)
+        brick_properties._deleted = deleted
+        return brick_properties
+
+    def __repr__(self) -> str:
+        return repr(dict(self._shared_items()))
+
+
+class _BrickPropertiesItemsView(ItemsView):
+
+    def __iter__(self):
+        brick_properties: BrickProperties = self._mapping
+        overrides, defaults, deleted = brick_properties._overrides, brick_properties._defaults, brick_properties._deleted
+        for key, value in defaults.items():
+            if deleted and key in deleted:
+                continue
+            if key in overrides:
+                yield key, overrides[key]
+            # Same as brick[key]: the default value is copied for the brick before it can be modified
+            elif type(value) in _immutable_property_types:
+                yield key, value
+            else:
+                overrides[key] = value = deepcopy(value)
+                yield key, value
+        for key, value in overrides.items():
+            if key not in defaults:
+                yield key, value
+
+
+class _BrickPropertiesValuesView(ValuesView):
+
+    def __iter__(self):
+        for _, value in self._mapping.items():
+            yield value
+
+
+# Properties of a brick as (key, value) without copying anything: values may be shared with other bricks (see
+# BrickProperties._shared_items()) and must not be modified
+def _shared_property_items(brick_properties: Mapping) -> Iterable[tuple[str, any]]:
+    if type(brick_properties) is BrickProperties:
+        return brick_properties._shared_items()
+    shared_items = getattr(brick_properties, '_shared_items', None)
+    return brick_properties.items() if shared_items is None else shared_items()
+
+
+# List of bricks loaded by BRCI.load_brv(lazy=True). Bricks are only decoded the first time they're accessed:
+# until then, the list holds the index of their record in the file, which load_brick(record index) decodes.
+# It can be used (and modified) like any list of bricks.
+# buffer (the file) and memory_map (if the file is mapped) are released once every brick is decoded, or by close()
+class LazyBrickList(MutableSequence):
+
+    def __init__(self, bricks: list, brick_count: int, load_brick: Callable[[int], list],
+                 buffer: memoryview | None = None, memory_map: mmap.mmap | None = None):
+        self._bricks: list[list | int] = list(bricks) + list(range(brick_count))
+        self._load_brick: Callable[[int], list] | None = load_brick if brick_count > 0 else None
+        self._not_loaded: int = brick_count
+        self._buffer: memoryview | None = buffer
+        self._memory_map: mmap.mmap | None = memory_map
+        # Incremented each time bricks are added, replaced or removed (see BrickSearchIndex)
+        self._changes: int = 0
+
+    # Number of bricks not decoded yet
+    @property
+    def not_loaded(self) -> int:
+        return self._not_loaded
+
+    def _loaded(self, index: int) -> list:
+        brick = self._bricks[index]
+        if type(brick) is int:
+            if self._load_brick is None:
+                raise ValueError('LazyBrickList was closed: bricks not decoded before can\'t be decoded anymore.')
+            brick = self._bricks[index] = self._load_brick(brick)
+            self._not_loaded -= 1
+            # Everything is decoded: the file can be released
+            if self._not_loaded == 0:
+                self.close()
+        return brick
+
+    def _forget(self, bricks: list) -> None:
+        self._not_loaded -= sum(type(brick) is int for brick in bricks)
+        if self._not_loaded == 0:
+            self.close()
+
+    # Releasing the file bricks are decoded from, and closing its memory map. Bricks not decoded yet can't be anymore
+    def close(self) -> None:
+        self._load_brick = None
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._memory_map is not None:
+            self._memory_map.close()
+            self._memory_map = None
+
+    # with data.bricks: ... closes it at the end
+    def __enter__(self) -> 'LazyBrickList':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._bricks)
+
+    def __getitem__(self, index: int | slice):
+        if isinstance(index, slice):
+            return [self._loaded(i) for i in range(*index.indices(len(self._bricks)))]
+        return self._loaded(index)
+
+    def __setitem__(self, index: int | slice, value) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            self._forget(self._bricks[index])
+        else:
+            self._forget([self._bricks[index]])
+        self._bricks[index] = value
+        self._changes += 1
+
+    def __delitem__(self, index: int | slice) -> None:
+        self._forget(self._bricks[index] if isinstance(index, slice) else [self._bricks[index]])
+        del self._bricks[index]
+        self._changes += 1
+
+    def insert(self, index: int, value: list) -> None:
+        self._bricks.insert(index, value)
+        self._changes += 1
+
+    def __iter__(self):
+        for i in range(len(self._bricks)):
+            yield self._loaded(i)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MutableSequence) and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f'LazyBrickList({len(self._bricks)} bricks, {self._not_loaded} not loaded)'
+
+    # Decoding every brick. Returns them as a regular list
+    def materialize(self) -> list:
+        return list(self)
+
+
+# List of bricks ([name, properties]) of BRCI.bricks, keeping where the bricks of each name are, so they can be found,
+# replaced and removed without going through the whole list. It can be used (and modified) like any list of bricks.
+# Removed bricks leave a hole in the list, filled once there are too many of them or a brick is accessed by its index.
+# If you rename a brick in place (brick[0] = new_name), call reindex() before looking it up by its new name.
+class BrickList(MutableSequence):
+
+    def __init__(self, bricks: Iterable[list] = ()):
+        # None where a brick was removed
+        self._bricks: list[list | None] = list(bricks)
+        self._holes: int = 0
+        # Brick name -> index of the brick in self._bricks, or indexes if several bricks have this name
+        self._brick_indexes: dict[any, int | list[int]] = {}
+        # Incremented each time bricks are added, replaced, renamed or removed (see BrickSearchIndex)
+        self._changes: int = 0
+        self.reindex()
+
+    # Rebuilding where the bricks of each name are
+    def reindex(self) -> None:
+        self._brick_indexes = {}
+        for i, brick in enumerate(self._bricks):
+            if brick is not None:
+                self._index_brick(brick[0], i)
+
+    def _index_brick(self, brick_name, index: int) -> None:
+        self._changes += 1
+        brick_indexes = self._brick_indexes.get(brick_name)
+        if brick_indexes is None:
+            self._brick_indexes[brick_name] = index
+        elif type(brick_indexes) is int:
+            self._brick_indexes[brick_name] = [brick_indexes, index]
+        else:
+            brick_indexes.append(index)
+
+    def _unindex_brick(self, brick_name, index: int) -> None:
+        self._changes += 1
+        brick_indexes = self._brick_indexes.get(brick_name)
+        if brick_indexes == index:
+            del self._brick_indexes[brick_name]
+        elif type(brick_indexes) is list and index in brick_indexes:
+            brick_indexes.remove(index)
+            if len(brick_indexes) == 1:
+                self._brick_indexes[brick_name] = brick_indexes[0]
+        else:
+            # The brick was renamed in place
+            self.reindex()
+
+    # Removing the holes left by removed bricks, so indexes in self._bricks are the ones of the bricks
+    def _compact(self) -> None:
+        if self._holes:
+            self._bricks = [brick for brick in self._bricks if brick is not None]
+            self._holes = 0
+            self.reindex()
+
+    # Bricks named brick_name, in order
+    def find(self, brick_name) -> list[list]:
+        bricks: list[list] = [self._bricks[i] for i in self._indexes(brick_name)]
+        # A brick was renamed in place
+        if any(brick[0] != brick_name for brick in bricks):
+            self.reindex()
+            bricks = [self._bricks[i] for i in self._indexes(brick_name)]
+        return bricks
+
+    # Bricks named any of brick_names, in order
+    def find_any(self, brick_names: Iterable) -> list[list]:
+        brick_names = set(brick_names)
+        bricks: list[list] = [self._bricks[i] for i in sorted(
+            i for brick_name in brick_names for i in self._indexes(brick_name))]
+        # A brick was renamed in place
+        if any(brick[0] not in brick_names for brick in bricks):
+            self.reindex()
+            return self.find_any(brick_names)
+        return bricks
+
+    def _indexes(self, brick_name) -> list[int]:
+        brick_indexes = self._brick_indexes.get(brick_name)
+        if brick_indexes is None:
+            return []
+        return [brick_indexes] if type(brick_indexes) is int else list(brick_indexes)
+
+    # Removing a brick (the brick itself, not an equal one)
+    def discard(self, brick: list) -> None:
+        for attempt in range(2):
+            for i in self._indexes(brick[0]):
+                if self._bricks[i] is brick:
+                    self._unindex_brick(brick[0], i)
+                    self._bricks[i] = None
+                    self._holes += 1
+                    if self._holes > 64 and self._holes * 2 > len(self._bricks):
+                        self._compact()
+                    return
+            # It may have been renamed in place
+            self.reindex()
+        raise ValueError(f'{brick[0]!r} is not in the list.')
+
+    def __len__(self) -> int:
+        return len(self._bricks) - self._holes
+
+    def __getitem__(self, index: int | slice):
+        self._compact()
+        return self._bricks[index]
+
+    def __setitem__(self, index: int | slice, value) -> None:
+        self._compact()
+        if isinstance(index, slice):
+            self._bricks[index] = list(value)
+            self.reindex()
+            return
+        index = range(len(self._bricks))[index]
+        self._unindex_brick(self._bricks[index][0], index)
+        self._bricks[index] = value
+        self._index_brick(value[0], index)
+
+    def __delitem__(self, index: int | slice) -> None:
+        self._compact()
+        if isinstance(index, slice):
+            del self._bricks[index]
+            self.reindex()
+        else:
+            self.discard(self._bricks[index])
+
+    def insert(self, index: int, value: list) -> None:
+        if index >= len(self):
+            self.append(value)
+            return
+        self._compact()
+        self._bricks.insert(index, value)
+        self.reindex()
+
+    def append(self, value: list) -> None:
+        self._index_brick(value[0], len(self._bricks))
+        self._bricks.append(value)
+
+    def clear(self) -> None:
+        self._bricks = []
+        self._holes = 0
+        self._brick_indexes = {}
+        self._changes += 1
+
+    def __iter__(self):
+        for brick in self._bricks:
+            if brick is not None:
+                yield brick
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MutableSequence) and list(self) == list(other)
+
+    def __reduce__(self):
+        return BrickList, (list(self),)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+# What write_brv() remembers about a brick between two writes, see BRCI(incremental_writing=True)
+@dataclass
+class BrvBrickCache:
+
+    # The brick ([name, properties]) and its properties, to know if it was replaced since
+    brick: list
+    brick_properties: dict
+    brick_type: str
+    # Properties to write (BrickInput() expanded, default values removed) as (key, value key, value).
+    # None if the brick was modified in place and they must be looked up again
+    properties: list[tuple[str, any, any]] | None
+    # IDs given to the brick, and its record without position and rotation. Only valid in this generation
+    generation: object | None = None
+    brick_type_id: int = 0
+    property_pairs: list[list[int]] = field(default_factory=list)
+    record: bytes = b''
+
+
+# Everything BRCI.write_brv() computes while encoding a creation. A new one is created for each call,
+# so several creations (or the same one) can be written at once from different threads.
+@dataclass
+class BrvWriteContext:
+
+    # Brick types, in the order they're written
+    brick_types: list[str] = field(default_factory=list)
+    # Brick name -> brick ID
+    string_name_to_id_table: dict[str, int] = field(default_factory=dict)
+    # Property key -> its values, in the order they're written
+    property_table: dict[str, list] = field(default_factory=dict)
+    # Property key -> value key (see property_value_key()) -> value ID
+    property_value_id_table: dict[str, dict[any, int]] = field(default_factory=dict)
+    # Property key -> property key ID
+    property_key_table: dict[str, int] = field(default_factory=dict)
+    # Each brick as [brick ID, [{'gbn': brick type ID, 'Position': ..., 'Rotation': ...}, [[key ID, value ID], ...]]]
+    bricks_writing: list = field(default_factory=list)
+    # Entries of the BRCI appendix
+    brci_appendix: list[bytes] = field(default_factory=list)
+
+    # Only used with BRCI(incremental_writing=True), where each write_brv() starts from the tables of the last one.
+    # IDs never change within a generation: a new generation (a new object()) starts whenever everything is re-encoded
+    generation: object | None = None
+    # Brick type -> brick type ID
+    brick_type_id_table: dict[str, int] = field(default_factory=dict)
+    # Number of bricks using each brick type, by brick type ID
+    brick_type_refs: list[int] = field(default_factory=list)
+    # Number of bricks using each value, by property key ID then value ID
+    property_value_refs: list[list[int]] = field(default_factory=list)
+    # Property key -> (values already encoded, length of each of them)
+    property_sections: dict[str, tuple[bytes, list[int]]] = field(default_factory=dict)
+    # Cache of each brick, in the order they're written. bricks_writing is only made from it when needed
+    brick_caches: list[BrvBrickCache] = field(default_factory=list)
+    # Cache of each brick, by id() of the brick ([name, properties])
+    brick_cache_table: dict[int, BrvBrickCache] = field(default_factory=dict)
+
+
+    # Property key -> value ID -> value
+    @property
+    def id_assigned_property_table(self) -> dict[str, dict[int, any]]:
+        return {property_key: dict(enumerate(property_values))
+                for property_key, property_values in self.property_table.items()}
+
+    # Property key ID -> property key
+    @property
+    def inverted_property_key_table(self) -> dict[int, str]:
+        return {property_key_id: property_key for property_key, property_key_id in self.property_key_table.items()}
+
+    # Get bricks_writing, making it from brick_caches if it was written with incremental_writing
+    def get_bricks_writing(self) -> list:
+        if self.brick_caches and not self.bricks_writing:
+            self.bricks_writing = [[brick_id, [{'gbn': brick_cache.brick_type_id,
+                                                'Position': brick_cache.brick[1]['Position'],
+                                                'Rotation': brick_cache.brick[1]['Rotation']},
+                                               brick_cache.property_pairs]]
+                                   for brick_id, brick_cache in enumerate(self.brick_caches)]
+        return self.bricks_writing
+
+    # Get a new context with the same generation and tables, to write the creation again
+    def carry_over(self) -> 'BrvWriteContext':
+        return BrvWriteContext(
+            brick_types=self.brick_types.copy(),
+            property_table={property_key: property_values.copy()
+                            for property_key, property_values in self.property_table.items()},
+            property_value_id_table={property_key: property_value_ids.copy()
+                                     for property_key, property_value_ids in self.property_value_id_table.items()},
+            property_key_table=self.property_key_table.copy(),
+            generation=self.generation,
+            brick_type_id_table=self.brick_type_id_table.copy(),
+            brick_type_refs=self.brick_type_refs.copy(),
+            property_value_refs=[property_value_refs.copy() for property_value_refs in self.property_value_refs],
+            property_sections=self.property_sections.copy())
+
+
+# What batch_export() did
+@dataclass
+class BatchExportReport:
+
+    # Number of creations exported
+    exported: int = 0
+    # Creation index (in the order they were given) -> traceback of the error that stopped its export
+    failed: dict[int, str] = field(default_factory=dict)
+    # Time taken by the whole batch, in seconds
+    seconds: float = 0.0
+
+    @property
+    def vehicles_per_second(self) -> float:
+        return self.exported / self.seconds if self.seconds > 0 else 0.0
+
+
 if numpy_features_enabled:
     def rotate_point_3d(point: list[float], center: list[float], rotation: list[float]) -> list[float]:
         
@@ -255,4 +980,106 @@ if numpy_features_enabled:
         return (M@point)[:3]
 
     # rotate-point-3d alias
-    def rot(point: list[float], center: list[float], rotation: list[float]) -> list[float]: return rotate_point_3d(point, center, rotation)
\ No newline at end of file
+    def rot(point: list[float], center: list[float], rotation: list[float]) -> list[float]: return rotate_point_3d(point, center, rotation)
+
+    # Packs all brick records of a .brv file at once. Same output as packing them one by one with struct_brick_header,
+    # struct_property_pair and struct_brick_transform.
+    # type_ids: brick type ID of each brick. property_counts: number of properties of each brick.
+    # property_pairs: flat list of all (property key ID, property value ID), brick after brick.
+    # transforms: position (X, Y, Z) and rotation (Y, Z, X) of each brick, as a list of 6 floats.
+    def np_pack_brick_records(type_ids: list[int], property_counts: list[int], property_pairs: list[int],
+                              transforms: list[list[float]]) -> bytes:
+
+        brick_count = len(type_ids)
+        if brick_count == 0:
+            return b''
+
+        property_counts = np.asarray(property_counts, dtype=np.int64)
+        if property_counts.max() > 0xFF:
+            raise OverflowError(f'Too many properties for a single brick: {property_counts.max()}/255')
+
+        # Where each record begins in the output
+        record_lengths = 31 + 4 * property_counts
+        record_starts = np.zeros(brick_count, dtype=np.int64)
+        np.cumsum(record_lengths[:-1], out=record_starts[1:])
+        records = np.zeros(int(record_lengths.sum()), dtype=np.uint8)
+
+        # Brick type, data length and number of properties (7 bytes, packed)
+        headers = np.empty(brick_count, dtype=[('type', '<u2'), ('len', '<u4'), ('count', 'u1')])
+        headers['type'] = type_ids
+        headers['len'] = record_lengths - 6
+        headers['count'] = property_counts
+        records[record_starts[:, None] + np.arange(7)] = headers.view(np.uint8).reshape(brick_count, 7)
+
+        # Property pairs (4 bytes each), right after the header
+        pair_count = int(property_counts.sum())
+        if pair_count:
+            pair_owners = np.repeat(np.arange(brick_count), property_counts)
+            pair_first = np.repeat(np.cumsum(property_counts) - property_counts, property_counts)
+            pair_starts = record_starts[pair_owners] + 7 + 4 * (np.arange(pair_count) - pair_first)
+            pairs = np.asarray(property_pairs, dtype='<u2').view(np.uint8).reshape(pair_count, 4)
+            records[pair_starts[:, None] + np.arange(4)] = pairs
+
+        # Position and rotation (24 bytes), at the end of the record
+        transforms_f64 = np.asarray(transforms, dtype=np.float64).reshape(brick_count, 6)
+        transforms_f32 = transforms_f64.astype('<f4')
+        if np.any(np.isinf(transforms_f32) & np.isfinite(transforms_f64)):
+            raise OverflowError('float too large to pack with f format')
+        transform_starts = record_starts + record_lengths - 24
+        records[transform_starts[:, None] + np.arange(24)] = transforms_f32.view(np.uint8).reshape(brick_count, 24)
+
+        return records.tobytes()
+
+    # Reads the brick_count brick records beginning at offset in buffer (the content of a .brv file), the reverse of
+    # np_pack_brick_records(). Returns (type IDs (N,) uint16, property pair offsets (N + 1,) int64,
+    # property pairs (M, 2) uint16 as (property key ID, property value ID), positions (N, 3) float32 as (X, Y, Z),
+    # rotations (N, 3) float32 as (X, Y, Z), offset right after the last record). Property pairs of brick i are
+    # property_pairs[property_pair_offsets[i]:property_pair_offsets[i + 1]].
+    # If every record has the same number of properties, they're all read through one view of buffer, and type IDs
+    # and positions are views of it (read-only if buffer is). Else values are gathered from where each record begins.
+    def np_unpack_brick_records(buffer, offset: int, brick_count: int) -> tuple:
+
+        # Where each record begins: records don't all have the same length, so they must be walked through
+        record_starts: list[int] = []
+        property_counts: list[int] = []
+        unpack_header = struct_brick_header.unpack_from
+        for _ in range(brick_count):
+            _, brick_data_len, properties_num = unpack_header(buffer, offset)
+            record_starts.append(offset)
+            property_counts.append(properties_num)
+            offset += 6 + brick_data_len
+
+        record_starts = np.asarray(record_starts, dtype=np.int64)
+        property_counts = np.asarray(property_counts, dtype=np.int64)
+        property_pair_offsets = np.zeros(brick_count + 1, dtype=np.int64)
+        np.cumsum(property_counts, out=property_pair_offsets[1:])
+
+        if brick_count == 0:
+            return (np.zeros(0, dtype=np.uint16), property_pair_offsets, np.zeros((0, 2), dtype=np.uint16),
+                    np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.float32), offset)
+
+        # Same layout for every record: they can be read as an array of structs, without copying anything
+        properties_num = int(property_counts[0])
+        record_len = 31 + 4 * properties_num
+        if np.all(property_counts == properties_num) and np.all(np.diff(record_starts) == record_len):
+            records = np.ndarray((brick_count,), buffer=buffer, offset=int(record_starts[0]), dtype=np.dtype([
+                ('type', '<u2'), ('len', '<u4'), ('count', 'u1'),
+                ('pairs', '<u2', (properties_num, 2)), ('transform', '<f4', (6,))]))
+            transforms = records['transform']
+            return (records['type'], property_pair_offsets, records['pairs'].reshape(-1, 2), transforms[:, :3],
+                    transforms[:, [5, 3, 4]], offset)
+
+        buffer_u8 = np.frombuffer(buffer, dtype=np.uint8)
+
+        type_ids = buffer_u8[record_starts[:, None] + np.arange(2)].view('<u2').reshape(brick_count)
+
+        pair_count = int(property_pair_offsets[-1])
+        pair_owners = np.repeat(np.arange(brick_count), property_counts)
+        pair_starts = (record_starts[pair_owners] + 7
+                       + 4 * (np.arange(pair_count) - property_pair_offsets[:-1][pair_owners]))
+        property_pairs = buffer_u8[pair_starts[:, None] + np.arange(4)].view('<u2').reshape(pair_count, 2)
+
+        transform_starts = record_starts + 7 + 4 * property_counts
+        transforms = buffer_u8[transform_starts[:, None] + np.arange(24)].view('<f4').reshape(brick_count, 6)
+
+        return type_ids, property_pair_offsets, property_pairs, transforms[:, :3], transforms[:, [5, 3, 4]], offset
@@ -0,0 +1,355 @@
+import mmap
+import os
+import struct
+import traceback
+from dataclasses import dataclass, field
+from math import ceil
+from time import perf_counter
+from typing import BinaryIO, Iterator
+
+from .functions import (BinaryReader, BinaryStreamReader, FM, process_in_chunks, struct_brick_header,
+                        struct_property_pair, struct_brick_transform, struct_uint16, numpy_features_enabled)
+from .property_codecs import get_property_codec
+
+if numpy_features_enabled:
+    from .functions import np, np_unpack_brick_records
+
+
+# What peek_brv() found in a .brv file
+@dataclass
+class BrvSummary:
+
+    file_version: int
+    brick_count: int
+    # Brick types and property keys, in the order they're written
+    brick_types: list[str] = field(default_factory=list)
+    property_keys: list[str] = field(default_factory=list)
+    # ID of the driver seat (like BRCI.load_brv()), None if there is none
+    seat_brick: int | None = None
+
+
+# What peek_brm() found in a .brm file
+@dataclass
+class BrmSummary:
+
+    file_version: int
+    display_name: str
+    description: str
+    brick_count: int
+    vehicle_size: list[float]
+    vehicle_weight: float
+    vehicle_worth: float
+    # 100-nanoseconds since 0001-01-01 00:00:00
+    creation_timestamp: int
+    update_timestamp: int
+    visibility: int
+    tags: list[str] = field(default_factory=list)
+
+
+# Project folders are given their default file
+def _peek_file_path(path: str | os.PathLike, default_file_name: str) -> str:
+    if os.path.isdir(path):
+        return os.path.join(path, default_file_name)
+    return os.fspath(path)
+
+
+# Header and tables of a .brv file, see read_brv_tables()
+@dataclass
+class BrvTables:
+
+    file_version: int
+    brick_count: int
+    # Brick types and property keys, in the order they're written (their index is their ID)
+    brick_types: list[str] = field(default_factory=list)
+    property_keys: list[str] = field(default_factory=list)
+    # Values of each property (by property key ID), decoded with its codec (see property_codecs.py) or as bytes if it
+    # has none. Bricks are given as IDs. Empty if values were not decoded
+    property_values: list[list] = field(default_factory=list)
+
+
+# Reading the header, brick types and properties of a .brv file. brv_file is left at the first brick record
+def read_brv_tables(brv_file: BinaryReader, decode_values: bool = True) -> BrvTables:
+
+    tables = BrvTables(file_version=brv_file.uint8(), brick_count=brv_file.uint16())
+    brick_type_count: int = brv_file.uint16()
+    property_type_count: int = brv_file.uint16()
+
+    for _ in range(brick_type_count):
+        tables.brick_types.append(brv_file.small_str(brv_file.uint8()))
+
+    for _ in range(property_type_count):
+        property_key: str = brv_file.small_str(brv_file.uint8())
+        tables.property_keys.append(property_key)
+        property_count: int = brv_file.uint16()
+        property_content_len: int = brv_file.uint32()
+
+        # Values aren't read if they aren't decoded: streams skip them without keeping them in memory
+        if not decode_values:
+            brv_file.skip(property_content_len)
+            if property_count > 1 and brv_file.uint16() == 0:
+                brv_file.skip(struct_uint16.size * property_count)
+            continue
+
+        property_content: memoryview = brv_file.read(property_content_len)
+
+        # Length of values: none if there is one value, one if they all have the same, else one for each value
+        property_lengths: list[int] = [len(property_content)]
+        if property_count > 1:
+            property_length: int = brv_file.uint16()
+            if property_length == 0:
+                property_lengths = list(brv_file.unpack(struct.Struct(f'<{property_count}H')))
+            else:
+                property_lengths = [property_length] * property_count
+
+        property_codec = get_property_codec(property_key)
+        decode = bytes if property_codec is None else property_codec.decode
+        property_values: list = []
+        property_value_offset: int = 0
+        for property_length in property_lengths:
+            property_values.append(decode(property_content[property_value_offset:property_value_offset + property_length]))
+            property_value_offset += property_length
+        tables.property_values.append(property_values)
+
+    return tables
+
+
+# Reading the summary of a .brv file (or of the Vehicle.brv file of a project folder).
+# Only the header, brick types and property keys are read: the file is streamed, property values and bricks are
+# skipped by seeking past them, so only the tables are kept in memory
+def peek_brv(path: str | os.PathLike) -> BrvSummary:
+
+    with open(_peek_file_path(path, 'Vehicle.brv'), 'rb') as brv_file_reader:
+
+        brv_file = BinaryStreamReader(brv_file_reader)
+        tables = read_brv_tables(brv_file, decode_values=False)
+        summary = BrvSummary(tables.file_version, tables.brick_count, tables.brick_types, tables.property_keys)
+
+        for _ in range(summary.brick_count):
+            # The length doesn't include the brick type and itself, but includes the number of properties
+            _, brick_data_len, _ = brv_file.unpack(struct_brick_header)
+            brv_file.skip(brick_data_len - 1)
+
+        seat: int = brv_file.uint16()
+        summary.seat_brick = None if seat == 0 else seat
+
+    return summary
+
+
+
+# Reading the bricks of a .brv file (or of the Vehicle.brv file of a project folder) one by one, as
+# (brick ID, brick type, properties, position [X, Y, Z], rotation [X, Y, Z]).
+# Properties are the ones written in the file: default values aren't added, BrickInput() isn't rebuilt (e.g.
+# 'Input.InputAxis' and 'Input.Value' are separate properties) and bricks are given as IDs. Bricks with the same value
+# share it: copy values before modifying them.
+# path_or_stream may also be an opened binary stream. Only the property values and the brick being read are kept in
+# memory, whatever the size of the creation.
+def iter_bricks(path_or_stream: str | os.PathLike | BinaryIO) -> Iterator[tuple[int, str, dict[str, any], list[float], list[float]]]:
+
+    if isinstance(path_or_stream, (str, os.PathLike)):
+        with open(_peek_file_path(path_or_stream, 'Vehicle.brv'), 'rb') as brv_file_reader:
+            yield from iter_bricks(brv_file_reader)
+        return
+
+    brv_file = BinaryStreamReader(path_or_stream)
+    tables = read_brv_tables(brv_file)
+    brick_types: list[str] = tables.brick_types
+    property_keys: list[str] = tables.property_keys
+    property_values: list[list] = tables.property_values
+
+    for brick_id in range(tables.brick_count):
+
+        brick_type_id, _, property_count = brv_file.unpack(struct_brick_header)
+        # Properties and transform are read at once
+        brick_record: memoryview = brv_file.read(struct_property_pair.size * property_count + struct_brick_transform.size)
+
+        properties: dict[str, any] = {}
+        for property_pair_offset in range(0, struct_property_pair.size * property_count, struct_property_pair.size):
+            property_key_id, property_value_id = struct_property_pair.unpack_from(brick_record, property_pair_offset)
+            properties[property_keys[property_key_id]] = property_values[property_key_id][property_value_id]
+
+        brick_px, brick_py, brick_pz, brick_ry, brick_rz, brick_rx = struct_brick_transform.unpack_from(
+            brick_record, struct_property_pair.size * property_count)
+
+        yield brick_id, brick_types[brick_type_id], properties, [brick_px, brick_py, brick_pz], [brick_rx, brick_ry, brick_rz]
+
+
+if numpy_features_enabled:
+
+    # What load_brv_arrays() read from a .brv file
+    @dataclass
+    class BrvArrays(BrvTables):
+
+        # Brick type ID (see brick_types) of each brick, (N,) uint16
+        type_ids: np.ndarray | None = None
+        # Position and rotation (X, Y, Z) of each brick, (N, 3) float32
+        positions: np.ndarray | None = None
+        rotations: np.ndarray | None = None
+        # Properties of brick i are property_pairs[property_pair_offsets[i]:property_pair_offsets[i + 1]], as
+        # (property key ID (see property_keys), property value ID (see property_values)). (N + 1,) int64 and (M, 2) uint16
+        property_pair_offsets: np.ndarray | None = None
+        property_pairs: np.ndarray | None = None
+        # ID of the driver seat (like BRCI.load_brv()), None if there is none
+        seat_brick: int | None = None
+
+    # Loading the bricks of a .brv file (or of the Vehicle.brv file of a project folder) as NumPy arrays, without
+    # creating any object per brick. Arrays may be read-only views of the file: use .copy() to modify them.
+    # memory_map: read the file through a memory map (closed once arrays are no longer used)
+    def load_brv_arrays(path: str | os.PathLike, decode_values: bool = True, memory_map: bool = False) -> BrvArrays:
+
+        with open(_peek_file_path(path, 'Vehicle.brv'), 'rb') as brv_file_reader:
+            if memory_map and os.fstat(brv_file_reader.fileno()).st_size > 0:  # Empty files can't be mapped
+                brv_file = BinaryReader(mmap.mmap(brv_file_reader.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                brv_file = BinaryReader(brv_file_reader.read())
+
+        tables = read_brv_tables(brv_file, decode_values)
+        type_ids, property_pair_offsets, property_pairs, positions, rotations, brv_file.offset = np_unpack_brick_records(
+            brv_file.buffer, brv_file.offset, tables.brick_count)
+
+        seat: int = brv_file.uint16()
+
+        return BrvArrays(tables.file_version, tables.brick_count, tables.brick_types, tables.property_keys,
+                         tables.property_values, type_ids, positions, rotations, property_pair_offsets, property_pairs,
+                         None if seat == 0 else seat)
+
+
+# Reading a .brm file (or the MetaData.brm file of a project folder)
+def peek_brm(path: str | os.PathLike) -> BrmSummary:
+
+    with open(_peek_file_path(path, 'MetaData.brm'), 'rb') as metadata_file_reader:
+        return read_brm(BinaryReader(metadata_file_reader.read()))
+
+
+# Reading the content of a .brm file
+def read_brm(metadata_file: BinaryReader) -> BrmSummary:
+
+    file_version: int = metadata_file.uint8()
+
+    # Strings are utf-8 if their length is positive, utf-16 if it is negative
+    name_len: int = metadata_file.int16()
+    display_name: str = metadata_file.small_str(name_len) if name_len >= 0 else metadata_file.str16(-name_len)
+    description_len: int = metadata_file.int16()
+    description: str = (metadata_file.small_str(description_len) if description_len >= 0
+                        else metadata_file.str16(-description_len))
+
+    brick_count: int = metadata_file.uint16()
+    vehicle_size: list[float] = [metadata_file.float32(), metadata_file.float32(), metadata_file.float32()]
+    vehicle_weight: float = metadata_file.float32()
+    vehicle_worth: float = metadata_file.float32()
+
+    # Get rid of the author
+    metadata_file.skip(ceil(metadata_file.uint8() / 2))
+
+    creation_timestamp: int = metadata_file.uint64()
+    update_timestamp: int = metadata_file.uint64()
+    visibility: int = metadata_file.uint8()
+
+    tags: list[str] = []
+    for _ in range(3):
+        if metadata_file.remaining() > 0:  # If there's still something to take
+            tags.append(metadata_file.small_str(metadata_file.uint8()))
+
+    return BrmSummary(file_version, display_name, description, brick_count, vehicle_size, vehicle_weight,
+                      vehicle_worth, creation_timestamp, update_timestamp, visibility, tags)
+
+
+# What batch_load() read from a vehicle folder
+@dataclass
+class LoadedVehicle:
+
+    folder: str
+    # BrvSummary of Vehicle.brv (BrvArrays if loaded as arrays), None if there is none or it couldn't be read
+    vehicle: 'BrvSummary | BrvArrays | None' = None
+    # BrmSummary of MetaData.brm, None if there is none or it couldn't be read
+    metadata: BrmSummary | None = None
+
+
+# What batch_load() did
+@dataclass
+class BatchLoadReport:
+
+    # Vehicle folder -> what was read from it
+    vehicles: dict[str, LoadedVehicle] = field(default_factory=dict)
+    # Path of a file that couldn't be read -> traceback of the error
+    failed: dict[str, str] = field(default_factory=dict)
+    # Time taken by the whole batch, in seconds
+    seconds: float = 0.0
+
+    @property
+    def vehicles_per_second(self) -> float:
+        return len(self.vehicles) / self.seconds if self.seconds > 0 else 0.0
+
+
+# Folders of directory (and directory itself) holding a Vehicle.brv or a MetaData.brm file
+def _vehicle_folders(directory: str | os.PathLike) -> Iterator[str]:
+    for folder, _, file_names in os.walk(directory):
+        if 'Vehicle.brv' in file_names or 'MetaData.brm' in file_names:
+            yield folder
+
+
+# Reading the files of some vehicle folders, in a batch_load() worker. Files are read independently: one failing
+# doesn't stop the others
+def _batch_load_chunk(vehicle_folders: list[str], arrays: bool) -> list[tuple[LoadedVehicle, dict[str, str]]]:
+
+    results: list[tuple[LoadedVehicle, dict[str, str]]] = []
+
+    for vehicle_folder in vehicle_folders:
+        loaded_vehicle = LoadedVehicle(vehicle_folder)
+        errors: dict[str, str] = {}
+
+        brv_path: str = os.path.join(vehicle_folder, 'Vehicle.brv')
+        if os.path.isfile(brv_path):
+            try:
+                loaded_vehicle.vehicle = load_brv_arrays(brv_path) if arrays else peek_brv(brv_path)
+            except Exception:
+                errors[brv_path] = traceback.format_exc()
+
+        brm_path: str = os.path.join(vehicle_folder, 'MetaData.brm')
+        if os.path.isfile(brm_path):
+            try:
+                loaded_vehicle.metadata = peek_brm(brm_path)
+            except Exception:
+                errors[brm_path] = traceback.format_exc()
+
+        results.append((loaded_vehicle, errors))
+
+    return results
+
+
+# Reading every vehicle folder found in directory (e.g. Brick Rigs' Vehicles folder) on several processes.
+# Vehicle.brv is read with peek_brv(), or with load_brv_arrays() if arrays is set (requires NumPy), and MetaData.brm
+# with peek_brm(). Folders are sent to workers by chunks of chunk_size, with at most max_in_flight chunks waiting or
+# being read. A file failing to be read doesn't stop the others: its error is kept in the report.
+def batch_load(directory: str | os.PathLike, workers: int | None = None, chunk_size: int = 16,
+               max_in_flight: int | None = None, arrays: bool = False, logs: list[str] | None = None) -> BatchLoadReport:
+
+    if logs is None:
+        logs = ['time']
+    if arrays and not numpy_features_enabled:
+        raise ImportError('NumPy is required to load vehicles as arrays.')
+
+    report = BatchLoadReport()
+    begin_time = perf_counter()
+
+    for chunk_folders, chunk_results, chunk_error in process_in_chunks(
+            _batch_load_chunk, _vehicle_folders(directory), (arrays,), workers, chunk_size, max_in_flight):
+        if chunk_error is not None:
+            # The worker itself failed (e.g. it was killed): the whole chunk failed
+            chunk_results = [(LoadedVehicle(vehicle_folder), {vehicle_folder: chunk_error})
+                             for vehicle_folder in chunk_folders]
+        for loaded_vehicle, errors in chunk_results:
+            report.vehicles[loaded_vehicle.folder] = loaded_vehicle
+            report.failed.update(errors)
+            if 'no_warnings' not in logs:
+                for file_path, file_error in errors.items():
+                    FM.warning_with_header(f'Failed to read {file_path}', file_error)
+
+    # Same order whatever the order workers finished in
+    report.vehicles = dict(sorted(report.vehicles.items()))
+    report.seconds = perf_counter() - begin_time
+
+    if 'time' in logs:
+        print(f"{FM.info} Batch load: {len(report.vehicles)} vehicle(s) read, {len(report.failed)} file(s) failed, "
+              f"in {report.seconds:.3f} seconds ({report.vehicles_per_second:.1f} vehicles/s)")
+
+    return report
@@ -0,0 +1,265 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from .brick_list import br_property_types
+from .functions import (struct_uint8, struct_int8, struct_uint16, struct_int16, struct_float, struct_3_float,
+                        struct_3_uint8, struct_4_uint8, struct_3_uint16, small_bin_str, r_small_bin_str)
+
+
+# How the values of a property are written to and read from .brv files.
+# encode(value, brick_id) returns the bytes of value. brick_id(brick_name) returns the ID of a brick, or None if
+# there is no such brick (BRCI already warned about it).
+# decode(value_bytes) returns the value. Bricks are returned as their ID, BRCI renames them once all bricks are loaded.
+@dataclass(frozen=True)
+class PropertyCodec:
+
+    encode: Callable[[any, Callable[[str], int | None]], bytes]
+    decode: Callable[[bytes], any]
+    # If values are (or contain) brick names, they must be encoded again when brick IDs change
+    refers_to_bricks: bool = False
+    # If the same value may not always be encoded the same way, it must be encoded at every write
+    always_encode: bool = False
+
+
+# --------------------------------------------------
+# ENCODERS AND DECODERS
+# --------------------------------------------------
+
+def _encode_bin(value, brick_id) -> bytes:
+    return bytes(value)
+
+def _decode_bin(value_bytes: bytes) -> bytes:
+    return bytes(value_bytes)
+
+
+def _encode_bool(value, brick_id) -> bytes:
+    return struct_uint8.pack(int(value))
+
+def _decode_bool(value_bytes: bytes) -> bool:
+    return bool(value_bytes[0])
+
+
+def _encode_brick_id(value, brick_id) -> bytes:
+    value_id = brick_id(value)
+    # Unknown bricks are not written
+    if value_id is None:
+        return b''
+    return struct_uint16.pack(value_id)
+
+def _decode_brick_id(value_bytes: bytes) -> int:
+    return struct_uint16.unpack(value_bytes)[0]
+
+
+# If it is custom then we expect a function
+def _encode_custom(value, brick_id) -> bytes:
+    return value()
+
+
+def _encode_float(value, brick_id) -> bytes:
+    return struct_float.pack(value)
+
+def _decode_float(value_bytes: bytes) -> float:
+    return struct_float.unpack(value_bytes)[0]
+
+
+# Number of bricks (uint16), then the ID + 1 of each brick (uint16). Unknown bricks are left out
+def _encode_brick_id_list(value, brick_id) -> bytes:
+    if not isinstance(value, list):
+        raise TypeError(f'a list of brick IDs is required, not (a) {type(value).__name__} ({value}).')
+    value_ids = [value_id for value_id in map(brick_id, value) if value_id is not None]
+    return struct_uint16.pack(len(value_ids)) + b''.join([struct_uint16.pack(value_id + 1) for value_id in value_ids])
+
+def _decode_brick_id_list(value_bytes: bytes) -> list[int]:
+    return [struct_uint16.unpack_from(value_bytes, offset)[0] - 1
+            for offset in range(2, 2 + 2 * struct_uint16.unpack_from(value_bytes)[0], 2)]
+
+
+def _encode_3_float(value, brick_id) -> bytes:
+    return struct_3_float.pack(value[0], value[1], value[2])
+
+def _decode_3_float(value_bytes: bytes) -> list[float]:
+    return list(struct_3_float.unpack(value_bytes))
+
+
+# Integers are read as 0xRRGGBB
+def _encode_3_uint8(value, brick_id) -> bytes:
+    if isinstance(value, int):
+        value = [(value >> i) & 0xFF for i in range(16, -1, -8)]
+    return struct_3_uint8.pack(round(value[0]), round(value[1]), round(value[2]))
+
+def _decode_uint8_list(value_bytes: bytes) -> list[int]:
+    return list(value_bytes)
+
+
+def _encode_3_uint16(value, brick_id) -> bytes:
+    if isinstance(value, int):
+        value = [(value >> i) & 0xFFFF for i in range(32, -1, -16)]
+    return struct_3_uint16.pack(round(value[0]), round(value[1]), round(value[2]))
+
+def _decode_3_uint16(value_bytes: bytes) -> list[int]:
+    return list(struct_3_uint16.unpack(value_bytes))
+
+
+# Integers are read as 0xRRGGBBAA
+def _encode_4_uint8(value, brick_id) -> bytes:
+    if isinstance(value, int):
+        value = [(value >> i) & 0xFF for i in range(24, -1, -8)]
+    return struct_4_uint8.pack(round(value[0]), round(value[1]), round(value[2]), round(value[3]))
+
+
+# 6 values of 2 bits in a uint16, the first one in the lowest bits
+def _encode_6_uint2(value, brick_id) -> bytes:
+    if isinstance(value, int):
+        value = [(value >> i) & 0x3 for i in range(12, -1, -2)]
+    return struct_uint16.pack(value[0] + (value[1] << 2) + (value[2] << 4) +
+                              (value[3] << 6) + (value[4] << 8) + (value[5] << 10))
+
+def _decode_6_uint2(value_bytes: bytes) -> list[int]:
+    packed_value: int = struct_uint16.unpack(value_bytes)[0]
+    return [(packed_value >> i) & 0x3 for i in range(0, 12, 2)]
+
+
+# Length (int8), then the UTF-8 string
+def _encode_str8(value, brick_id) -> bytes:
+    return struct_int8.pack(len(value)) + small_bin_str(value)
+
+def _decode_str8(value_bytes: bytes) -> str:
+    return r_small_bin_str(bytes(value_bytes[1:]))
+
+
+# Negative length (int16), then the UTF-16 string
+def _encode_str16(value, brick_id) -> bytes:
+    return struct_int16.pack(-len(value)) + value.encode('utf-16')[2:]
+
+def _decode_str16(value_bytes: bytes) -> str:
+    return bytes(value_bytes[2:]).decode('utf-16-le')
+
+
+# Positive length (int16) then the UTF-8 string, or negative length (int16) then the UTF-16 string
+def _encode_strany(value, brick_id) -> bytes:
+    try:
+        # Assume it can be a long str8
+        return struct_int16.pack(len(value)) + small_bin_str(value)
+    except UnicodeEncodeError:
+        # Assume since it's not a long str8 it must be a long str16
+        return _encode_str16(value, brick_id)
+
+def _decode_strany(value_bytes: bytes) -> str:
+    if struct_int16.unpack_from(value_bytes)[0] < 0:
+        return _decode_str16(value_bytes)
+    return r_small_bin_str(bytes(value_bytes[2:]))
+
+
+def _encode_uint8(value, brick_id) -> bytes:
+    return struct_uint8.pack(int(value))
+
+def _decode_uint8(value_bytes: bytes) -> int:
+    return value_bytes[0]
+
+
+# Length (uint8), then the UTF-8 string
+def _encode_input_axis(value, brick_id) -> bytes:
+    return struct_uint8.pack(len(value)) + small_bin_str(value)
+
+
+# Source bricks may be given as integers, they're then looked up as str
+def _encode_source_bricks(value, brick_id) -> bytes:
+    return _encode_brick_id_list(value, lambda brick_name: brick_id(str(brick_name)))
+
+
+# Properties BRCI doesn't know the type of are written according to the type of their value
+def _encode_untyped(value, brick_id) -> bytes:
+
+    if isinstance(value, list) and (not value or isinstance(value[0], (str, int))):
+        return _encode_source_bricks(value, brick_id)
+    elif isinstance(value, str):
+        return _encode_input_axis(value, brick_id)
+    elif isinstance(value, (float, int)):
+        return _encode_float(value, brick_id)
+
+    raise ValueError(f'Unsupported property type: {value}.\n'
+                     f'Consider using bin to implement this property, as explained in Doc/DOCUMENTATION.md\n'
+                     f'DEBUG INFORMATION: {value}, ')
+
+
+# --------------------------------------------------
+# REGISTRY
+# --------------------------------------------------
+
+# Codec of each property type (see br_property_types)
+br_property_type_codecs: dict[str, PropertyCodec] = {
+    'bin': PropertyCodec(_encode_bin, _decode_bin),
+    'bool': PropertyCodec(_encode_bool, _decode_bool),
+    'brick_id': PropertyCodec(_encode_brick_id, _decode_brick_id, refers_to_bricks=True),
+    'custom': PropertyCodec(_encode_custom, _decode_bin, always_encode=True),
+    'float': PropertyCodec(_encode_float, _decode_float),
+    'list[brick_id]': PropertyCodec(_encode_brick_id_list, _decode_brick_id_list, refers_to_bricks=True),
+    'list[3*float]': PropertyCodec(_encode_3_float, _decode_3_float),
+    'list[3*uint8]': PropertyCodec(_encode_3_uint8, _decode_uint8_list),
+    'list[3*uint16]': PropertyCodec(_encode_3_uint16, _decode_3_uint16),
+    'list[4*uint8]': PropertyCodec(_encode_4_uint8, _decode_uint8_list),
+    'list[6*uint2]': PropertyCodec(_encode_6_uint2, _decode_6_uint2),
+    'str8': PropertyCodec(_encode_str8, _decode_str8),
+    'str16': PropertyCodec(_encode_str16, _decode_str16),
+    'strany': PropertyCodec(_encode_strany, _decode_strany),
+    'uint8': PropertyCodec(_encode_uint8, _decode_uint8)
+}
+
+# Codec of the properties BrickInput() stands for, by the end of their name
+br_property_suffix_codecs: dict[str, PropertyCodec] = {
+    '.InputAxis': PropertyCodec(_encode_input_axis, _decode_str8),
+    '.Value': PropertyCodec(_encode_float, _decode_float),
+    '.SourceBricks': PropertyCodec(_encode_source_bricks, _decode_brick_id_list, refers_to_bricks=True)
+}
+
+# Codec used to write properties with no codec. They can't be loaded back
+br_untyped_property_codec: PropertyCodec = PropertyCodec(_encode_untyped, _decode_bin, refers_to_bricks=True)
+
+# Codecs registered for a single property with register_property_codec(). They take precedence over its type
+br_property_codecs: dict[str, PropertyCodec] = {}
+
+
+# Use your own encoder and decoder for a property (e.g. a property added to the game BRCI doesn't support yet)
+def register_property_codec(property_name: str, encode: Callable[[any, Callable[[str], int | None]], bytes],
+                            decode: Callable[[bytes], any], refers_to_bricks: bool = False,
+                            always_encode: bool = False) -> PropertyCodec:
+
+    property_codec = PropertyCodec(encode, decode, refers_to_bricks, always_encode)
+    br_property_codecs[property_name] = property_codec
+    return property_codec
+
+
+# Get the codec of a property: the one registered for it, then the one of its type, then the one of its suffix.
+# None if there is none
+def get_property_codec(property_name: str) -> PropertyCodec | None:
+
+    property_codec = br_property_codecs.get(property_name)
+    if property_codec is not None:
+        return property_codec
+
+    property_type = br_property_types.get(property_name)
+    if property_type is not None:
+        return br_property_type_codecs.get(property_type)
+
+    for property_suffix, property_codec in br_property_suffix_codecs.items():
+        if property_name.endswith(property_suffix):
+            return property_codec
+
+    return None
+
+
+
+# A property value kept as it is written in a .brv file (see BRCI.load_brv(raw_values=True)), e.g. because BRCI doesn't
+# know how to read it. It is written back as is for property_key, and decoded with its codec for any other property
+@dataclass(frozen=True)
+class RawPropertyValue:
+
+    property_key: str
+    value_bytes: bytes
+
+    # The value, read with the codec of property_key. Values of properties with no codec are returned as bytes
+    def decode(self) -> any:
+        property_codec = get_property_codec(self.property_key)
+        if property_codec is None:
+            return self.value_bytes
+        return property_codec.decode(self.value_bytes)
@@ -1,5 +1,22 @@
 import BRCI as brci
 import os
+import sys
+
+
+# Builds the creations of batch_export_benchmark(). Worker processes must be able to find it, so it can't be
+# defined below like the other functions.
+def batch_export_vehicle(vehicle_id: int, bricks: int) -> brci.BRCI:
+    import random
+
+    random_bev = random.Random(vehicle_id)
+    creation_bev = brci.BRCI(project_folder_directory=os.path.join(os.getcwd(), 'Projects'),
+                             project_name=f'batch_export_{vehicle_id}', logs=['no_warnings'])
+    for brick_id_bev in range(bricks):
+        creation_bev.anb(str(brick_id_bev), 'ScalableBrick', {
+            'BrickColor': [random_bev.randint(0, 255), 255, 255, 255],
+            'BrickSize': [random_bev.randint(1, 10), random_bev.randint(1, 10), 1]
+        }, [brick_id_bev * 10.0, random_bev.uniform(0.0, 1000.0), 0.0])
+    return creation_bev
 
 
 if __name__ == "__main__":
@@ -81,6 +98,463 @@ if __name__ == "__main__":
             data.clear_bricks()
 
 
+    # This function creates bricks with every kind of property value: lists, packed colors, text, inputs with values or
+    # brick names, booleans, -0.0, a seat and a user appendix
+    def mixed_properties(bricks: int = 300, generate: bool = True) -> None:
+        import random
+
+        random_mp = random.Random(0)
+
+        data.project_name = 'mixed_properties'
+        data.project_display_name = f'Mixed Properties ({bricks}b)'
+
+        data.anb('seat', 'Seat_3x2x2', {'ExitLocation': [1.0, 2, 3.5]}, [0, 0, 0])
+        names_mp = ['seat']
+        for brick_id_mp in range(bricks):
+            name_mp = f'b{brick_id_mp}'
+            position_mp = [random_mp.uniform(-500.0, 500.0), random_mp.randint(-5, 5),
+                           -0.0 if random_mp.random() < 0.1 else random_mp.uniform(0.0, 9.0)]
+            rotation_mp = [random_mp.choice([0, 90, 180.0]), random_mp.uniform(0.0, 360.0), 0]
+            match brick_id_mp % 10:
+                case 0:
+                    data.anb(name_mp, 'ScalableBrick', {
+                        'BrickSize': [random_mp.randint(1, 4), random_mp.choice([1, 1.0, 2.5]), 3],
+                        'BrickColor': random_mp.choice([[1, 2, 3, 255], 0x10203040, [0, 0, 127, 255]]),
+                        'ConnectorSpacing': random_mp.choice([[3, 3, 3, 3, 3, 3], [1, 2, 3, 0, 1, 2], 0xAD6])
+                    }, position_mp, rotation_mp)
+                case 1:
+                    data.anb(name_mp, 'TextBrick', {
+                        'Text': random_mp.choice(['Hi', 'Text', 'héllo wörld', '']),
+                        'TextColor': random_mp.choice([[1, 2, 3], 0x7AD608]),
+                        'FontSize': random_mp.choice([60, 12.5, -0.0, 0.0])
+                    }, position_mp, rotation_mp)
+                case 2:
+                    data.anb(name_mp, 'Switch_1x1x1s', {
+                        'InputChannel': brci.BrickInput(random_mp.choice(['Custom', 'Steering', 'None']),
+                                                        random_mp.sample(names_mp, min(len(names_mp), 3))),
+                        'SwitchName': random_mp.choice(['', 'sw'])
+                    }, position_mp, rotation_mp)
+                case 3:
+                    data.anb(name_mp, 'MathBrick_1sx1sx1s', {
+                        'Operation': random_mp.choice(['Add', 'Multiply']),
+                        'InputChannelB': brci.BrickInput('AlwaysOn', random_mp.choice([1.0, 2.0, 0.5])),
+                        'InputChannelA': brci.BrickInput('Custom', [random_mp.choice(names_mp)])
+                    }, position_mp, rotation_mp)
+                case 4:
+                    data.anb(name_mp, 'Camera_2x1x1', {'OwningSeat': random_mp.choice(['seat', None])},
+                             position_mp, rotation_mp)
+                case 5:
+                    data.anb(name_mp, 'SprocketWheel', {
+                        'IdlerWheels': random_mp.sample(names_mp, min(len(names_mp), 2)),
+                        'TrackColor': [0, 0, 26, 255]
+                    }, position_mp, rotation_mp)
+                case 6:
+                    data.anb(name_mp, 'DisplayBrick', {
+                        'NumFractionalDigits': random_mp.randint(0, 4),
+                        'DisplayColor': random_mp.choice([[0, 204, 128], [255, 0, 0]])
+                    }, position_mp, rotation_mp)
+                case 7:
+                    data.anb(name_mp, 'LightBrick', {
+                        'Brightness': random_mp.random(),
+                        'bGenerateLift': random_mp.random() < 0.5,
+                        'FlashSequence': 'None'
+                    }, position_mp, rotation_mp)
+                case 8:
+                    data.anb(name_mp, 'Actuator_2x2x2_Bottom', {
+                        'InputChannel': brci.BrickInput('Auxiliary', None),
+                        'SpeedFactor': random_mp.choice([1, 2.0])
+                    }, position_mp, rotation_mp)
+                case _:
+                    image_brick_mp = brci.create_brick('ImageBrick', position_mp, rotation_mp)
+                    image_brick_mp['ImageColor'] = random_mp.choice([[1, 2, 3], 0x010203])
+                    data.add_brick(name_mp, image_brick_mp)
+            names_mp.append(name_mp)
+
+        data.seat_brick = 'seat'
+        data.user_appendix = [b'user', b'data!']
+
+        if generate:
+            data.write_preview()
+            data.write_metadata()
+            data.write_brv()
+            data.write_to_br()
+            data.clear_bricks()
+            data.seat_brick = None
+            data.user_appendix = []
+
+
+    # Writes the creations of horn_wave() and mixed_properties() and checks they're byte for byte the same as the
+    # reference files in Doc/reference, written by the original write_brv(). Changes to write_brv() must pass it
+    def reference_file_test() -> None:
+        reference_folder_rft = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reference')
+
+        # Brick types are written in the order of a set of their names, which depends on the hash seed of strings.
+        # The reference files were written with PYTHONHASHSEED=0: running the test again with it
+        if os.environ.get('PYTHONHASHSEED') != '0':
+            import subprocess
+            subprocess.run([sys.executable, os.path.abspath(__file__), 'reference_file_test'], check=True,
+                           env=os.environ | {'PYTHONHASHSEED': '0', 'PYTHONPATH': os.pathsep.join(sys.path)})
+            return
+
+        for file_name_rft, generate_rft in (('horn_wave.brv', lambda: horn_wave(40, 50, 0.5, generate=False)),
+                                            ('mixed_properties.brv', lambda: mixed_properties(generate=False))):
+            generate_rft()
+            # Bricks stored by column (BRCI(columnar=True)) must be written the same way
+            written_rft: dict[str, bytes] = {'BrickList': data.to_brv_bytes()}
+            if brci.numpy_features_enabled:
+                data.bricks = brci.BrickColumns(data.bricks)
+                written_rft['BrickColumns'] = data.to_brv_bytes()
+            data.clear_bricks()
+            data.seat_brick = None
+            data.user_appendix = []
+
+            with open(os.path.join(reference_folder_rft, file_name_rft), 'rb') as reference_file_rft:
+                reference_rft: bytes = reference_file_rft.read()
+            for storage_rft, written_bytes_rft in written_rft.items():
+                matches_rft: bool = written_bytes_rft == reference_rft
+                print(f'{file_name_rft} ({storage_rft}): {"same as" if matches_rft else "DIFFERENT from"} the '
+                      f'reference file.')
+                assert matches_rft
+
+
+    # Writes many creations at once from different threads and checks every output is correct
+    def concurrent_write_test(creations: int = 64, bricks: int = 500, threads: int = 16, rounds: int = 4) -> None:
+        import random
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Creating different creations
+        creations_cwt: list[brci.BRCI] = []
+        for creation_id_cwt in range(creations):
+            creation_cwt = brci.BRCI(project_name=f'concurrent_write_test_{creation_id_cwt}', logs=['no_warnings'])
+            for brick_id_cwt in range(random.randint(1, bricks)):
+                creation_cwt.anb(f'{creation_id_cwt}_{brick_id_cwt}', 'ScalableBrick', {
+                    'BrickColor': [random.randint(0, 255), 255, 255, 255],
+                    'BrickSize': [random.randint(1, 10), random.randint(1, 10), creation_id_cwt % 10 + 1]
+                }, [random.uniform(-1000.0, 1000.0), random.uniform(-1000.0, 1000.0), random.uniform(0.0, 1000.0)])
+            creations_cwt.append(creation_cwt)
+
+        # Writing them one by one
+        expected_cwt: list[bytes] = [creation_cwt.to_brv_bytes() for creation_cwt in creations_cwt]
+
+        # Writing them all at once, each creation several times
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            written_cwt = list(executor.map(brci.BRCI.to_brv_bytes, creations_cwt * rounds))
+
+        mismatches_cwt = sum(written != expected_cwt[i % creations] for i, written in enumerate(written_cwt))
+        print(f'{len(written_cwt)} creations written from {threads} threads: {mismatches_cwt} mismatch(es).')
+        assert mismatches_cwt == 0
+
+
+    # Writes a creation, then edits a few of its bricks and writes it again, with and without incremental_writing
+    def incremental_write_benchmark(bricks: int = 30_000, edit_ratio: float = 0.01, rounds: int = 10) -> None:
+        import random
+        from time import perf_counter
+
+        for incremental_writing_iwb in (False, True):
+            random_iwb = random.Random(0)
+            creation_iwb = brci.BRCI(logs=['no_warnings'], incremental_writing=incremental_writing_iwb)
+            for brick_id_iwb in range(bricks):
+                creation_iwb.anb(str(brick_id_iwb), 'ScalableBrick', {
+                    'BrickColor': [random_iwb.randint(0, 255), random_iwb.randint(0, 255), 255, 255],
+                    'BrickSize': [random_iwb.randint(1, 50), random_iwb.randint(1, 50), 1]
+                }, [brick_id_iwb * 10.0, random_iwb.uniform(0.0, 1000.0), 0.0])
+
+            begin_time_iwb = perf_counter()
+            creation_iwb.to_brv_bytes()
+            first_write_iwb = perf_counter() - begin_time_iwb
+
+            rewrite_times_iwb: list[float] = []
+            for _ in range(rounds):
+                # Edit some bricks in place, then tell BRCI they changed
+                edited_iwb = random_iwb.sample(range(bricks), round(bricks * edit_ratio))
+                for brick_id_iwb in edited_iwb:
+                    creation_iwb.bricks[brick_id_iwb][1]['BrickColor'] = [random_iwb.randint(0, 255), 0, 0, 255]
+                    creation_iwb.bricks[brick_id_iwb][1]['Position'][2] += 10.0
+                creation_iwb.mark_brick_dirty([str(brick_id_iwb) for brick_id_iwb in edited_iwb])
+
+                begin_time_iwb = perf_counter()
+                creation_iwb.to_brv_bytes()
+                rewrite_times_iwb.append(perf_counter() - begin_time_iwb)
+
+            print(f'incremental_writing={incremental_writing_iwb}: first write {first_write_iwb:.3f}s, '
+                  f'rewrite after editing {edit_ratio:.0%} of {bricks} bricks '
+                  f'{sum(rewrite_times_iwb) / rounds:.3f}s (best {min(rewrite_times_iwb):.3f}s)')
+
+
+    # Exports many creations on several processes and prints how many vehicles were exported per second
+    def batch_export_benchmark(creations: int = 1_000, bricks: int = 200, workers: int | None = None) -> None:
+        from functools import partial
+
+        os.makedirs(data.project_folder_directory, exist_ok=True)
+        report_beb = brci.batch_export((partial(batch_export_vehicle, vehicle_id_beb, bricks)
+                                        for vehicle_id_beb in range(creations)), workers=workers)
+        assert not report_beb.failed
+
+
+    # Loads creations of growing size and prints how long it took per brick, which should stay about the same
+    def load_benchmark(sizes: tuple[int, ...] = (5_000, 10_000, 20_000, 40_000)) -> None:
+        import random
+        from time import perf_counter
+
+        os.makedirs(data.project_folder_directory, exist_ok=True)
+        for size_lb in sizes:
+            random_lb = random.Random(size_lb)
+            creation_lb = brci.BRCI(project_folder_directory=data.project_folder_directory,
+                                    project_name=f'load_benchmark_{size_lb}', logs=['no_warnings'])
+            for brick_id_lb in range(size_lb):
+                creation_lb.anb(str(brick_id_lb), 'ScalableBrick', {
+                    'BrickColor': [random_lb.randint(0, 255), 255, 255, 255],
+                    'BrickSize': [random_lb.randint(1, 10), random_lb.randint(1, 10), 1]
+                }, [brick_id_lb * 10.0, random_lb.uniform(0.0, 1000.0), 0.0])
+            creation_lb.write_brv()
+
+            begin_time_lb = perf_counter()
+            brci.BRCI(project_folder_directory=data.project_folder_directory, project_name=f'load_benchmark_{size_lb}',
+                      logs=['no_warnings']).load_brv()
+            load_time_lb = perf_counter() - begin_time_lb
+            print(f'{size_lb} bricks loaded in {load_time_lb:.3f}s ({load_time_lb / size_lb * 1e6:.2f} µs/brick)')
+
+
+    # Writes a creation whose seat is its 4th brick, loads it with filters dropping then keeping the seat (bricks stored
+    # as a list, loaded lazily and stored by column) and checks the seat is right and the creation can be written again
+    def filtered_load_test() -> None:
+        os.makedirs(data.project_folder_directory, exist_ok=True)
+        creation_flt = brci.BRCI(project_folder_directory=data.project_folder_directory,
+                                 project_name='filtered_load_test', logs=['no_warnings'])
+        for brick_id_flt in range(6):
+            creation_flt.anb(f'brick_{brick_id_flt}', 'Seat_3x2x2' if brick_id_flt == 3 else 'ScalableBrick',
+                             pos=[brick_id_flt * 100.0, 0.0, 0.0])
+        creation_flt.seat_brick = 'brick_3'
+        creation_flt.write_brv()
+
+        storages_flt = [(False, False), (False, True)] + ([(True, False)] if brci.numpy_features_enabled else [])
+        # Without BRCI data, loaded bricks are named by their ID in the file
+        for filters_flt, expected_seat_flt in (({'types': ['ScalableBrick']}, None),
+                                               ({'bbox': ([250.0, -1.0, -1.0], [450.0, 1.0, 1.0])}, 3)):
+            for columnar_flt, lazy_flt in storages_flt:
+                loaded_flt = brci.BRCI(project_folder_directory=data.project_folder_directory,
+                                       project_name='filtered_load_test', logs=['no_warnings'], columnar=columnar_flt)
+                loaded_flt.load_brv(lazy=lazy_flt, **filters_flt)
+                assert loaded_flt.seat_brick == expected_seat_flt, (filters_flt, loaded_flt.seat_brick)
+                loaded_flt.to_brv_bytes()
+        print(f'Filtered loads: seat dropped or kept, written again ({len(storages_flt)} storages).')
+
+
+    # Creates bricks as full copies of their default properties (how create_brick() used to), then as BrickProperties
+    # sharing them, and prints how long it took and how much memory they use
+    def brick_properties_benchmark(bricks: int = 50_000) -> None:
+        import tracemalloc
+        from copy import deepcopy
+        from time import perf_counter
+
+        brick_types_bpb = ['ScalableBrick', 'Switch_1sx1sx1s', 'Actuator_2x2x2_Bottom', 'Wheel_2x2s']
+
+        def copied_brick(brick_type: str, position: list[float], brick_properties: dict) -> dict:
+            return deepcopy(brci.br_brick_list[brick_type]) | {'Position': position, 'Rotation': [0, 0, 0]} | \
+                brci.custom_common_properties | brick_properties
+
+        def create_bricks(create_brick_cb) -> list:
+            return [create_brick_cb(brick_types_bpb[brick_id_bpb % len(brick_types_bpb)],
+                                    [brick_id_bpb * 10.0, 0.0, 0.0],
+                                    {'BrickColor': [brick_id_bpb % 256, 255, 255, 255]})
+                    for brick_id_bpb in range(bricks)]
+
+        for name_bpb, create_bpb in (('deepcopy', copied_brick), ('BrickProperties', brci.create_brick)):
+            begin_time_bpb = perf_counter()
+            create_bricks(create_bpb)
+            creation_time_bpb = perf_counter() - begin_time_bpb
+
+            # Measuring memory separately, as tracing it slows everything down
+            tracemalloc.start()
+            bricks_bpb = create_bricks(create_bpb)
+            memory_bpb = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del bricks_bpb
+
+            print(f'{name_bpb}: {bricks} bricks created in {creation_time_bpb:.3f}s, '
+                  f'{memory_bpb / bricks:.0f} bytes/brick')
+
+
+    # Comparing a search through the whole list of bricks (like BRCI used to) with the index kept by data.bricks
+    def brick_index_benchmark(bricks: int = 50_000, removed: int = 5_000) -> None:
+        from time import perf_counter
+
+        def fill(data_bib: brci.BRCI) -> brci.BRCI:
+            for brick_id_bib in range(bricks):
+                data_bib.add_new_brick(f'brick_{brick_id_bib}', 'ScalableBrick',
+                                       position=[brick_id_bib * 10.0, 0.0, 0.0])
+            return data_bib
+
+        removed_names_bib = [f'brick_{brick_id_bib}' for brick_id_bib in range(0, bricks, bricks // removed)]
+
+        # Searching through the whole list for each brick
+        bricks_bib = list(fill(brci.BRCI()).bricks)
+        begin_time_bib = perf_counter()
+        for brick_name_bib in removed_names_bib:
+            for sublist_bib in bricks_bib:
+                if sublist_bib[0] == brick_name_bib:
+                    bricks_bib.remove(sublist_bib)
+                    break
+        print(f'List search: {len(removed_names_bib)} bricks removed in {perf_counter() - begin_time_bib:.3f}s')
+
+        data = fill(brci.BRCI())
+        begin_time_bib = perf_counter()
+        for brick_name_bib in removed_names_bib:
+            data.remove_brick(brick_name_bib)
+        print(f'BrickList: {len(removed_names_bib)} bricks removed in {perf_counter() - begin_time_bib:.3f}s')
+
+
+    # Creates and writes the same creation with bricks stored as a list (data.bricks is a BrickList) and by column
+    # (BRCI(columnar=True)), and prints how long it took and how much memory the bricks use
+    def brick_columns_benchmark(bricks: int = 100_000) -> None:
+        import tracemalloc
+        from time import perf_counter
+
+        brick_types_bcb = ['ScalableBrick', 'Switch_1sx1sx1s', 'Actuator_2x2x2_Bottom', 'Wheel_2x2s']
+
+        def fill(data_bcb: brci.BRCI) -> brci.BRCI:
+            for brick_id_bcb in range(bricks):
+                data_bcb.add_new_brick(f'brick_{brick_id_bcb}', brick_types_bcb[brick_id_bcb % len(brick_types_bcb)],
+                                       {'BrickColor': [brick_id_bcb % 256, 255, 255, 255]},
+                                       position=[brick_id_bcb * 10.0, 0.0, 0.0])
+            return data_bcb
+
+        os.makedirs(data.project_folder_directory, exist_ok=True)
+        for name_bcb, columnar_bcb in (('BrickList', False), ('BrickColumns', True)):
+            begin_time_bcb = perf_counter()
+            creation_bcb = fill(brci.BRCI(project_folder_directory=data.project_folder_directory,
+                                          project_name=f'brick_columns_benchmark_{name_bcb}', logs=['no_warnings'],
+                                          columnar=columnar_bcb))
+            creation_time_bcb = perf_counter() - begin_time_bcb
+            begin_time_bcb = perf_counter()
+            creation_bcb.write_brv()
+            write_time_bcb = perf_counter() - begin_time_bcb
+            del creation_bcb
+
+            # Measuring memory separately, as tracing it slows everything down
+            tracemalloc.start()
+            creation_bcb = fill(brci.BRCI(columnar=columnar_bcb))
+            memory_bcb = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del creation_bcb
+
+            print(f'{name_bcb}: {bricks} bricks created in {creation_time_bcb:.3f}s, written in {write_time_bcb:.3f}s, '
+                  f'{memory_bcb / bricks:.0f} bytes/brick')
+
+
+    # Adding the same bricks, generated as NumPy arrays, with add_new_brick() then add_bricks_from_arrays(), with bricks
+    # stored as a list and by column
+    def add_bricks_from_arrays_benchmark(bricks: int = 50_000) -> None:
+        import numpy as np
+        from time import perf_counter
+
+        random_abfab = np.random.default_rng(0)
+        names_abfab = [f'brick_{brick_id_abfab}' for brick_id_abfab in range(bricks)]
+        types_abfab = np.array(['ScalableBrick', 'Switch_1sx1sx1s'])[random_abfab.integers(0, 2, bricks)]
+        positions_abfab = random_abfab.uniform(-10_000.0, 10_000.0, (bricks, 3))
+        colors_abfab = random_abfab.integers(0, 256, (bricks, 4))
+
+        for columnar_abfab in (False, True):
+            storage_abfab = 'BrickColumns' if columnar_abfab else 'BrickList'
+
+            creation_abfab = brci.BRCI(columnar=columnar_abfab)
+            begin_time_abfab = perf_counter()
+            for brick_id_abfab in range(bricks):
+                creation_abfab.add_new_brick(names_abfab[brick_id_abfab], str(types_abfab[brick_id_abfab]),
+                                             {'BrickColor': colors_abfab[brick_id_abfab].tolist()},
+                                             positions_abfab[brick_id_abfab].tolist())
+            print(f'add_new_brick() ({storage_abfab}): {bricks} bricks added in '
+                  f'{perf_counter() - begin_time_abfab:.3f}s')
+
+            creation_abfab = brci.BRCI(columnar=columnar_abfab)
+            begin_time_abfab = perf_counter()
+            creation_abfab.add_bricks_from_arrays(names_abfab, types_abfab, positions_abfab, BrickColor=colors_abfab)
+            print(f'add_bricks_from_arrays() ({storage_abfab}): {bricks} bricks added in '
+                  f'{perf_counter() - begin_time_abfab:.3f}s')
+
+
+    # Searching the same bricks several times: the first search indexes them, the following ones use the indexes
+    def search_brick_benchmark(bricks: int = 50_000, searches: int = 10) -> None:
+        from time import perf_counter
+
+        brick_types_sbb = ['ScalableBrick', 'Switch_1sx1sx1s', 'TextBrick', 'Actuator_2x2x2_Bottom']
+        for name_sbb, columnar_sbb in (('BrickList', False), ('BrickColumns', True)):
+            if columnar_sbb and not brci.numpy_features_enabled:
+                continue
+            creation_sbb = brci.BRCI(columnar=columnar_sbb)
+            for brick_id_sbb in range(bricks):
+                creation_sbb.add_new_brick(f'brick_{brick_id_sbb}',
+                                           brick_types_sbb[brick_id_sbb % len(brick_types_sbb)],
+                                           {'BrickColor': [brick_id_sbb % 256, 255, 255, 255]},
+                                           position=[brick_id_sbb * 10.0, 0.0, 0.0])
+
+            for search_sbb in ({'is_brick': ['TextBrick']}, {'has_item': {'BrickColor': [7, 255, 255, 255]}},
+                               {'has_value': 'Roboto'}):
+                begin_time_sbb = perf_counter()
+                creation_sbb.search_brick(**search_sbb)
+                first_time_sbb = perf_counter() - begin_time_sbb
+                begin_time_sbb = perf_counter()
+                for _ in range(searches):
+                    creation_sbb.search_brick(**search_sbb)
+                print(f'{name_sbb} {search_sbb}: first search in {first_time_sbb:.3f}s, next ones in '
+                      f'{(perf_counter() - begin_time_sbb) / searches * 1000:.2f}ms')
+
+
+    # Finding bricks around random points by going through every brick, then with the spatial index, adding bricks
+    # next to the nearest one (which updates the index) and moving them (mark_brick_dirty() moves them in the index)
+    def spatial_index_benchmark(bricks: int = 50_000, queries: int = 1_000, radius: float = 200.0) -> None:
+        import random
+        from time import perf_counter
+
+        random_sib = random.Random(0)
+
+        def random_position() -> list[float]:
+            return [random_sib.uniform(-5_000.0, 5_000.0), random_sib.uniform(-5_000.0, 5_000.0),
+                    random_sib.uniform(0.0, 1_000.0)]
+
+        creation_sib = brci.BRCI()
+        for brick_id_sib in range(bricks):
+            creation_sib.add_new_brick(f'brick_{brick_id_sib}', 'ScalableBrick', position=random_position())
+        positions_sib = [random_position() for _ in range(queries)]
+
+        # Going through every brick for a few queries only, as it is slow
+        begin_time_sib = perf_counter()
+        for position_sib in positions_sib[:10]:
+            [brick_sib for brick_sib in creation_sib.bricks
+             if sum((brick_sib[1]['Position'][axis] - position_sib[axis]) ** 2 for axis in range(3)) <= radius ** 2]
+        print(f'Going through every brick: {(perf_counter() - begin_time_sib) / 10 * 1000:.2f}ms per query')
+
+        begin_time_sib = perf_counter()
+        creation_sib.nearest_brick([0.0, 0.0, 0.0])
+        print(f'Spatial index made in {perf_counter() - begin_time_sib:.3f}s')
+
+        begin_time_sib = perf_counter()
+        for position_sib in positions_sib:
+            creation_sib.bricks_in_radius(position_sib, radius)
+        print(f'bricks_in_radius(): {(perf_counter() - begin_time_sib) / queries * 1000:.3f}ms per query')
+
+        begin_time_sib = perf_counter()
+        for position_sib in positions_sib:
+            creation_sib.nearest_brick(position_sib)
+        print(f'nearest_brick(): {(perf_counter() - begin_time_sib) / queries * 1000:.3f}ms per query')
+
+        begin_time_sib = perf_counter()
+        for query_id_sib, position_sib in enumerate(positions_sib):
+            nearest_brick_sib = creation_sib.nearest_brick(position_sib)
+            creation_sib.add_new_brick(f'placed_{query_id_sib}', 'ScalableBrick',
+                                       position=[coordinate + 30.0 for coordinate in nearest_brick_sib[1]['Position']])
+        print(f'{queries} bricks placed next to the nearest brick in {perf_counter() - begin_time_sib:.3f}s')
+
+        # Positions modified in place are only seen once mark_brick_dirty() is called
+        begin_time_sib = perf_counter()
+        for query_id_sib, position_sib in enumerate(positions_sib):
+            creation_sib.get_brick(f'placed_{query_id_sib}')[0][1]['Position'] = position_sib
+            creation_sib.mark_brick_dirty(f'placed_{query_id_sib}')
+        print(f'{queries} bricks moved in place in {perf_counter() - begin_time_sib:.3f}s')
+        assert all(creation_sib.nearest_brick(position_sib)[0] == f'placed_{query_id_sib}'
+                   for query_id_sib, position_sib in enumerate(positions_sib))
+
+
     # --------------------------------------------------
 
     """
@@ -96,9 +570,86 @@ if __name__ == "__main__":
         max_pitch: float, Mandatory. (in percents)
         pitch_step: float, Mandatory. (in percents)
         generate: bool = True (executes write_preview(), write_metadata(), write_brv(), write_to_br(), clear_bricks())
+
+    mixed_properties(bricks, generate)
+        bricks: int = 300
+        generate: bool = True (executes write_preview(), write_metadata(), write_brv(), write_to_br(), clear_bricks())
+
+    reference_file_test() (also: python example.py reference_file_test)
+
+    concurrent_write_test(creations, bricks, threads, rounds)
+        creations: int = 64 (number of different creations)
+        bricks: int = 500 (maximum number of bricks per creation)
+        threads: int = 16
+        rounds: int = 4 (how many times each creation is written)
+
+    incremental_write_benchmark(bricks, edit_ratio, rounds)
+        bricks: int = 30_000
+        edit_ratio: float = 0.01 (part of the bricks edited before each rewrite)
+        rounds: int = 10 (number of rewrites)
+
+    batch_export_benchmark(creations, bricks, workers)
+        creations: int = 1_000
+        bricks: int = 200 (number of bricks per creation)
+        workers: int | None = None (number of processes, None for one per CPU)
+
+    load_benchmark(sizes)
+        sizes: tuple[int, ...] = (5_000, 10_000, 20_000, 40_000) (number of bricks of each creation)
+
+    filtered_load_test()
+
+    brick_properties_benchmark(bricks)
+        bricks: int = 50_000
+
+    brick_index_benchmark(bricks, removed)
+        bricks: int = 50_000
+        removed: int = 5_000 (number of bricks removed by name)
+
+    brick_columns_benchmark(bricks)
+        bricks: int = 100_000
+
+    add_bricks_from_arrays_benchmark(bricks)
+        bricks: int = 50_000
+
+    search_brick_benchmark(bricks, searches)
+        bricks: int = 50_000
+        searches: int = 10 (number of searches after the first one)
+
+    spatial_index_benchmark(bricks, queries, radius)
+        bricks: int = 50_000
+        queries: int = 1_000
+        radius: float = 200.0 (radius of bricks_in_radius())
     """
 
     # stress_test(1_000)
 
     # horn_wave(40, 50, 0.5)
 
+    # mixed_properties()
+
+    # reference_file_test()
+
+    # concurrent_write_test()
+
+    # incremental_write_benchmark()
+
+    # batch_export_benchmark()
+
+    # load_benchmark()
+
+    # filtered_load_test()
+
+    # brick_properties_benchmark()
+
+    # brick_index_benchmark()
+
+    # brick_columns_benchmark()
+
+    # add_bricks_from_arrays_benchmark()
+
+    # search_brick_benchmark()
+
+    # spatial_index_benchmark()
+
+    if sys.argv[1:] == ['reference_file_test']:
+        reference_file_test()
@@ -1,12 +1,19 @@
 import os
 # from warnings import warn as raise_warning
-from copy import deepcopy
 # from datetime import datetime
 from time import perf_counter
 from math import ceil
 import re, shutil
+import struct
+import io, mmap
+import pickle, traceback
+import asyncio, weakref
+from itertools import repeat
+from concurrent.futures import Executor
+from typing import BinaryIO, Callable, Iterable
 
 from .BRCI_RF import *
+from .BRCI_RF.functions import _shared_property_items
 
 # Note : every time you see unsigned_int() / signed_int() / bin_float(), byte_len * 8 is the number of bits.
 
@@ -56,19 +63,20 @@ def is_valid_project_name(folder_name: str):
     return True
 
 
+# Default properties of the brick type are shared, not copied (see BrickProperties)
 def create_brick(brick: str, position: list[float] = None, rotation: list[float] = None,
-                 brick_properties: dict = None) -> dict:
+                 brick_properties: dict = None) -> BrickProperties:
     if brick_properties is None:
         brick_properties = {}
     if position is None:
         position = [0, 0, 0]
     if rotation is None:
         rotation = [0, 0, 0]
-    return deepcopy(br_brick_list[brick]) | {'Position': position,
-                                             'Rotation': rotation} | custom_common_properties | brick_properties
+    return BrickProperties(br_brick_list[brick], {'Position': position,
+                                                  'Rotation': rotation} | custom_common_properties | brick_properties)
 
 
-def cb(b: str, pos: list[float] = None, rot: list[float] = None, p: dict = None) -> dict:
+def cb(b: str, pos: list[float] = None, rot: list[float] = None, p: dict = None) -> BrickProperties:
     return create_brick(b, pos, rot, p)
 
 
@@ -93,7 +101,9 @@ class BRCI:
                  wip_features: bool = False,
                  custom_description_watermark: str | None = None,
                  backup_directory: str = os.path.join(_cwd, 'Backup'),
-                 error_sensitive: bool = False):
+                 error_sensitive: bool = False,
+                 incremental_writing: bool = False,
+                 columnar: bool = False):
 
         # Set each self.x variable to their __init__ counterparts
         self.project_folder_directory = project_folder_directory  # Path
@@ -104,6 +114,8 @@ class BRCI:
         self.file_description = file_description  # String (The description of the file (.brm))
         if bricks is None:  # List (If unspecified, create an empty list)
             bricks = []  # Initialize bricks
+        # Store bricks by column (see BrickColumns) instead of as a list and a dict per brick. Requires NumPy
+        self.columnar = columnar
         self.bricks = bricks  # List (Of bricks)
         if logs is None:
             logs = []
@@ -122,9 +134,39 @@ class BRCI:
         self.custom_description_watermark = custom_description_watermark
         self.backup_directory = backup_directory
         self.error_sensitive = error_sensitive
+        # Keep what write_brv() computed for each brick to only re-encode what changed on the next write_brv()
+        self.incremental_writing = incremental_writing
+        self._brv_incremental_context: BrvWriteContext | None = None
 
         self.__brv_version: int = 0x0E
 
+    # Bricks, as [name, properties]. Kept in a BrickList (unless loaded lazily) to find bricks by name quickly, or in
+    # BrickColumns with columnar
+    @property
+    def bricks(self) -> BrickList | LazyBrickList | BrickColumns:
+        return self._bricks
+
+    @bricks.setter
+    def bricks(self, bricks: list) -> None:
+        if not isinstance(bricks, (BrickList, LazyBrickList, BrickColumns)):
+            bricks = BrickColumns(bricks) if self.columnar else BrickList(bricks)
+        self._bricks = bricks
+        # Indexes of search_brick() and of bricks_in_box() and such, made the first time they're used
+        self._brick_search_index: BrickSearchIndex | None = None
+        self._brick_spatial_index: BrickSpatialIndex | None = None
+
+    # Bricks named brick_name (or named any of brick_name if it's a list), in order
+    def _find_bricks(self, brick_name: str | list[str]) -> list[list]:
+        if not isinstance(self.bricks, (BrickList, BrickColumns)):
+            if isinstance(brick_name, str):
+                return [sublist for sublist in self.bricks if sublist[0] == brick_name]
+            brick_names: set[str] = set(brick_name)
+            return [sublist for sublist in self.bricks if sublist[0] in brick_names]
+
+        if isinstance(brick_name, str):
+            return self.bricks.find(brick_name)
+        return self.bricks.find_any(brick_name)
+
     # Creating more variables
     # In project path
     @property
@@ -154,13 +196,22 @@ class BRCI:
         # TODO : CALCULATE WORTH
         return 1.0
 
+    # Adding a brick ([name, properties]) to self.bricks, and to the spatial index if it is up to date
+    def _append_brick(self, sublist: list) -> None:
+        spatial_index: BrickSpatialIndex | None = self._current_spatial_index()
+        self.bricks.append(sublist)
+        if spatial_index is not None:
+            # Bricks stored by column are copied
+            spatial_index.add(self.bricks.find(sublist[0])[-1])
+            spatial_index.synchronize()
+
     # Adding bricks to the brick list
     def add_brick(self, brick_name: str | list[str], brick: dict | list[dict]):
         if isinstance(brick_name, str):
-            self.bricks.append([str(brick_name), brick])
+            self._append_brick([str(brick_name), brick])
         else:
             for add_brick_i in range(len(brick)):
-                self.bricks.append([str(brick_name[add_brick_i]), brick[add_brick_i]])
+                self._append_brick([str(brick_name[add_brick_i]), brick[add_brick_i]])
 
         return self
 
@@ -168,12 +219,12 @@ class BRCI:
                       position: list[list[float]] | list[float] = None,
                       rotation: list[list[float]] | list[float] = None):
         if isinstance(brick_type, str):
-            self.bricks.append([str(brick_name),
+            self._append_brick([str(brick_name),
                                 create_brick(brick=brick_type, brick_properties=brick, position=position,
                                              rotation=rotation)])
         else:
             for add_new_brick_i in range(len(brick_type)):
-                self.bricks.append([str(brick_name[add_new_brick_i]), create_brick(brick=brick_type[add_new_brick_i],
+                self._append_brick([str(brick_name[add_new_brick_i]), create_brick(brick=brick_type[add_new_brick_i],
                                                                                    brick_properties=brick[
                                                                                        add_new_brick_i],
                                                                                    position=position[add_new_brick_i],
@@ -181,31 +232,137 @@ class BRCI:
 
         return self
 
-    # Removing bricks from the brick list
+    # Adding bricks from arrays (one value per brick) in one go, instead of creating them one by one. Requires NumPy.
+    # brick_name: name of each brick. brick_type: brick type of each brick, or of all of them. position and rotation:
+    # (N, 3) arrays (X, Y, Z), rotation defaults to [0, 0, 0]. property_columns: value of a property for each brick, as
+    # N values or an (N, ...) array (e.g. BrickColor=colors with colors of shape (N, 4)). Properties whose key isn't a
+    # valid argument name can be given with **{'OutputChannel.MinIn': values}
+    def add_bricks_from_arrays(self, brick_name, brick_type, position, rotation=None, **property_columns):
+        if not numpy_features_enabled:
+            raise ImportError('NumPy is required to add bricks from arrays.')
+
+        # Checking everything before any brick is added
+        brick_names: list[str] = [str(name) for name in brick_name]
+        brick_count: int = len(brick_names)
+
+        positions: np.ndarray = np.asarray(position, dtype=np.float64)
+        rotations: np.ndarray = np.zeros((brick_count, 3)) if rotation is None else np.asarray(rotation, dtype=np.float64)
+        for argument_name, array in (('position', positions), ('rotation', rotations)):
+            if array.shape != (brick_count, 3):
+                raise ValueError(f'{argument_name} must be of shape ({brick_count}, 3), not {array.shape}.')
+
+        if isinstance(brick_type, str):
+            brick_types: list[str] = [brick_type]
+            type_ids: np.ndarray = np.zeros(brick_count, dtype=np.int64)
+        else:
+            brick_type = np.asarray(brick_type, dtype=str)
+            if brick_type.shape != (brick_count,):
+                raise ValueError(f'brick_type must be a string or of shape ({brick_count},), not {brick_type.shape}.')
+            # Brick types in the order they first appear, like with add_new_brick()
+            brick_types, first_indexes, type_ids = np.unique(brick_type, return_index=True, return_inverse=True)
+            type_order: np.ndarray = np.argsort(first_indexes)
+            brick_types = brick_types[type_order].tolist()
+            type_ids = np.argsort(type_order)[type_ids]
+        for brick_type_bfa in brick_types:
+            if brick_type_bfa not in br_brick_list:
+                raise KeyError(brick_type_bfa)
+
+        property_values: dict[str, list] = {}
+        for property_key, values in property_columns.items():
+            if property_key in ('gbn', 'Position', 'Rotation'):
+                raise ValueError(f'{property_key} is given by brick_type, position and rotation.')
+            values = values.tolist() if isinstance(values, np.ndarray) else list(values)
+            if len(values) != brick_count:
+                raise ValueError(f'{property_key} must have {brick_count} values, not {len(values)}.')
+            property_values[property_key] = values
+
+        # Bricks stored by column: arrays are copied as they are
+        if isinstance(self.bricks, BrickColumns):
+            self.bricks.extend_columns(brick_names, brick_types, type_ids, positions, rotations, {
+                property_key: dict.fromkeys(range(brick_count), property_value)
+                for property_key, property_value in custom_common_properties.items()
+            } | {property_key: dict(enumerate(values)) for property_key, values in property_values.items()})
+            return self
+
+        # Like create_brick(): overrides are Position, Rotation, custom_common_properties then property_columns
+        brick_type_defaults: list[dict] = [br_brick_list[brick_type_bfa] for brick_type_bfa in brick_types]
+        override_keys: list[str] = ['Position', 'Rotation', *custom_common_properties, *property_values]
+        override_columns: list = [positions.tolist(), rotations.tolist(),
+                                  *(repeat(property_value) for property_value in custom_common_properties.values()),
+                                  *property_values.values()]
+        self.bricks.extend([
+            [name_bfa, BrickProperties(brick_type_defaults[type_id_bfa], dict(zip(override_keys, overrides_bfa)))]
+            for name_bfa, type_id_bfa, overrides_bfa in zip(brick_names, type_ids.tolist(), zip(*override_columns))
+        ])
+
+        return self
+
+    # Removing bricks from the brick list: the first one named brick_name, or every brick named any of brick_name if it
+    # is a list
     def remove_brick(self, brick_name: str | list[str]):
-        for sublist in self.bricks:
-            if sublist[0] == brick_name:
+        removed_bricks: list[list] = self._find_bricks(brick_name)
+        if isinstance(brick_name, str):
+            removed_bricks = removed_bricks[:1]
+
+        spatial_index: BrickSpatialIndex | None = self._current_spatial_index()
+        for sublist in removed_bricks:
+            if spatial_index is not None:
+                spatial_index.remove(sublist)
+            if isinstance(self.bricks, (BrickList, BrickColumns)):
+                self.bricks.discard(sublist)
+            else:
                 self.bricks.remove(sublist)
-                if isinstance(brick_name, str): break
+        if spatial_index is not None:
+            spatial_index.synchronize()
 
         return self
 
-    # Updating a currently existing brick
+    # Updating a currently existing brick. If brick_name is a list, new_brick must be a list of the same length
     def update_brick(self, brick_name: str | list[str], new_brick: dict | list[dict]):
-        for sublist in self.bricks:
-            if sublist[0] == brick_name:
-                sublist[1] = new_brick
-                if isinstance(brick_name, str): break
+        if isinstance(brick_name, str):
+            brick_name, new_brick = [brick_name], [new_brick]
+
+        spatial_index: BrickSpatialIndex | None = self._current_spatial_index()
+        for brick_name_ub, new_brick_ub in zip(brick_name, new_brick):
+            for sublist in self._find_bricks(brick_name_ub)[:1]:
+                self._mark_sublist_dirty(sublist)
+                sublist[1] = new_brick_ub
+                if spatial_index is not None:
+                    spatial_index.move(sublist)
+        if spatial_index is not None:
+            spatial_index.synchronize()
+
+        return self
+
+    # Telling write_brv() (with incremental_writing), search_brick() and the spatial index (bricks_in_box() and such)
+    # bricks were modified in place (brick[1][key] = value, or brick[1]['BrickColor'][0] = 255). write_brv() always
+    # reads Position and Rotation again. With bricks stored by column, only values modified in place
+    # (brick[1]['BrickColor'][0] = 255) require this
+    def mark_brick_dirty(self, brick_name: str | list[str]):
+        spatial_index: BrickSpatialIndex | None = self._current_spatial_index()
+        for sublist in self._find_bricks(brick_name):
+            self._mark_sublist_dirty(sublist)
+            if spatial_index is not None:
+                spatial_index.move(sublist)
+        if spatial_index is not None:
+            spatial_index.synchronize()
+
+        return self
+
+    def _mark_sublist_dirty(self, sublist: list) -> None:
+        self._brick_search_index = None
+        if self._brv_incremental_context is not None and id(sublist) in self._brv_incremental_context.brick_cache_table:
+            self._brv_incremental_context.brick_cache_table[id(sublist)].properties = None
+
+    # Forgetting everything write_brv() kept with incremental_writing. Next write_brv() will re-encode everything
+    def clear_write_cache(self):
+        self._brv_incremental_context = None
 
         return self
 
     # Retrieving bricks from self.bricks
     def get_brick(self, brick_name: str | list[str]) -> list[dict[str, any]]:
-        if isinstance(brick_name, str):
-            brick_names: list[dict[str, any]] = [sublist for sublist in self.bricks if sublist[0] == brick_name]
-        else:
-            brick_names: list[dict[str, any]] = [sublist for sublist in self.bricks if sublist[0] in brick_name]
-        return brick_names
+        return self._find_bricks(brick_name)
 
     def search_brick(self,
                      names: list[str | int] = None,
@@ -219,98 +376,84 @@ class BRCI:
                      output_as_dict: bool = False,
                      tolerance_factor: float = 1e-6):
 
-        met_criteria = {key: False for key, value in {
-            'names': names,
-            'has_property': has_property,
-            'has_value': has_value,
-            'has_value_in_range': has_value_in_range,
-            'has_item': has_item,
-            'has_item_in_range': has_item_in_range,
-            'is_brick': is_brick
-        }.items() if value is not None}
-
-        output_bricks: list[list[dict[str, any]]] = []
+        search_index: BrickSearchIndex = self._search_index()
 
         tolerance = 1 + tolerance_factor
 
-        for brick in self.bricks:
-
-            brick_met_criteria = met_criteria.copy()
-
-            # If brick match with a name
-            if names is not None and brick[0] in names:
-                brick_met_criteria['names'] = True
-
-            # If it is a brick
-            if is_brick is not None and brick[1]['gbn'] in is_brick:
-                brick_met_criteria['is_brick'] = True
-
-            has_item_mc: int = 0
-            has_item_mcir: int = 0
-
-            type_has_value = type(has_value)
-
-            # Checking properties
-            for brick_property, brick_value in brick[1].items():
-
-                type_brick_value = type(brick_value)
-
-                # If it has the correct property
-                if has_property is not None and brick_property in has_property:
-                    brick_met_criteria['has_property'] = True
+        # Widening a range (minimum, maximum) by tolerance_factor
+        def widened_range(value_range: tuple[int | float]) -> tuple[int | float, int | float]:
+            minimum, maximum = value_range[0], value_range[1]
+            return (minimum / tolerance if minimum >= 0 else minimum * tolerance,
+                    maximum * tolerance if maximum >= 0 else maximum / tolerance)
+
+        # Bricks meeting each criterion, by index in search_index.bricks
+        met_criteria: list[set[int]] = []
+        if names is not None:
+            met_criteria.append(search_index.named(names))
+        if has_property is not None:
+            met_criteria.append(search_index.having_property(has_property))
+        if has_value is not None:
+            met_criteria.append(search_index.having_value(has_value, tolerance_factor))
+        if has_value_in_range is not None:
+            met_criteria.append(search_index.having_value_in_range(*widened_range(has_value_in_range)))
+        if has_item is not None:
+            met_criteria.append(search_index.having_items(has_item, tolerance_factor))
+        if has_item_in_range is not None:
+            met_criteria.append(search_index.having_items_in_range({
+                property_key: widened_range(value_range) for property_key, value_range in has_item_in_range.items()}))
+        if is_brick is not None:
+            met_criteria.append(search_index.of_type(is_brick))
+
+        # Combining them
+        if criteria in ('and', 'not and'):
+            met_criteria.sort(key=len)
+            output_brick_indexes: set[int] = met_criteria[0].intersection(*met_criteria[1:]) if met_criteria \
+                else search_index.every_brick()
+        elif criteria in ('or', 'not or'):
+            output_brick_indexes = set().union(*met_criteria)
+        else:
+            output_brick_indexes = set()
+        if criteria in ('not and', 'not or'):
+            output_brick_indexes = search_index.every_brick() - output_brick_indexes
 
-                # If it has the correct value
-                if has_value is not None:
-                    if type_has_value in (int, float) and type_brick_value in (int, float):
-                        if abs(brick_value - has_value) <= tolerance_factor * has_value:
-                            brick_met_criteria['has_value'] = True
-                    else:
-                        if has_value == brick_value:
-                            brick_met_criteria['has_value'] = True
-
-                # If it has a value within a certain range (numbers only)
-                if has_value_in_range is not None:
-                    if has_value_in_range[0] / tolerance <= brick_value <= has_value_in_range[1] * tolerance:
-                        brick_met_criteria['has_value_in_range'] = True
-
-                # If it has the property with the value
-                if has_item is not None:
-
-                    if brick_property in has_item.keys():
-                        if type(has_item[brick_property]) in (int, float) and type_brick_value in (int, float):
-                            has_item_mc += abs(brick_value - has_item[brick_property]) <= tolerance_factor * has_item[
-                                brick_property]
-                        else:
-                            has_item_mc += brick_value == has_item[brick_property]
-
-                # If it has the property with the value being a number in a certain range
-                if has_item_in_range is not None:
-
-                    if brick_property in has_item.keys():
-                        has_item_mcir += has_item[brick_property][0] / tolerance <= brick_value <= \
-                                         has_item[brick_property][0] * tolerance
-
-            # Check if 'has_item' matched
-            if has_item is not None and has_item_mc == len(has_item):
-                brick_met_criteria['has_item'] = True
-            if has_item_in_range is not None and has_item_mcir == len(has_item_in_range):
-                brick_met_criteria['has_item_in_range'] = True
-
-            # Outputting our brick if it's correct
-            if criteria == 'and' and all(brick_met_criteria.values()):
-                output_bricks.append(brick)
-            elif criteria == 'or' and any(brick_met_criteria.values()):
-                output_bricks.append(brick)
-            elif criteria == 'not and' and (not all(brick_met_criteria.values())):
-                output_bricks.append(brick)
-            elif criteria == 'not or' and (not any(brick_met_criteria.values())):
-                output_bricks.append(brick)
+        output_bricks: list[list[dict[str, any]]] = search_index.get_bricks(output_brick_indexes)
 
         if output_as_dict:
             return {brick[0]: brick[1] for brick in output_bricks}
 
         return output_bricks
 
+    # Indexes used by search_brick(), kept from a search to the next until bricks are added, replaced or removed (see
+    # BrickSearchIndex.is_valid()), or until update_brick() or mark_brick_dirty() is called
+    def _search_index(self) -> BrickSearchIndex:
+        if self._brick_search_index is None or not self._brick_search_index.is_valid():
+            self._brick_search_index = BrickSearchIndex(self.bricks)
+        return self._brick_search_index
+
+    # Spatial index if it is up to date, None otherwise. add_brick(), add_new_brick(), update_brick(), remove_brick() and
+    # mark_brick_dirty() update it, modifying bricks any other way (e.g. data.bricks.insert()) has it made again
+    def _current_spatial_index(self) -> BrickSpatialIndex | None:
+        if self._brick_spatial_index is not None and not self._brick_spatial_index.is_valid():
+            self._brick_spatial_index = None
+        return self._brick_spatial_index
+
+    def _spatial_index(self) -> BrickSpatialIndex:
+        if self._current_spatial_index() is None:
+            self._brick_spatial_index = BrickSpatialIndex(self.bricks)
+        return self._brick_spatial_index
+
+    # Bricks whose position is between minimum and maximum (included), in order
+    def bricks_in_box(self, minimum: list[float], maximum: list[float]) -> list[list]:
+        return self._spatial_index().in_box(minimum, maximum)
+
+    # Bricks whose position is within radius of center, from the nearest to the farthest
+    def bricks_in_radius(self, center: list[float], radius: float) -> list[list]:
+        return self._spatial_index().in_radius(center, radius)
+
+    # Brick whose position is the nearest to position (the first one if several are), None if there is no brick
+    def nearest_brick(self, position: list[float]) -> list | None:
+        return self._spatial_index().nearest(position)
+
     def get_all_bricks(self, output_as_dict: bool = False):
         if output_as_dict:
             return {brick[0]: brick[1] for brick in self.bricks}
@@ -326,14 +469,19 @@ class BRCI:
             for brick in self.bricks:
                 brick[1]["Position"] = rotate_point_3d(brick[1]["Position"], center, rotation)
                 brick[1]["Rotation"] = list(map(lambda x, y: x+y, brick[1]["Rotation"], rotation))
+            # Every position changed
+            self._brick_search_index = None
+            self._brick_spatial_index = None
     else:
-        _warn_no_numpy()
+        def rotate_creation(self, center: list[float], rotation: list[float]):
+            self._warn_no_numpy()
 
 
 
     # Deleting all bricks
     def clear_bricks(self):
         self.bricks = []
+        self.clear_write_cache()
         return self
 
     # Add Brick Alias
@@ -433,73 +581,98 @@ class BRCI:
                       os.path.join(self.in_project_folder_directory, file_name))
 
     # Writing metadata.brm file
-    def write_metadata(self, file_name: str = 'MetaData.brm') -> None:
+    # target: writable binary stream (e.g. BytesIO, socket file, zip entry) to write to instead of the project folder
+    def write_metadata(self, file_name: str = 'MetaData.brm', target: BinaryIO | None = None) -> None:
 
         # Create folder if missing
-        self.ensure_project_directory_exists()
+        if target is None:
+            self.ensure_project_directory_exists()
         self.ensure_valid_variable_type('write_blank', f'writing {file_name}')
         self.ensure_valid_variable_type('bricks_len', f'writing {file_name}')
-        self.ensure_valid_variable_type('project_name', f'writing {file_name} (metadata)')
+        if target is None:
+            self.ensure_valid_variable_type('project_name', f'writing {file_name} (metadata)')
 
         # Write blank file for metadata (if desired)
         if self.write_blank:
 
+            # A blank file is an empty file created in the project folder, there is nothing to write to a stream
+            if target is not None:
+                raise ValueError(f"write_blank creates an empty {file_name} in the project folder, it can't be written to a target.")
             with open(os.path.join(self.in_project_folder_directory, file_name), "x"):
                 pass
 
         # Otherwise write working metadata file
         else:
-            with open(os.path.join(self.in_project_folder_directory, file_name), 'wb') as metadata_file:
-
-                # Writes Carriage Return char
-                metadata_file.write(unsigned_int(self.__brv_version, 1))
-
-                # Write all necessary information for the file name
-                metadata_file.write(signed_int(-len(self.project_display_name), 2))
-                metadata_file.write(bin_str(self.project_display_name)[2:])
-
-                # Write all necessary information for the file description
-                watermarked_file_description = f"Created using BRCI (Version {_version}).\r\n" \
-                                               f"Join our discord for more information : sZXaESzDd9"  # String
-                if self.custom_description_watermark is not None:
-                    watermarked_file_description += f'\r\n\r\n{self.custom_description_watermark}'
-                if self.file_description is not None:
-                    watermarked_file_description += f'\r\n\r\nDescription:\r\n{self.file_description}'
-                metadata_file.write(signed_int(-len(watermarked_file_description), 2))
-                metadata_file.write(bin_str(watermarked_file_description)[2:])
-
-                # Write all necessary information for the 4 additional values : Bricks, Size, Weight and Monetary Value
-                metadata_file.write(unsigned_int(self.brick_count, 2))
-                metadata_file.write(bin_float(self.vehicle_size[0], 4))
-                metadata_file.write(bin_float(self.vehicle_size[1], 4))
-                metadata_file.write(bin_float(self.vehicle_size[2], 4))
-                metadata_file.write(bin_float(self.vehicle_weight, 4))
-                metadata_file.write(bin_float(self.vehicle_worth, 4))
-
-                # Writes the author. We don't want it to be listed, so we write invalid data.
-                metadata_file.write(unsigned_int(16, 1))
-                metadata_file.write(b'\x00' * 8)
-
-                # Write time (100 nanosecond Gregorian bigint value)
-                # Creation Time
-                if self.creation_timestamp is None:
-                    metadata_file.write(
-                        unsigned_int(int((datetime.now() - datetime(1, 1, 1)).total_seconds() * 1e7), 8))
-                else:
-                    metadata_file.write(unsigned_int(self.creation_timestamp, 8))
-                # Update Time
-                if self.update_timestamp is None:
-                    metadata_file.write(
-                        unsigned_int(int((datetime.now() - datetime(1, 1, 1)).total_seconds() * 1e7), 8))
-                else:
-                    metadata_file.write(unsigned_int(self.update_timestamp, 8))
 
-                # Write visibility mode
-                metadata_file.write(unsigned_int(self.visibility, 1))
+            metadata_data = self._encode_brm()
 
-                for tag in self.tags:
-                    metadata_file.write(unsigned_int(len(tag), 1))
-                    metadata_file.write(small_bin_str(tag))
+            if target is None:
+                with open(os.path.join(self.in_project_folder_directory, file_name), 'wb') as metadata_file:
+                    metadata_file.write(metadata_data)
+            else:
+                target.write(metadata_data)
+
+    # Getting MetaData.brm's content without writing anything to the disk
+    def to_brm_bytes(self) -> bytes:
+        brm_target = io.BytesIO()
+        self.write_metadata(target=brm_target)
+        return brm_target.getvalue()
+
+    # Encoding MetaData.brm
+    def _encode_brm(self) -> bytearray:
+
+        # Everything is written in this buffer, then written to the file at once
+        metadata_data = bytearray()
+
+        # Writes Carriage Return char
+        metadata_data += unsigned_int(self.__brv_version, 1)
+
+        # Write all necessary information for the file name
+        metadata_data += signed_int(-len(self.project_display_name), 2)
+        metadata_data += bin_str(self.project_display_name)[2:]
+
+        # Write all necessary information for the file description
+        watermarked_file_description = f"Created using BRCI (Version {_version}).\r\n" \
+                                       f"Join our discord for more information : sZXaESzDd9"  # String
+        if self.custom_description_watermark is not None:
+            watermarked_file_description += f'\r\n\r\n{self.custom_description_watermark}'
+        if self.file_description is not None:
+            watermarked_file_description += f'\r\n\r\nDescription:\r\n{self.file_description}'
+        metadata_data += signed_int(-len(watermarked_file_description), 2)
+        metadata_data += bin_str(watermarked_file_description)[2:]
+
+        # Write all necessary information for the 4 additional values : Bricks, Size, Weight and Monetary Value
+        metadata_data += unsigned_int(self.brick_count, 2)
+        metadata_data += bin_float(self.vehicle_size[0], 4)
+        metadata_data += bin_float(self.vehicle_size[1], 4)
+        metadata_data += bin_float(self.vehicle_size[2], 4)
+        metadata_data += bin_float(self.vehicle_weight, 4)
+        metadata_data += bin_float(self.vehicle_worth, 4)
+
+        # Writes the author. We don't want it to be listed, so we write invalid data.
+        metadata_data += unsigned_int(16, 1)
+        metadata_data += b'\x00' * 8
+
+        # Write time (100 nanosecond Gregorian bigint value)
+        # Creation Time
+        if self.creation_timestamp is None:
+            metadata_data += unsigned_int(int((datetime.now() - datetime(1, 1, 1)).total_seconds() * 1e7), 8)
+        else:
+            metadata_data += unsigned_int(self.creation_timestamp, 8)
+        # Update Time
+        if self.update_timestamp is None:
+            metadata_data += unsigned_int(int((datetime.now() - datetime(1, 1, 1)).total_seconds() * 1e7), 8)
+        else:
+            metadata_data += unsigned_int(self.update_timestamp, 8)
+
+        # Write visibility mode
+        metadata_data += unsigned_int(self.visibility, 1)
+
+        for tag in self.tags:
+            metadata_data += unsigned_int(len(tag), 1)
+            metadata_data += small_bin_str(tag)
+
+        return metadata_data
 
     # Writing the project folder to brick rigs # only works on windows AND linux!!!! >:)
     def write_to_br(self) -> None:
@@ -633,534 +806,818 @@ such as emoji.")
             elif 'no_warnings' not in self.logs: FM.warning_with_header(f"Failed to clone folder: {type(e).__name__}: {e}",
                     f"This may be because .backup() function was made for Windows, and Linux/MacOS support is experimental.")
 
-    # Sharing some variables from writing vehicle.brv to the rest of the class
-    bricks_writing = []
-    inverted_property_key_table = {}
-    id_assigned_property_table = {}
-    brci_appendix: list = []
-
-    # Writing Vehicle.brv
-    def write_brv(self, file_name: str = 'Vehicle.brv') -> None:
-
-        self.ensure_project_directory_exists()
+    # Get a brick's properties with BrickInput() replaced by the properties it stands for (.InputAxis, ...)
+    # Bricks are never modified: if there is anything to replace, a new dict is returned instead.
+    def _expanded_properties(self, brick_ep: list, file_name: str = 'Vehicle.brv') -> dict:
+        # Default values aren't copied for the brick (see BrickProperties._shared_items()): they're only read
+        brick_inputs_ep: list[tuple[str, BrickInput]] = [
+            (property_key_ep, property_value_ep) for property_key_ep, property_value_ep
+            in _shared_property_items(brick_ep[1]) if isinstance(property_value_ep, BrickInput)]
+        if not brick_inputs_ep:
+            return brick_ep[1]
+
+        # Same order as before: other properties first, then the ones BrickInput() stand for
+        properties_ep: dict = {property_key_ep: property_value_ep for property_key_ep, property_value_ep
+                               in _shared_property_items(brick_ep[1]) if not isinstance(property_value_ep, BrickInput)}
+        for property_key_ep, brick_input_ep in brick_inputs_ep:
+            properties_ep.update(self._brick_input_properties(brick_ep[0], property_key_ep, brick_input_ep, file_name))
+
+        return properties_ep
+
+    # Get the properties the BrickInput() of property_key_ep (from brick brick_name_ep) stands for
+    def _brick_input_properties(self, brick_name_ep, property_key_ep: str, brick_input_ep: BrickInput,
+                                file_name: str = 'Vehicle.brv') -> dict:
+        prop_ep_temp = brick_input_ep.properties(property_key_ep)
+        # If it's incorrect
+        if isinstance(prop_ep_temp, str) and prop_ep_temp == 'invalid_source_bricks':
+            if self.error_sensitive: raise TypeError(f"Invalid type for brick list: {property_key_ep} from {brick_name_ep!r}")
+            elif 'no_warnings' not in self.logs: FM.warning_with_header("Invalid type for brick list.",
+                    f"Whilst writing vehicle ({file_name}),"
+                    f"we noticed {property_key_ep} (from brick {brick_name_ep!r}) was not set to a list."
+                    f"\nIt was set to type {type(brick_input_ep.brick_input).__name__}. It is now considered as None, corresponding to no inputs.")
+            prop_ep_temp = BrickInput(brick_input_ep.brick_input_type, []).properties(property_key_ep)
+        return prop_ep_temp
+
+    # Get the properties of a brick that will be written as (key, value key (see property_value_key()), value):
+    # BrickInput() expanded, without default values. gbn, Position and Rotation are written separately.
+    def _written_properties(self, brick_wp: list, file_name: str = 'Vehicle.brv') -> list[tuple[str, any, any]]:
+        brick_default_properties = br_brick_list[brick_wp[1]['gbn']]
+        return [(property_key_wp, property_value_key(property_value_wp), property_value_wp)
+                for property_key_wp, property_value_wp in _shared_property_items(self._expanded_properties(brick_wp, file_name))
+                if property_key_wp not in ('gbn', 'Position', 'Rotation')
+                and (property_key_wp not in brick_default_properties
+                     or property_value_wp != brick_default_properties[property_key_wp])]
+
+    # Encoding the values of a property with its codec (see BRCI_RF/property_codecs.py).
+    # Returns them and the length of each of them
+    def _encode_property_values(self, property_type_key: str, property_type_value: list,
+                                string_name_to_id_table: dict[str, int]) -> tuple[bytes, list[int]]:
+
+        property_codec: PropertyCodec = get_property_codec(property_type_key) or br_untyped_property_codec
+        encode = property_codec.encode
+
+        # Looking up the ID of bricks used as values
+        def brick_id(brick_name: str) -> int | None:
+            brick_id_temp = string_name_to_id_table.get(brick_name)
+            if brick_id_temp is None:
+                if self.error_sensitive: raise ValueError(f'Unknown source brick "{brick_name}" requested for property "{property_type_key}".')
+                elif 'no_warnings' not in self.logs: FM.warning_with_header(f'Source brick not found',
+                        f'Unknown source brick "{brick_name}" requested for property "{property_type_key}".')
+            return brick_id_temp
+
+        property_values: list[bytes] = []
+
+        for pt_c_val in property_type_value:
+            # Values loaded with load_brv(raw_values=True) are written as they were read
+            if isinstance(pt_c_val, RawPropertyValue):
+                if pt_c_val.property_key == property_type_key:
+                    property_values.append(pt_c_val.value_bytes)
+                    continue
+                pt_c_val = pt_c_val.decode()
+            try:
+                property_values.append(encode(pt_c_val, brick_id))
+            except (struct.error, TypeError) as e:
+                # struct raises the same error for numbers out of range and for values of the wrong type
+                if isinstance(e, struct.error) and ('out of range' in str(e) or 'requires' in str(e)):
+                    raise OverflowError(f'Value {pt_c_val!r} of property {property_type_key} is out of range: {e}') from e
+                # Values of the wrong type can't be written: writing nothing instead would corrupt the file
+                if self.error_sensitive: raise ValueError(f'The property {property_type_key} has an invalid value {pt_c_val!r}: {e}') from e
+                raise TypeError(f'The property {property_type_key} has an invalid value {pt_c_val!r}: {e}') from e
+
+        return b''.join(property_values), [len(property_value) for property_value in property_values]
+
+    # Writing a property: its key, its values and their lengths
+    @staticmethod
+    def _write_property(brv_data: bytearray, property_type_key: str, property_values_data: bytes | bytearray,
+                        property_length_list: list[int]) -> None:
+
+        # Writing keys
+        brv_data += struct_uint8.pack(len(property_type_key))
+        brv_data += small_bin_str(property_type_key)
+        # Number of values
+        brv_data += struct_uint16.pack(len(property_length_list))
+        # Length of all values
+        brv_data += struct_uint32.pack(len(property_values_data))
+        brv_data += property_values_data
+
+        # Indicating property length if there's more than one property value.
+        if len(property_length_list) > 1:
+            property_length_set: set = set(property_length_list)
+            if len(property_length_set) > 1:
+                brv_data += struct_uint16.pack(0)
+                for property_length in property_length_list:
+                    brv_data += struct_uint16.pack(property_length)
+            else:
+                brv_data += struct_uint16.pack(property_length_list[0])
 
-        # Verify self.write_blank is valid.
-        self.ensure_valid_variable_type('write_blank', f'writing {file_name}')
-        self.ensure_valid_variable_type('project_name', f'writing {file_name} (vehicle)')
+    # Writing everything after the bricks: seat, BRCI appendix and user appendix
+    def _write_brv_appendix(self, brv_data: bytearray, brv_context: BrvWriteContext) -> None:
 
-        # Write blank file for vehicle (if desired)
-        if self.write_blank:
-            blank_brv = open(os.path.join(self.in_project_folder_directory, file_name), "x")
-            blank_brv.close()
-
-        # Otherwise write working vehicle file
+        if self.seat_brick is not None:
+            brv_data += struct_uint16.pack(brv_context.string_name_to_id_table[self.seat_brick])
         else:
+            brv_data += b'\x00\x00'
 
-            # Show generation time if debug logs
-            previous_time = perf_counter()
-            begin_time = perf_counter()
-
-            def brv_brick_types(bricks: list, debug: bool = False) -> list:
-                brick_types_f = list(set(item[1]['gbn'] for item in bricks))
-                if debug:
-                    print(f'{FM.debug} Brick Types......... : {brick_types_f}')
-                return brick_types_f
-
-            # Add missing properties. Only made for BrickInput() but there may be more stuff later on
-            def add_missing_properties(bricks: list, debug: bool = False) -> None:
-                # For each brick
-                for brick_mp in bricks:
-                    # Initialising required variables
-                    properties_to_add: dict = {}
-                    properties_to_remove: list = []
-                    # For each property
-                    for property_key_mp, property_value_mp in brick_mp[1].items():
-                        # If it's set to the BrickInput class
-                        if isinstance(property_value_mp, BrickInput):
-                            # Get the right property list
-                            property_value_mp.prefix = property_key_mp
-                            prop_mp_temp = property_value_mp.properties()
-                            # If it's incorrect
-                            if isinstance(prop_mp_temp, str) and prop_mp_temp == 'invalid_source_bricks':
-                                if self.error_sensitive: raise TypeError(f"Invalid type for brick list: {property_key_mp} from {brick_mp[0]!r}")
-                                elif 'no_warnings' not in self.logs: FM.warning_with_header("Invalid type for brick list.",
-                                        f"Whilst writing vehicle ({file_name}),"
-                                        f"we noticed {property_key_mp} (from brick {brick_mp[0]!r}) was not set to a list."
-                                        f"\nIt was set to type {type(property_value_mp).__name__}. It is now set to None, corresponding to no inputs.")
-                                property_value_mp.brick_input = []
-                                prop_mp_temp = property_value_mp.properties()
-                            # Get rid of the old, put the new instead
-                            properties_to_add.update(prop_mp_temp)
-                            properties_to_remove.append(property_key_mp)
-                    for property_to_remove in properties_to_remove:
-                        del brick_mp[1][property_to_remove]
-                    brick_mp[1].update(properties_to_add)
-                if debug:
-                    print(f'{FM.debug} Modified Brick List. : {bricks}')
-
-            # Verify if there are too many bricks
-            self.ensure_valid_variable_type('bricks_len', f'writing {file_name}')
-            self.ensure_valid_variable_type('logs', f'writing f{file_name}')
-
-            with (open(os.path.join(self.in_project_folder_directory, file_name), 'wb') as brv_file):
-
-                # --------------------------------------------------
-                # SETUP
-                # --------------------------------------------------
-
-                self.bricks_writing = deepcopy(self.bricks)
-
-                # Writes Carriage Return char
-                brv_file.write(unsigned_int(self.__brv_version, 1))
-                # Write brick count
-                brv_file.write(unsigned_int(len(self.bricks_writing), 2))
-
-                # --------------------------------------------------
-                # MISSING PROPERTIES
-                # --------------------------------------------------
-
-                # Add all missing properties, notably inputs.
-                add_missing_properties(self.bricks_writing, 'bricks' in self.logs)
-
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Missing Properties.. : {perf_counter() - previous_time :.6f} seconds')
-
-                # --------------------------------------------------
-                # BRICK TYPES
-                # --------------------------------------------------
-
-                # Get the different bricks present in the project
-                brick_types = brv_brick_types(self.bricks_writing, 'bricks' in self.logs)  # List
-
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Brick Types......... : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
-                if 'bricks' in self.logs:
-                    print(f'{FM.debug} Brick Types............... : {brick_types}')
-
-                # --------------------------------------------------
-                # TEMP IEBL, PROPERTY TABLE, STRING NAME TO ID
-                # --------------------------------------------------
-
-                # Write the number of different brick types
-                brv_file.write(unsigned_int(len(brick_types), 2))
-
-                # [ Getting rid of all properties that are set to the default value for each brick ]
-                # Brick list filtering variables
-                temp_iebl = []  # List of lists containing an integer and a list containing a dictionary and integers
-                safe_property_list: list[str] = ['gbn', 'Position', 'Rotation']
-
-                # Defining bricks
-                w_current_brick_id = 0  # 16 bit
-                string_name_to_id_table = {}
-                property_table = {}
-
-                # List Properties
-                for current_brick in self.bricks_writing:
-                    # Add all bricks without including data
-                    temp_iebl.append([w_current_brick_id, [{}, {}]])
-                    string_name_to_id_table[current_brick[0]] = w_current_brick_id
-                    w_current_brick_id += 1
-
-                    # For each data for each brick
-                    for p_del_current_key, p_del_current_value in current_brick[1].items():
-
-                        # Accept if it's in the safe list (list which gets whitelisted even if default value is identical)
-                        if p_del_current_key in safe_property_list:
-                            temp_iebl[-1][1][0][p_del_current_key] = p_del_current_value
-                        # Otherwise regular process: if not default, get rid of it
-                        elif p_del_current_key not in br_brick_list[current_brick[1]['gbn']]:
-
-                            # THE SAME THING AS DOWN BELOW
-
-                            temp_iebl[-1][1][1][p_del_current_key] = p_del_current_value
-                            # Make sure key in the dict exists
-                            property_table.setdefault(p_del_current_key, [])
-                            # Setup property table
-                            if p_del_current_value not in property_table[p_del_current_key]:
-                                property_table[p_del_current_key].append(p_del_current_value)
-
-                        elif p_del_current_value != br_brick_list[current_brick[1]['gbn']][p_del_current_key]:
-
-                            temp_iebl[-1][1][1][p_del_current_key] = p_del_current_value
-                            # Make sure key in the dict exists
-                            property_table.setdefault(p_del_current_key, [])
-                            # Setup property table
-                            if p_del_current_value not in property_table[p_del_current_key]:
-                                property_table[p_del_current_key].append(p_del_current_value)
-
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: ID Assigning........ : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
-                if 'bricks' in self.logs:
-                    print(f'{FM.debug} Identical Excluded Brick L : {temp_iebl}')
-                    print(f'{FM.debug} Property Table............ : {property_table}')
-                    print(f'{FM.debug} String Name to ID Table... : {string_name_to_id_table}')
-
-                # --------------------------------------------------
-                # ID ASSIGNED PROP. TABLE, PROPERTY KEY TABLE, INVERTED PROPERTY KEY TABLE,
-                # --------------------------------------------------
-
-                # Setup property ids
-                w_current_property_id: int = 0  # 32 bit
-                w_property_count: int = 0  # 32 bit
-                property_key_table: dict = {}
-                w_property_key_num: int = 0
-
-                # Give IDs to all values in var 'id_assigned_property_table'
-                for property_value_key, property_value_value in property_table.items():
-
-                    self.id_assigned_property_table = self.id_assigned_property_table | {property_value_key: {}}
-
-                    for pvv_value in property_value_value:
-                        self.id_assigned_property_table[property_value_key] = self.id_assigned_property_table[
-                                                                                  property_value_key] | {
-                                                                                  w_current_property_id: pvv_value}
-                        w_current_property_id += 1
-                        w_property_count += 1
-
-                    property_key_table = property_key_table | {property_value_key: w_property_key_num}
-                    self.inverted_property_key_table = self.inverted_property_key_table | {
-                        w_property_key_num: property_value_key}
-                    w_property_key_num += 1
-                    w_current_property_id = 0
-
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Prop. ID Assigning.. : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
-                if 'bricks' in self.logs:
-                    print(f'{FM.debug} ID Assigned Property Table : {self.id_assigned_property_table}')
-                    print(f'{FM.debug} Property Key Table........ : {property_key_table}')
-                    print(f'{FM.debug} Inverted Property Key Tbl. : {self.inverted_property_key_table}')
-
-                # --------------------------------------------------
-                # BRICKS WRITING
-                # --------------------------------------------------
-
-                # Give IDs
-                temp_bricks_writing: list = []
-
-                for current_brick in range(len(self.bricks_writing)):
-
-                    temp_bricks_writing += [[temp_iebl[current_brick][0], [temp_iebl[current_brick][1][0], []]]]
-
-                    # Give Property IDs, Brick Type IDs
-                    for current_property, current_property_value in temp_iebl[current_brick][1][1].items():
-
-                        # Find what the id is
-                        for key, value in self.id_assigned_property_table[current_property].items():
-                            if value == current_property_value:
-                                found_key: int = int(key)
-
-                        # Giving IDs
-                        temp_bricks_writing[-1][1][1].append([property_key_table[current_property], found_key])
-
-                    # Giving Brick Type IDs
-                    temp_bricks_writing[-1][1][0]['gbn'] = brick_types.index(temp_bricks_writing[-1][1][0]['gbn'])
-
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Temp Bricks Writing. : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
-
-                # Insert n-word here
-
-                # Bricks Writing is ready to be updated!
-                self.bricks_writing = deepcopy(temp_bricks_writing)
-
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Bricks Writing...... : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
-
-                # Debug
-                if 'bricks' in self.logs:
-                    print(f'{FM.debug} Brick Properties Writing.. : {self.bricks_writing}')
-
-                # Write how many properties there are
-                brv_file.write(unsigned_int(len(property_table), 2))
-
-                # Write each brick type
-                for brick_type in brick_types:
-                    brv_file.write(unsigned_int(len(brick_type), 1))
-                    brv_file.write(small_bin_str(brick_type))
-
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Write Brick Types... : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
+        #  BRCI & USER APPENDIX
 
-                temp_spl: bytes = b''
+        # BRCI Appendix
 
-                # Write properties
-                for property_type_key, property_type_value in property_table.items():
-                    property_length_list: list[int] = []
-                    # Writing keys
-                    brv_file.write(unsigned_int(len(property_type_key), 1))
-                    brv_file.write(small_bin_str(property_type_key))
-                    # Number of values
-                    brv_file.write(unsigned_int(len(property_type_value), 2))
+        # Contents
+        brv_watermark = f'File written with BRCI. Join our discord to learn more: sZXaESzDd9. Version:'
+        brci_appendix = brv_context.brci_appendix
+        brci_appendix.append(small_bin_str(brv_watermark))
+        brci_appendix.append(small_bin_str(_version))
 
-                    for pt_c_val in property_type_value:
+        brick_names_bina = bytearray()
 
-                        temp_pre_spl: bytes = b''
+        # Brick Names
+        brick_names = self.bricks.names if isinstance(self.bricks, BrickColumns) else (brick[0] for brick in self.bricks)
+        for brick_name in brick_names:
+            name: str = str(brick_name)
+            brick_names_bina += struct_uint16.pack(len(name))
+            brick_names_bina += bin_str(name)[2:]
 
-                        if property_type_key in br_property_types.keys():
+        brci_appendix.append(bytes(brick_names_bina))
 
-                            match br_property_types[property_type_key]:
+        # Length
+        brv_data += struct_uint32.pack(len(brci_appendix))
 
-                                case 'bin':
+        # Writing data
+        for brci_individual_appendix in brci_appendix:
+            brv_data += struct_uint32.pack(len(brci_individual_appendix))
+            brv_data += brci_individual_appendix
 
-                                    temp_pre_spl += pt_c_val
+        # USER Appendix
+        if not isinstance(self.user_appendix, list): user_a_use = [self.user_appendix]
+        else: user_a_use = self.user_appendix
+                
+        # Length
+        brv_data += struct_uint32.pack(len(self.user_appendix))
 
-                                case 'bool':
+        # Data
+        for user_individual_appendix in user_a_use:
+            #uia_use: bytearray = bytearray(user_individual_appendix)
+            brv_data += struct_uint32.pack(len(user_individual_appendix))
+            brv_data += user_individual_appendix
 
-                                    temp_pre_spl += unsigned_int(int(pt_c_val), 1)
+    # What the last write_brv() computed, only kept for debug(). Each write_brv() works on its own BrvWriteContext
+    _last_brv_context: BrvWriteContext = BrvWriteContext()
 
-                                case 'brick_id':
+    @property
+    def bricks_writing(self) -> list:
+        return self._last_brv_context.get_bricks_writing()
 
-                                    try:
-                                        temp_pre_spl += unsigned_int(string_name_to_id_table[pt_c_val], 2)
-                                    except KeyError:
-                                        if self.error_sensitive: raise ValueError(f'Unknown source brick "{pt_c_val}" requested for property "{property_type_key}".')
-                                        elif 'no_warnings' not in self.logs: FM.warning_with_header(f'Source brick not found',
-                                                f'Unknown source brick "{pt_c_val}" requested for property "{property_type_key}".')
+    @property
+    def inverted_property_key_table(self) -> dict[int, str]:
+        return self._last_brv_context.inverted_property_key_table
 
-                                case 'custom':
+    @property
+    def id_assigned_property_table(self) -> dict[str, dict[int, any]]:
+        return self._last_brv_context.id_assigned_property_table
 
-                                    # If it is custom then we expect a function
-                                    temp_pre_spl += pt_c_val()
+    @property
+    def brci_appendix(self) -> list[bytes]:
+        return self._last_brv_context.brci_appendix
 
-                                case 'float':
+    # Writing Vehicle.brv
+    # target: writable binary stream (e.g. BytesIO, socket file, zip entry) to write to instead of the project folder
+    def write_brv(self, file_name: str = 'Vehicle.brv', target: BinaryIO | None = None) -> None:
 
-                                    temp_pre_spl += bin_float(pt_c_val, 4)
+        if target is None:
+            self.ensure_project_directory_exists()
 
-                                case 'list[brick_id]':
+        # Verify self.write_blank is valid.
+        self.ensure_valid_variable_type('write_blank', f'writing {file_name}')
+        if target is None:
+            self.ensure_valid_variable_type('project_name', f'writing {file_name} (vehicle)')
 
-                                    if isinstance(pt_c_val, list):
-                                        temp_pre_spl += unsigned_int(len(pt_c_val), 2)
+        # Write blank file for vehicle (if desired)
+        if self.write_blank:
+            # A blank file is an empty file created in the project folder, there is nothing to write to a stream
+            if target is not None:
+                raise ValueError(f"write_blank creates an empty {file_name} in the project folder, it can't be written to a target.")
+            blank_brv = open(os.path.join(self.in_project_folder_directory, file_name), "x")
+            blank_brv.close()
 
-                                        for pt_c_sub_val in pt_c_val:
-                                            try:
-                                                temp_pre_spl += unsigned_int(string_name_to_id_table[pt_c_sub_val] + 1, 2)
-                                            except KeyError:
-                                                if self.error_sensitive: raise ValueError(f'Unknown source brick "{pt_c_sub_val}" requested for property "{property_type_key}".')
-                                                elif 'no_warnings' not in self.logs: FM.warning_with_header(f'Source brick not found',
-                                                        f'Unknown source brick "{pt_c_sub_val}" requested for property "{property_type_key}".')
+        # Otherwise write working vehicle file
+        else:
 
-                                    else:
+            brv_data = self._encode_brv(file_name)
 
-                                        if self.error_sensitive: raise ValueError(f'The property {property_type_key} requires a list of brick IDs, not (a) {type(pt_c_val).__name__} ({pt_c_val}).')
-                                        elif 'no_warnings' not in self.logs: FM.warning_with_header(f'Invalid property type',
-                                                f'The property {property_type_key} requires a list of brick IDs, not (a) {type(pt_c_val).__name__} ({pt_c_val}).')
+            if target is None:
+                with open(os.path.join(self.in_project_folder_directory, file_name), 'wb') as brv_file:
+                    brv_file.write(brv_data)
+            else:
+                target.write(brv_data)
 
-                                case 'list[3*float]':
+    # Getting Vehicle.brv's content without writing anything to the disk
+    def to_brv_bytes(self) -> bytes:
+        brv_target = io.BytesIO()
+        self.write_brv(target=brv_target)
+        return brv_target.getvalue()
 
-                                        temp_pre_spl += bin_float(pt_c_val[0], 4)
-                                        temp_pre_spl += bin_float(pt_c_val[1], 4)
-                                        temp_pre_spl += bin_float(pt_c_val[2], 4)
+    # Encoding Vehicle.brv. file_name is only used in logs
+    def _encode_brv(self, file_name: str = 'Vehicle.brv') -> bytearray:
 
-                                case 'list[3*uint8]':
+        # Verify if there are too many bricks
+        self.ensure_valid_variable_type('bricks_len', f'writing {file_name}')
+        self.ensure_valid_variable_type('logs', f'writing f{file_name}')
 
-                                    if isinstance(pt_c_val, int):
-                                        use_pt_c_val = [(pt_c_val >> i) & 0xFF for i in range(16, -1, -8)]
-                                    else:
-                                        use_pt_c_val = pt_c_val.copy()
+        if isinstance(self.bricks, BrickColumns):
+            return self._encode_brv_columns(file_name)
 
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[0]), 1)
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[1]), 1)
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[2]), 1)
+        if self.incremental_writing:
+            return self._encode_brv_incremental(file_name)
 
-                                case 'list[3*uint16]':
+        # Show generation time if debug logs
+        previous_time = perf_counter()
+        begin_time = perf_counter()
 
-                                    if isinstance(pt_c_val, int):
-                                        use_pt_c_val = [(pt_c_val >> i) & 0xFFFF for i in range(32, -1, -16)]
-                                    else:
-                                        use_pt_c_val = pt_c_val.copy()
+        def brv_brick_types(bricks: list, debug: bool = False) -> list:
+            brick_types_f = list(set(item[1]['gbn'] for item in bricks))
+            if debug:
+                print(f'{FM.debug} Brick Types......... : {brick_types_f}')
+            return brick_types_f
 
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[0]), 2)
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[1]), 2)
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[2]), 2)
+        # --------------------------------------------------
+        # SETUP
+        # --------------------------------------------------
 
-                                case 'list[4*uint8]':
+        # Bricks are only read, never copied: BrickInput() are expanded on the fly (see _expanded_properties())
+        bricks_to_write: list = self.bricks
 
-                                    if isinstance(pt_c_val, int):
-                                        use_pt_c_val = [(pt_c_val >> i) & 0xFF for i in range(24, -1, -8)]
-                                    else:
-                                        use_pt_c_val = pt_c_val.copy()
+        # Everything computed while writing is kept in there rather than in self, so write_brv() can run concurrently
+        brv_context = BrvWriteContext()
 
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[0]), 1)
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[1]), 1)
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[2]), 1)
-                                    temp_pre_spl += unsigned_int(round(use_pt_c_val[3]), 1)
+        # Everything is written in this buffer, then written to the file at once
+        brv_data = bytearray()
 
-                                case 'list[6*uint2]':
+        # Writes Carriage Return char
+        brv_data += struct_uint8.pack(self.__brv_version)
+        # Write brick count
+        brv_data += struct_uint16.pack(len(bricks_to_write))
 
-                                    if isinstance(pt_c_val, int):
-                                        use_pt_c_val = [(pt_c_val >> i) & 0x3 for i in range(12, -1, -2)]
-                                    else:
-                                        use_pt_c_val = pt_c_val.copy()
+        # --------------------------------------------------
+        # BRICK TYPES
+        # --------------------------------------------------
 
-                                    temp_w_spl_connector = (
-                                                use_pt_c_val[0] + (use_pt_c_val[1] << 2) + (use_pt_c_val[2] << 4) +
-                                                (use_pt_c_val[3] << 6) + (use_pt_c_val[4] << 8) + (
-                                                            use_pt_c_val[5] << 10))
+        # Get the different bricks present in the project
+        brick_types = brv_brick_types(bricks_to_write, 'bricks' in self.logs)  # List
+        brv_context.brick_types = brick_types
 
-                                    temp_pre_spl += unsigned_int(temp_w_spl_connector, 2)
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Brick Types......... : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
+        if 'bricks' in self.logs:
+            print(f'{FM.debug} Brick Types............... : {brick_types}')
+
+        # --------------------------------------------------
+        # PROPERTY TABLE, STRING NAME TO ID, BRICKS WRITING
+        # --------------------------------------------------
+
+        # Write the number of different brick types
+        brv_data += struct_uint16.pack(len(brick_types))
+
+        # [ Getting rid of all properties that are set to the default value for each brick ]
+        # Brick list filtering variables
+        brick_type_id_table: dict[str, int] = {brick_type: i for i, brick_type in enumerate(brick_types)}
+        brv_context.brick_type_id_table = brick_type_id_table
+
+        # Defining bricks
+        w_current_brick_id = 0  # 16 bit
+        string_name_to_id_table = brv_context.string_name_to_id_table
+        property_table = brv_context.property_table
+        # Same as property_table, but maps each value's key (see property_value_key()) to its ID
+        property_value_id_table = brv_context.property_value_id_table
+        # Property keys get their ID in the order they're found
+        property_key_table = brv_context.property_key_table
+        bricks_writing = brv_context.bricks_writing
+
+        # List Properties
+        for current_brick in bricks_to_write:
+            # Add all bricks without including data
+            bricks_writing.append([w_current_brick_id, [{}, []]])
+            string_name_to_id_table[current_brick[0]] = w_current_brick_id
+            w_current_brick_id += 1
+
+            brick_safe_properties, brick_property_pairs = bricks_writing[-1][1]
+            # Giving Brick Type IDs. Position, Rotation and gbn are written even if they have default values
+            brick_safe_properties['gbn'] = brick_type_id_table[current_brick[1]['gbn']]
+            brick_safe_properties['Position'] = current_brick[1]['Position']
+            brick_safe_properties['Rotation'] = current_brick[1]['Rotation']
+
+            # For each property to write
+            for p_del_current_key, property_value_key_pt, p_del_current_value in self._written_properties(current_brick, file_name):
+
+                # Make sure key in the dict exists
+                if p_del_current_key not in property_key_table:
+                    property_key_table[p_del_current_key] = len(property_key_table)
+                    property_table[p_del_current_key] = []
+                    property_value_id_table[p_del_current_key] = {}
+                property_values = property_table[p_del_current_key]
+                property_value_ids = property_value_id_table[p_del_current_key]
+                # Setup property table
+                property_value_id = property_value_ids.get(property_value_key_pt)
+                if property_value_id is None:
+                    property_value_id = len(property_values)
+                    property_value_ids[property_value_key_pt] = property_value_id
+                    property_values.append(p_del_current_value)
+
+                # Giving IDs
+                brick_property_pairs.append([property_key_table[p_del_current_key], property_value_id])
 
-                                case 'str8':
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: ID Assigning........ : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
+        if 'bricks' in self.logs:
+            print(f'{FM.debug} Property Table............ : {property_table}')
+            print(f'{FM.debug} String Name to ID Table... : {string_name_to_id_table}')
+            print(f'{FM.debug} ID Assigned Property Table : {brv_context.id_assigned_property_table}')
+            print(f'{FM.debug} Property Key Table........ : {property_key_table}')
+            print(f'{FM.debug} Inverted Property Key Tbl. : {brv_context.inverted_property_key_table}')
 
-                                    temp_pre_spl += signed_int(len(pt_c_val), 1)
-                                    temp_pre_spl += small_bin_str(pt_c_val)
+        # Debug
+        if 'bricks' in self.logs:
+            print(f'{FM.debug} Brick Properties Writing.. : {bricks_writing}')
 
-                                case 'str16':
+        # Write how many properties there are
+        brv_data += struct_uint16.pack(len(property_table))
 
-                                    temp_pre_spl += signed_int(-len(pt_c_val), 2)
-                                    temp_pre_spl += pt_c_val.encode('utf-16')[2:]
+        # Write each brick type
+        for brick_type in brick_types:
+            brv_data += struct_uint8.pack(len(brick_type))
+            brv_data += small_bin_str(brick_type)
 
-                                case 'strany':
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Brick Types... : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
 
-                                    try:
-                                        # Assume it can be a long str8
-                                        temp_pre_spl += signed_int(len(pt_c_val), 2)
-                                        temp_pre_spl += small_bin_str(pt_c_val)
+        # Write properties
+        for property_type_key, property_type_value in property_table.items():
+            self._write_property(brv_data, property_type_key,
+                                 *self._encode_property_values(property_type_key, property_type_value,
+                                                               string_name_to_id_table))
 
-                                    except UnicodeEncodeError:
-                                        # Assume since it's not a long str8 it must be a long str16
-                                        temp_pre_spl += signed_int(-len(pt_c_val), 2)
-                                        temp_pre_spl += pt_c_val.encode('utf-16')[2:]
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Properties.... : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
 
-                                case 'uint8':
+        # WRITING BRICKS
 
-                                    temp_pre_spl += unsigned_int(int(pt_c_val), 1)
+        # With NumPy, all bricks are packed at once
+        if numpy_features_enabled:
 
+            brv_data += np_pack_brick_records(
+                [current_brick[1][0]['gbn'] for current_brick in bricks_writing],
+                [len(current_brick[1][1]) for current_brick in bricks_writing],
+                [property_id for current_brick in bricks_writing
+                 for current_property in current_brick[1][1] for property_id in current_property],
+                [[current_brick[1][0]['Position'][0], current_brick[1][0]['Position'][1],
+                  current_brick[1][0]['Position'][2], current_brick[1][0]['Rotation'][1],
+                  current_brick[1][0]['Rotation'][2], current_brick[1][0]['Rotation'][0]]
+                 for current_brick in bricks_writing])
 
-                        elif isinstance(pt_c_val, list) and (isinstance(pt_c_val[0], str) or isinstance(pt_c_val[0], int)):  # OR if it doesn't end with .InputAxis
+        # Otherwise, one by one
+        else:
 
-                            temp_pre_spl += unsigned_int(len(pt_c_val), 2)
-                            for pt_c_sub_val in pt_c_val:
-                                #print(f"pt_c_sub_val: {pt_c_sub_val}\npt_c_sub_val type: {type(pt_c_sub_val)}\npt_c_val: {pt_c_val}")
-                                try:
-                                    temp_pre_spl += unsigned_int(string_name_to_id_table[str(pt_c_sub_val)] + 1, 2)
-                                except KeyError:
-                                    if self.error_sensitive: raise KeyError(f'Unknown source brick "{pt_c_sub_val}" requested in property "{property_type_key}"')
-                                    elif 'no_warnings' not in self.logs: FM.warning_with_header(f'Unknown source brick',
-                                            f'Unknown source brick "{pt_c_sub_val}" requested in property "{property_type_key}"')
+            # Each brick takes 31 bytes + 4 bytes per property. Allocate them all at once, then fill them in
+            brick_data_offset: int = len(brv_data)
+            brv_data += bytes(sum(31 + 4 * len(current_brick[1][1]) for current_brick in bricks_writing))
+
+            for current_brick in bricks_writing:
+
+                brick_properties_writing = current_brick[1][1]
+                brick_transform_writing = current_brick[1][0]
+
+                # Writing Brick Type, length of the brick's data and number of properties
+                struct_brick_header.pack_into(brv_data, brick_data_offset, brick_transform_writing['gbn'],
+                                              25 + 4 * len(brick_properties_writing), len(brick_properties_writing))
+                brick_data_offset += 7
+                # Writing properties
+                for current_property in brick_properties_writing:
+                    struct_property_pair.pack_into(brv_data, brick_data_offset, current_property[0], current_property[1])
+                    brick_data_offset += 4
+                # Writing position and rotation
+                # Note sure why rotation is out of order in the brv (Y, Z, X). Whatever
+                struct_brick_transform.pack_into(brv_data, brick_data_offset,
+                                                 float(brick_transform_writing['Position'][0]),
+                                                 float(brick_transform_writing['Position'][1]),
+                                                 float(brick_transform_writing['Position'][2]),
+                                                 float(brick_transform_writing['Rotation'][1]),
+                                                 float(brick_transform_writing['Rotation'][2]),
+                                                 float(brick_transform_writing['Rotation'][0]))
+                brick_data_offset += 24
 
-                        elif isinstance(pt_c_val, str):  # OR if it ends with .InputAxis
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Bricks........ : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
 
-                            temp_pre_spl += unsigned_int(len(pt_c_val), 1)
+        self._write_brv_appendix(brv_data, brv_context)
 
-                            temp_pre_spl += small_bin_str(pt_c_val)
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Appendix...... : {perf_counter() - previous_time :.6f} seconds')
+            print(f'{FM.debug} Time: Total............... : {perf_counter() - begin_time :.6f} seconds')
 
-                        elif isinstance(pt_c_val, float) or isinstance(pt_c_val, int):
-                            temp_pre_spl += bin_float(pt_c_val, 4)
+        self._last_brv_context = brv_context
 
-                        else:
+        return brv_data
 
-                            raise ValueError(f'Unsupported property type: {pt_c_val}.\n'
-                                             f'Consider using bin to implement this property, as explained in Doc/DOCUMENTATION.md\n'
-                                             f'DEBUG INFORMATION: {pt_c_val}, ')
+    # Encoding Vehicle.brv from BrickColumns (see BRCI(columnar=True)): everything is read from the columns, no brick is
+    # made. incremental_writing isn't used. The file is the same as the one written from a list of the same bricks
+    def _encode_brv_columns(self, file_name: str = 'Vehicle.brv') -> bytearray:
 
-                        property_length_list.append(len(temp_pre_spl))
-                        temp_spl += temp_pre_spl
+        # Show generation time if debug logs
+        previous_time = perf_counter()
+        begin_time = perf_counter()
 
-                    brv_file.write(unsigned_int(len(temp_spl), 4))
-                    brv_file.write(temp_spl)
+        brick_columns: BrickColumns = self.bricks
+        brick_names: list = brick_columns.names
+        column_type_ids: np.ndarray = brick_columns.type_ids
+        column_brick_types: list[str] = brick_columns.brick_types
+
+        # Everything computed while writing is kept in there rather than in self, so write_brv() can run concurrently
+        brv_context = BrvWriteContext()
+
+        # --------------------------------------------------
+        # BRICK TYPES
+        # --------------------------------------------------
+
+        # Brick types still used, in the order they're first used by a brick. Made into a set like with a list of bricks
+        # (see brv_brick_types() in _encode_brv()), so they come in the same order: the order of a set only depends on
+        # the order its items were first added in.
+        used_type_ids, first_indexes = np.unique(column_type_ids, return_index=True)
+        used_type_ids = used_type_ids[np.argsort(first_indexes)]
+        brick_types: list[str] = list(set(column_brick_types[type_id] for type_id in used_type_ids.tolist()))
+        brv_context.brick_types = brick_types
+        brick_type_id_table: dict[str, int] = {brick_type: i for i, brick_type in enumerate(brick_types)}
+        brv_context.brick_type_id_table = brick_type_id_table
+        # Brick type ID of each brick, in brick_types
+        type_ids: np.ndarray = np.array([brick_type_id_table.get(brick_type, 0) for brick_type in column_brick_types],
+                                        dtype=np.uint16)[column_type_ids]
 
-                    # Indicating property length if there's more than one property value.
-                    if len(property_length_list) > 1:
-                        property_length_set: set = set(property_length_list)
-                        if len(property_length_set) > 1:
-                            brv_file.write(unsigned_int(0, 2))
-                            for property_length in property_length_list:
-                                brv_file.write(unsigned_int(property_length, 2))
-                        else:
-                            brv_file.write(unsigned_int(property_length_list[0], 2))
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Brick Types......... : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
+        if 'bricks' in self.logs:
+            print(f'{FM.debug} Brick Types............... : {brick_types}')
+
+        # --------------------------------------------------
+        # PROPERTY TABLE, STRING NAME TO ID, PROPERTY PAIRS
+        # --------------------------------------------------
+
+        string_name_to_id_table = brv_context.string_name_to_id_table
+        for brick_id, brick_name in enumerate(brick_names):
+            string_name_to_id_table[brick_name] = brick_id
+        property_table = brv_context.property_table
+        property_value_id_table = brv_context.property_value_id_table
+        property_key_table = brv_context.property_key_table
+
+        # Default properties of each brick type, by brick type ID in the columns
+        default_properties_bt: list[dict] = [br_brick_list.get(brick_type, {}) for brick_type in column_brick_types]
+        column_type_id_list: list[int] = column_type_ids.tolist()
+
+        property_columns: dict[str, dict[int, any]] = brick_columns.property_columns()
+
+        # Properties are written in the same order as with a list of bricks (see _written_properties()), so keys and
+        # values get the same IDs: in each brick, default properties first, then the other ones in the order of
+        # property_columns, then the ones BrickInput() stand for. rank is where a property comes in its brick.
+        default_ranks_bt: list[dict[str, int]] = [{property_key: i for i, property_key in enumerate(default_properties)}
+                                                  for default_properties in default_properties_bt]
+        column_ranks: dict[str, int] = {property_key: i for i, property_key in enumerate(property_columns)}
+
+        def property_rank(column_type_id: int, property_key: str) -> int:
+            default_ranks: dict[str, int] = default_ranks_bt[column_type_id]
+            if property_key in default_ranks:
+                return default_ranks[property_key]
+            return len(default_ranks) + column_ranks[property_key]
+
+        # Brick ID, rank, key and value of each property written
+        pair_brick_ids: list[int] = []
+        pair_ranks: list[int] = []
+        pair_keys: list[str] = []
+        pair_values: list = []
+
+        def add_property(brick_id: int, rank: int, property_key: str, property_value) -> None:
+            pair_brick_ids.append(brick_id)
+            pair_ranks.append(rank)
+            pair_keys.append(property_key)
+            pair_values.append(property_value)
+
+        # Properties BrickInput() stand for come after all the others, in the order of their BrickInput()
+        def add_brick_input_properties(brick_id: int, rank: int, brick_input_properties: dict) -> None:
+            rank = (1 << 32) + (rank << 10)
+            for input_index, (input_key, input_value) in enumerate(brick_input_properties.items()):
+                add_property(brick_id, rank + input_index, input_key, input_value)
+
+        # Default BrickInput() are written too, as the properties they stand for
+        brick_input_keys: dict[str, None] = {property_key: None for default_properties in default_properties_bt
+                                             for property_key, property_value in default_properties.items()
+                                             if isinstance(property_value, BrickInput)}
+        for property_key in brick_input_keys:
+            # Properties of the default BrickInput() of each brick type, by brick type ID in the columns
+            default_input_properties: dict[int, dict] = {}
+            for brick_id in brick_columns.default_value_indexes(property_key).tolist():
+                column_type_id: int = column_type_id_list[brick_id]
+                if column_type_id not in default_input_properties:
+                    default_input_properties[column_type_id] = self._brick_input_properties(
+                        brick_names[brick_id], property_key, default_properties_bt[column_type_id][property_key],
+                        file_name)
+                add_brick_input_properties(brick_id, property_rank(column_type_id, property_key),
+                                           default_input_properties[column_type_id])
+
+        for property_key, property_column in property_columns.items():
+            for brick_id, property_value in property_column.items():
+                column_type_id: int = column_type_id_list[brick_id]
+                # BrickInput() are written as the properties they stand for
+                if isinstance(property_value, BrickInput):
+                    add_brick_input_properties(brick_id, property_rank(column_type_id, property_key),
+                                               self._brick_input_properties(brick_names[brick_id], property_key,
+                                                                            property_value, file_name))
+                    continue
+                default_properties = default_properties_bt[column_type_id]
+                if property_key not in default_properties or property_value != default_properties[property_key]:
+                    add_property(brick_id, property_rank(column_type_id, property_key), property_key, property_value)
+
+        # Properties are written brick after brick, and keys and values get their ID in the order they're found
+        pair_order: list[int] = np.lexsort((np.asarray(pair_ranks, dtype=np.int64),
+                                            np.asarray(pair_brick_ids, dtype=np.int64))).tolist()
+        pair_key_ids: list[int] = []
+        pair_value_ids: list[int] = []
+        for pair_id in pair_order:
+            property_key = pair_keys[pair_id]
+            property_value = pair_values[pair_id]
+            # Make sure key in the dict exists
+            if property_key not in property_key_table:
+                property_key_table[property_key] = len(property_key_table)
+                property_table[property_key] = []
+                property_value_id_table[property_key] = {}
+            property_values = property_table[property_key]
+            property_value_ids = property_value_id_table[property_key]
+            property_value_key_pr = property_value_key(property_value)
+            property_value_id = property_value_ids.get(property_value_key_pr)
+            if property_value_id is None:
+                property_value_id = len(property_values)
+                property_value_ids[property_value_key_pr] = property_value_id
+                property_values.append(property_value)
+            pair_key_ids.append(property_key_table[property_key])
+            pair_value_ids.append(property_value_id)
 
-                    temp_spl: bytes = b''  # Reset
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: ID Assigning........ : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
+        if 'bricks' in self.logs:
+            print(f'{FM.debug} Property Table............ : {property_table}')
+            print(f'{FM.debug} String Name to ID Table... : {string_name_to_id_table}')
+            print(f'{FM.debug} Property Key Table........ : {property_key_table}')
+
+        # --------------------------------------------------
+        # WRITING
+        # --------------------------------------------------
+
+        brv_data = bytearray()
+
+        # Writes Carriage Return char
+        brv_data += struct_uint8.pack(self.__brv_version)
+        # Write brick count, number of brick types and number of properties
+        brv_data += struct_uint16.pack(len(brick_names))
+        brv_data += struct_uint16.pack(len(brick_types))
+        brv_data += struct_uint16.pack(len(property_table))
+
+        # Write each brick type
+        for brick_type in brick_types:
+            brv_data += struct_uint8.pack(len(brick_type))
+            brv_data += small_bin_str(brick_type)
+
+        # Write properties
+        for property_type_key, property_type_value in property_table.items():
+            self._write_property(brv_data, property_type_key,
+                                 *self._encode_property_values(property_type_key, property_type_value,
+                                                               string_name_to_id_table))
 
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Write Properties.... : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Properties.... : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
 
-                # WRITING BRICKS
-                brick_data_writing: bytes = b''
+        brv_data += np_pack_brick_records(
+            type_ids,
+            np.bincount(np.asarray(pair_brick_ids, dtype=np.int64), minlength=len(brick_names)),
+            np.column_stack((np.asarray(pair_key_ids, dtype=np.uint16), np.asarray(pair_value_ids, dtype=np.uint16))),
+            # Rotation is written as (Y, Z, X)
+            np.column_stack((brick_columns.positions, brick_columns.rotations[:, [1, 2, 0]])))
 
-                for current_brick in self.bricks_writing:
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Bricks........ : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
 
-                    # Writing Brick Type
-                    brv_file.write(unsigned_int(current_brick[1][0]['gbn'], 2))
-                    # Getting ready to list properties
-                    brick_data_writing += unsigned_int(len(current_brick[1][1]), 1)
-                    for current_property in current_brick[1][1]:
-                        brick_data_writing += unsigned_int(current_property[0], 2)
-                        brick_data_writing += unsigned_int(current_property[1], 2)
-                    # Getting ready to write position and rotation
-                    brick_data_writing += bin_float(float(current_brick[1][0]['Position'][0]), 4)
-                    brick_data_writing += bin_float(float(current_brick[1][0]['Position'][1]), 4)
-                    brick_data_writing += bin_float(float(current_brick[1][0]['Position'][2]), 4)
-                    # Note sure why its out of order in the brv. Whatever
-                    brick_data_writing += bin_float(float(current_brick[1][0]['Rotation'][1]), 4)
-                    brick_data_writing += bin_float(float(current_brick[1][0]['Rotation'][2]), 4)
-                    brick_data_writing += bin_float(float(current_brick[1][0]['Rotation'][0]), 4)
+        self._write_brv_appendix(brv_data, brv_context)
 
-                    # Writing
-                    brv_file.write(unsigned_int(len(brick_data_writing), 4))
-                    brv_file.write(brick_data_writing)
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Appendix...... : {perf_counter() - previous_time :.6f} seconds')
+            print(f'{FM.debug} Time: Total............... : {perf_counter() - begin_time :.6f} seconds')
 
-                    # Reset
-                    brick_data_writing = b''
+        self._last_brv_context = brv_context
 
-                if self.seat_brick is not None:
-                    brv_file.write(unsigned_int(string_name_to_id_table[self.seat_brick], 2))
-                else:
-                    brv_file.write(b'\x00\x00')
+        return brv_data
 
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Write Bricks........ : {perf_counter() - previous_time :.6f} seconds')
-                    previous_time = perf_counter()
+    # Encoding Vehicle.brv with incremental_writing: starting from what the last write_brv() did, only bricks and
+    # values that are new or were modified are encoded. IDs stay the same, so unchanged records are reused as is.
+    # rebuild: start a new generation, re-encoding everything (values nobody uses anymore are dropped)
+    def _encode_brv_incremental(self, file_name: str = 'Vehicle.brv', rebuild: bool = False) -> bytearray:
 
-                #  BRCI & USER APPENDIX
+        # Show generation time if debug logs
+        previous_time = perf_counter()
+        begin_time = perf_counter()
 
-                # BRCI Appendix
+        bricks_to_write: list = self.bricks
+        previous_context: BrvWriteContext | None = self._brv_incremental_context
+        previous_brick_cache: dict[int, BrvBrickCache] = {} if previous_context is None else previous_context.brick_cache_table
+
+        # Continue the generation of the last write, or start a new one
+        if rebuild or previous_context is None:
+            brv_context = BrvWriteContext(generation=object())
+            # Same brick type order as without incremental_writing
+            brv_context.brick_types = list(set(current_brick[1]['gbn'] for current_brick in bricks_to_write))
+            brv_context.brick_type_id_table = {brick_type: i for i, brick_type in enumerate(brv_context.brick_types)}
+            brv_context.brick_type_refs = [0] * len(brv_context.brick_types)
+        else:
+            brv_context = previous_context.carry_over()
+
+        generation: object = brv_context.generation
+        brick_types = brv_context.brick_types
+        brick_type_id_table = brv_context.brick_type_id_table
+        brick_type_refs = brv_context.brick_type_refs
+        string_name_to_id_table = brv_context.string_name_to_id_table
+        property_table = brv_context.property_table
+        property_value_id_table = brv_context.property_value_id_table
+        property_key_table = brv_context.property_key_table
+        property_value_refs = brv_context.property_value_refs
+        brick_caches = brv_context.brick_caches
+        # What is kept for the next write
+        brick_cache: dict[int, BrvBrickCache] = brv_context.brick_cache_table
+        # Record of each brick (without position and rotation), then its position and rotation
+        brick_records: list[bytes] = []
+
+        # A brick was modified or removed: its values are used by one less brick
+        def release_brick(brick_cache_rb: BrvBrickCache) -> None:
+            brick_type_refs[brick_cache_rb.brick_type_id] -= 1
+            for property_key_id_rb, property_value_id_rb in brick_cache_rb.property_pairs:
+                property_value_refs[property_key_id_rb][property_value_id_rb] -= 1
+
+        # --------------------------------------------------
+        # PROPERTY TABLE, STRING NAME TO ID, BRICKS WRITING
+        # --------------------------------------------------
+
+        w_current_brick_id = 0  # 16 bit
+        for current_brick in bricks_to_write:
+            string_name_to_id_table[current_brick[0]] = w_current_brick_id
+
+            # Same brick listed more than once
+            current_brick_cache = brick_cache.get(id(current_brick))
+            if current_brick_cache is None:
+                current_brick_cache = previous_brick_cache.get(id(current_brick))
+                brick_unchanged: bool = (current_brick_cache is not None
+                                         and current_brick_cache.properties is not None
+                                         and current_brick_cache.brick is current_brick
+                                         and current_brick_cache.brick_properties is current_brick[1]
+                                         and current_brick_cache.brick_type == current_brick[1]['gbn'])
+
+                if not brick_unchanged or current_brick_cache.generation is not generation:
+                    if current_brick_cache is not None and current_brick_cache.generation is generation:
+                        release_brick(current_brick_cache)
+                    current_brick_cache = BrvBrickCache(
+                        current_brick, current_brick[1], current_brick[1]['gbn'],
+                        current_brick_cache.properties if brick_unchanged
+                        else self._written_properties(current_brick, file_name),
+                        generation)
 
-                # Contents
-                brv_watermark = f'File written with BRCI. Join our discord to learn more: sZXaESzDd9. Version:'
-                self.brci_appendix.append(small_bin_str(brv_watermark))
-                self.brci_appendix.append(small_bin_str(_version))
+                    # Giving Brick Type IDs
+                    brick_type_id = brick_type_id_table.get(current_brick_cache.brick_type)
+                    if brick_type_id is None:
+                        brick_type_id = len(brick_types)
+                        brick_type_id_table[current_brick_cache.brick_type] = brick_type_id
+                        brick_types.append(current_brick_cache.brick_type)
+                        brick_type_refs.append(0)
+                    brick_type_refs[brick_type_id] += 1
+                    current_brick_cache.brick_type_id = brick_type_id
+
+                    # Giving IDs, new values are added after the existing ones
+                    for p_del_current_key, property_value_key_pt, p_del_current_value in current_brick_cache.properties:
+                        property_key_id = property_key_table.get(p_del_current_key)
+                        if property_key_id is None:
+                            property_key_id = len(property_key_table)
+                            property_key_table[p_del_current_key] = property_key_id
+                            property_table[p_del_current_key] = []
+                            property_value_id_table[p_del_current_key] = {}
+                            property_value_refs.append([])
+                        property_value_id = property_value_id_table[p_del_current_key].get(property_value_key_pt)
+                        if property_value_id is None:
+                            property_value_id = len(property_table[p_del_current_key])
+                            property_value_id_table[p_del_current_key][property_value_key_pt] = property_value_id
+                            property_table[p_del_current_key].append(p_del_current_value)
+                            property_value_refs[property_key_id].append(0)
+                        property_value_refs[property_key_id][property_value_id] += 1
+                        current_brick_cache.property_pairs.append([property_key_id, property_value_id])
+
+                    # Writing Brick Type, length of the brick's data, number of properties and properties
+                    current_brick_cache.record = (
+                        struct_brick_header.pack(brick_type_id, 25 + 4 * len(current_brick_cache.property_pairs),
+                                                 len(current_brick_cache.property_pairs))
+                        + struct.pack(f'<{2 * len(current_brick_cache.property_pairs)}H',
+                                      *[property_id for current_property in current_brick_cache.property_pairs
+                                        for property_id in current_property]))
+
+                brick_cache[id(current_brick)] = current_brick_cache
+
+            brick_caches.append(current_brick_cache)
+            w_current_brick_id += 1
+
+            # Position and rotation are always written again
+            # Note sure why rotation is out of order in the brv (Y, Z, X). Whatever
+            brick_records.append(current_brick_cache.record)
+            brick_records.append(struct_brick_transform.pack(float(current_brick[1]['Position'][0]),
+                                                             float(current_brick[1]['Position'][1]),
+                                                             float(current_brick[1]['Position'][2]),
+                                                             float(current_brick[1]['Rotation'][1]),
+                                                             float(current_brick[1]['Rotation'][2]),
+                                                             float(current_brick[1]['Rotation'][0])))
+
+        # Bricks that were removed
+        for brick_cache_key, previous_brick_cache_entry in previous_brick_cache.items():
+            if brick_cache_key not in brick_cache and previous_brick_cache_entry.generation is generation:
+                release_brick(previous_brick_cache_entry)
+
+        # Values nobody uses anymore are still written. Start over once they outnumber the others
+        unused_count: int = brick_type_refs.count(0) + sum(refs.count(0) for refs in property_value_refs)
+        if not rebuild and unused_count * 2 > len(brick_types) + sum(len(refs) for refs in property_value_refs):
+            return self._encode_brv_incremental(file_name, rebuild=True)
 
-                brick_names_bina: bytes = b''
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: ID Assigning........ : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
+        if 'bricks' in self.logs:
+            print(f'{FM.debug} Brick Types............... : {brick_types}')
+            print(f'{FM.debug} Property Table............ : {property_table}')
+            print(f'{FM.debug} String Name to ID Table... : {string_name_to_id_table}')
+            print(f'{FM.debug} Property Key Table........ : {property_key_table}')
+            print(f'{FM.debug} Brick Properties Writing.. : {brv_context.get_bricks_writing()}')
+
+        # Everything is written in this buffer, then written to the file at once
+        brv_data = bytearray()
+
+        # Writes Carriage Return char
+        brv_data += struct_uint8.pack(self.__brv_version)
+        # Write brick count
+        brv_data += struct_uint16.pack(len(bricks_to_write))
+        # Write the number of different brick types
+        brv_data += struct_uint16.pack(len(brick_types))
+        # Write how many properties there are
+        brv_data += struct_uint16.pack(len(property_table))
+
+        # Write each brick type
+        for brick_type in brick_types:
+            brv_data += struct_uint8.pack(len(brick_type))
+            brv_data += small_bin_str(brick_type)
+
+        # Write properties. Values already encoded are reused, unless they're custom, or they may be brick IDs
+        # and brick IDs changed
+        brick_ids_changed: bool = (previous_context is None
+                                   or previous_context.string_name_to_id_table != string_name_to_id_table)
+        for property_type_key, property_type_value in property_table.items():
+            property_codec: PropertyCodec = get_property_codec(property_type_key) or br_untyped_property_codec
+            property_section = brv_context.property_sections.get(property_type_key)
+            if (property_section is None or property_codec.always_encode
+                    or (brick_ids_changed and property_codec.refers_to_bricks)):
+                property_section = (b'', [])
+
+            if len(property_section[1]) < len(property_type_value):
+                new_values_data, new_length_list = self._encode_property_values(
+                    property_type_key, property_type_value[len(property_section[1]):], string_name_to_id_table)
+                property_section = (property_section[0] + new_values_data, property_section[1] + new_length_list)
+                brv_context.property_sections[property_type_key] = property_section
+
+            self._write_property(brv_data, property_type_key, *property_section)
 
-                # Brick Names
-                for brick in self.bricks:
-                    name: str = str(brick[0])  # brick[0] = brick name
-                    brick_names_bina += unsigned_int(len(name), 2)
-                    brick_names_bina += bin_str(name)[2:]
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Properties.... : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
 
-                self.brci_appendix.append(brick_names_bina)
+        # WRITING BRICKS
+        brv_data += b''.join(brick_records)
 
-                # Length
-                brv_file.write(unsigned_int(len(self.brci_appendix), 4))
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Bricks........ : {perf_counter() - previous_time :.6f} seconds')
+            previous_time = perf_counter()
 
-                # Writing data
-                for brci_individual_appendix in self.brci_appendix:
-                    brv_file.write(unsigned_int(len(brci_individual_appendix), 4))
-                    brv_file.write(brci_individual_appendix)
+        self._write_brv_appendix(brv_data, brv_context)
 
-                # USER Appendix
-                if not isinstance(self.user_appendix, list): user_a_use = [self.user_appendix]
-                else: user_a_use = self.user_appendix
-                
-                # Length
-                brv_file.write(unsigned_int(len(self.user_appendix), 4))
+        if 'time' in self.logs:
+            print(f'{FM.debug} Time: Write Appendix...... : {perf_counter() - previous_time :.6f} seconds')
+            print(f'{FM.debug} Time: Total............... : {perf_counter() - begin_time :.6f} seconds')
 
-                # Data
-                for user_individual_appendix in user_a_use:
-                    #uia_use: bytearray = bytearray(user_individual_appendix)
-                    brv_file.write(unsigned_int(len(user_individual_appendix), 4))
-                    brv_file.write(user_individual_appendix)
+        self._brv_incremental_context = brv_context
+        self._last_brv_context = brv_context
 
-                if 'time' in self.logs:
-                    print(f'{FM.debug} Time: Write Appendix...... : {perf_counter() - previous_time :.6f} seconds')
-                    print(f'{FM.debug} Time: Total............... : {perf_counter() - begin_time :.6f} seconds')
+        return brv_data
 
     def debug(self, summary_only=False, write=True, print_bricks=False) -> None:
 
@@ -1187,6 +1644,11 @@ such as emoji.")
         # PRINTING BRICKS
 
         if not summary_only:
+            # Tables from the last write_brv()
+            bricks_writing = self.bricks_writing
+            inverted_property_key_table = self.inverted_property_key_table
+            id_assigned_property_table = self.id_assigned_property_table
+
             for current_brick in range(len(self.bricks)):
 
                 str_to_write += spacer + '\n'
@@ -1194,18 +1656,18 @@ such as emoji.")
                 # BRICK INFORMATION
 
                 str_to_write += named_spacer('BRICK INFORMATION') + '\n'
-                str_to_write += f'BRICK NAME: {self.bricks[current_brick][0]} [ID:{self.bricks_writing[current_brick][0]}]\n'
+                str_to_write += f'BRICK NAME: {self.bricks[current_brick][0]} [ID:{bricks_writing[current_brick][0]}]\n'
                 str_to_write += (f"BRICK TYPE: {self.bricks[current_brick][1]['gbn']} "
-                                 f"[ID: {self.bricks_writing[current_brick][1][0]['gbn']}]\n")
+                                 f"[ID: {bricks_writing[current_brick][1][0]['gbn']}]\n")
                 str_to_write += f"BRICK POS.: {self.bricks[current_brick][1]['Position']}\n"
                 str_to_write += f"BRICK ROT.: {self.bricks[current_brick][1]['Rotation']}\n"
 
                 # BRICK PROPERTIES
                 str_to_write += named_spacer('BRICK PROPERTIES') + '\n'
                 no_properties = True
-                for brick_property, brick_property_value in self.bricks_writing[current_brick][1][1]:
-                    string_property = self.inverted_property_key_table[brick_property]
-                    true_property_value = self.id_assigned_property_table[string_property][brick_property_value]
+                for brick_property, brick_property_value in bricks_writing[current_brick][1][1]:
+                    string_property = inverted_property_key_table[brick_property]
+                    true_property_value = id_assigned_property_table[string_property][brick_property_value]
                     if callable(true_property_value) and true_property_value.__name__ == '<lambda>':
                         str_to_write += (f"{string_property}: "
                                          f"{true_property_value()}"
@@ -1227,8 +1689,13 @@ such as emoji.")
 
         if print_bricks: print(str_to_write)
 
+    # memory_map: parse the file straight from a memory map instead of reading it first. The OS only loads the parts
+    # of the file being read, and the file is never copied. The map is closed once the file is loaded
+    # lazy: only decode bricks when they're accessed. self.bricks then becomes a LazyBrickList
     def load_brv(self, load_vehicle: bool = True, load_brci_data: bool = False, load_appendix: bool = False,
-                 file_name: str = 'Vehicle.brv'):
+                 file_name: str = 'Vehicle.brv', memory_map: bool = False, lazy: bool = False,
+                 types: Iterable[str] | None = None, bbox: tuple[list[float], list[float]] | None = None,
+                 properties: dict[str, any] | None = None, raw_values: bool = False):
 
         previous_time = perf_counter()
         begin_time = perf_counter()
@@ -1240,23 +1707,33 @@ such as emoji.")
         self.ensure_valid_variable_type('logs', f'loading {file_name}')
         self.ensure_valid_variable_type('project_name', f'loading {file_name} (vehicle)')
 
+        # Bricks stored by column are read as arrays, they're never decoded one by one
+        columnar: bool = isinstance(self.bricks, BrickColumns)
+        if columnar and lazy:
+            raise ValueError("Bricks stored by column (BRCI(columnar=True)) can't be loaded lazily.")
+
+        brv_mmap: mmap.mmap | None = None
         with (open(os.path.join(self.in_project_folder_directory, file_name), 'rb') as brv_file_reader):
 
-            brv_file = bytearray(brv_file_reader.read())
+            if memory_map and os.fstat(brv_file_reader.fileno()).st_size > 0:  # Empty files can't be mapped
+                brv_mmap = mmap.mmap(brv_file_reader.fileno(), 0, access=mmap.ACCESS_READ)
+                brv_file = BinaryReader(brv_mmap)
+            else:
+                brv_file = BinaryReader(brv_file_reader.read())
 
         # Removing the first useless byte
-        file_version: int = r_unsigned_int(b_pop(brv_file, 1))
+        file_version: int = brv_file.uint8()
         if file_version < self.__brv_version:
             if self.error_sensitive: raise NotImplementedError(f"BRCI support .brv file version {self.__brv_version} (0x{self.__brv_version:02X}) (BR 1.7) and newer.")
             elif 'no_warnings' not in self.logs: FM.warning_with_header("Unsupported .brv file version.",
                     f"BRCI support .brv file version {self.__brv_version} (BR 1.7) and newer.")
 
         # Get brick count and stuff
-        brick_count = r_unsigned_int(b_pop(brv_file, 2))
+        brick_count = brv_file.uint16()
 
-        brick_type_count = r_unsigned_int(b_pop(brv_file, 2))
+        brick_type_count = brv_file.uint16()
 
-        property_type_count = r_unsigned_int(b_pop(brv_file, 2))
+        property_type_count = brv_file.uint16()
 
         if 'time' in self.logs:
             print(f"{FM.debug} Time: Setup & loading..... : {perf_counter() - previous_time :.6f} seconds")
@@ -1270,9 +1747,9 @@ such as emoji.")
         brick_types: list[str] = []
 
         for _ in range(brick_type_count):
-            brick_type_len = r_unsigned_int(b_pop(brv_file, 1))
+            brick_type_len = brv_file.uint8()
 
-            brick_types += [r_small_bin_str(b_pop(brv_file, brick_type_len))]
+            brick_types += [brv_file.small_str(brick_type_len)]
 
         if 'time' in self.logs:
             print(f"{FM.debug} Time: Brick Types......... : {perf_counter() - previous_time :.6f} seconds")
@@ -1296,226 +1773,330 @@ such as emoji.")
         for r_property in range(property_type_count):
 
             # Getting property name len
-            property_type_icon_len = r_unsigned_int(b_pop(brv_file, 1))
+            property_type_icon_len = brv_file.uint8()
 
             # Getting property & its data
-            property_name = r_small_bin_str(b_pop(brv_file, property_type_icon_len))
-            property_count = r_unsigned_int(b_pop(brv_file, 2))
-            property_byte_len = r_unsigned_int(b_pop(brv_file, 4))
+            property_name = brv_file.small_str(property_type_icon_len)
+            property_count = brv_file.uint16()
+            property_byte_len = brv_file.uint32()
 
             # Assigning property name id and more
             p_id_to_p |= {r_property: property_name}
             p_val_id_to_val |= {property_name: {}}
 
-            property_content: bytes = b_pop(brv_file, property_byte_len)
+            # Not copied: it's a view of the file
+            property_content: memoryview = brv_file.read(property_byte_len)
 
             # Getting all properties length
             if property_count > 1:
-                properties_len: list[int] | int = r_unsigned_int(b_pop(brv_file, 2))
+                properties_len: list[int] | int = brv_file.uint16()
                 if properties_len == 0:
 
-                    properties_len: list[int] = []
-
-                    for _ in range(property_count):
-                        properties_len.append(r_unsigned_int(b_pop(brv_file, 2)))
+                    properties_len: list[int] = list(brv_file.unpack(struct.Struct(f'<{property_count}H')))
             else:
                 properties_len: list[int] = [property_byte_len]
 
             # Get all different properties in a list
             if load_vehicle:
 
-                properties_byte: list[bytes] = []  # REMINDER AS I GET CONFUSED: THIS IS ALL VALUES FOR THE PROPERTY
+                properties_byte: list[memoryview] = []  # REMINDER AS I GET CONFUSED: THIS IS ALL VALUES FOR THE PROPERTY
 
                 # If length is variable
                 if isinstance(properties_len, list):
 
+                    property_value_offset: int = 0
                     for i in properties_len:
-                        properties_byte.append(b_pop(property_content, i))
+                        properties_byte.append(property_content[property_value_offset:property_value_offset + i])
+                        property_value_offset += i
 
                 # If length is constant
                 else:
 
-                    for _ in range(len(property_content) // properties_len):
-                        properties_byte.append(b_pop(property_content, properties_len))
+                    for property_value_offset in range(0, len(property_content) - properties_len + 1, properties_len):
+                        properties_byte.append(property_content[property_value_offset:property_value_offset + properties_len])
 
-                # Convert bytes data
+                # Convert bytes data with the codec of the property (see BRCI_RF/property_codecs.py)
+                property_codec: PropertyCodec | None = get_property_codec(property_name)
 
-                if property_name in br_property_types:
-
-                    for i, property_bin in enumerate(properties_byte):
+                # With raw_values, values are kept as bytes, except the ones BRCI must edit once bricks are loaded:
+                # bricks (their ID becomes their name) and what BrickInput() stands for
+                if raw_values and not (property_codec is not None and (property_codec.refers_to_bricks or property_name.endswith(
+                        ('.InputAxis', '.SourceBricks', '.Value')))):
+                    property_codec = None
 
-                        # Binary was already extracted in properties_byte
-                        match br_property_types[property_name]:
+                if property_codec is not None:
 
-                            case 'bin' | 'custom':
+                    decode = property_codec.decode
+                    invalid_value_found: bool = False
 
-                                p_val_id_to_val[property_name] |= {i: property_bin}
+                    for i, property_bin in enumerate(properties_byte):
+                        try:
+                            # SIEVE THOUGH ALL PROPERTIES AGAIN TO CONVERT BRICK IDS ONCE BRICKS ARE LOADED
+                            p_val_id_to_val[property_name][i] = decode(property_bin)
+                        except (struct.error, IndexError, UnicodeDecodeError):
+                            # Invalid values are kept as they are
+                            p_val_id_to_val[property_name][i] = RawPropertyValue(property_name, bytes(property_bin))
+                            invalid_value_found = True
+
+                    if invalid_value_found:
+                        if self.error_sensitive: raise ValueError(f'Invalid value for property {property_name}. Note: '
+                                                                  'this is a common issue, that occurs when '
+                                                                  'you try to load a .brv file generated '
+                                                                  'in versions before Brick Rigs 1.7.0.')
+                        elif 'no_warnings' not in self.logs: FM.warning_with_header('Invalid value for property',
+                                f'Failed to read a value of {property_name}. It was kept as is (see brci.RawPropertyValue).\n'
+                                'Note: this is a common issue, that occurs when you try to load a .brv file generated in versions before Brick Rigs 1.7.0.')
 
-                            case 'bool':
+                else:
+                    if not raw_values:
+                        if self.error_sensitive: raise ValueError(f"Unknown property type: {property_name}.")
+                        elif 'no_warnings' not in self.logs: FM.warning_with_header("Unknown property type",
+                                f"The vehicle file you're attempting to load contains the property {property_name}.\n"
+                                f"This property is unknown: its values were kept as they are (see brci.RawPropertyValue).")
 
-                                p_val_id_to_val[property_name] |= {i: bool(r_unsigned_int(property_bin))}
+                    for i, property_bin in enumerate(properties_byte):
+                        p_val_id_to_val[property_name][i] = RawPropertyValue(property_name, bytes(property_bin))
 
-                            case 'brick_id':
+        # Debug Logs
+        if 'time' in self.logs:
+            print(f"{FM.debug} Time: Properties (1)...... : {perf_counter() - previous_time :.6f} seconds")
+            # LENGTH OF TEXT : Time: ....................
+            previous_time = perf_counter()
 
-                                # SIEVE THOUGH ALL PROPERTIES AGAIN TO CONVERT IDS ONCE BRICKS ARE LOADED
-                                p_val_id_to_val[property_name] |= {i: r_unsigned_int(property_bin)}
+        if 'bricks' in self.logs:
+            print(f'{FM.debug} Property ID to Property... : {p_id_to_p}')
+            print(f"{FM.debug} P. Value ID to Value (1).. : {p_val_id_to_val}")
 
-                            case 'float':
+        # ---------------------------------------------------
+        # PART III : FILTERS
+        # ---------------------------------------------------
 
-                                p_val_id_to_val[property_name] |= {i: r_bin_float(property_bin)}
+        # Bricks are filtered with what's written in their record, before anything is built for them
+        filter_bricks: bool = load_vehicle and (types is not None or bbox is not None or properties is not None)
+
+        if filter_bricks:
+
+            # IDs of the brick types to keep
+            kept_type_ids: set[int] | None = None
+            if types is not None:
+                types = {types} if isinstance(types, str) else set(types)
+                kept_type_ids = {brick_type_id for brick_type_id, brick_type in enumerate(brick_types)
+                                 if brick_type in types}
+
+            if bbox is not None:
+                (bbox_min_x, bbox_min_y, bbox_min_z), (bbox_max_x, bbox_max_y, bbox_max_z) = bbox
+
+            # For each property to match: its key ID (None if no brick has it), the IDs of the values equal to the
+            # expected value, and whether the default value of each brick type is (for bricks not writing it)
+            property_filters: list[tuple[int | None, set[int], list[bool]]] = []
+            if properties is not None:
+                p_to_p_id: dict[str, int] = {property_name: r_property for r_property, property_name in p_id_to_p.items()}
+                for property_name, expected_value in properties.items():
+                    default_matches: list[bool] = []
+                    for brick_type in brick_types:
+                        default_properties: dict = br_brick_list.get(brick_type, {}) | custom_common_properties
+                        default_matches.append(property_name in default_properties
+                                               and default_properties[property_name] == expected_value)
+                    property_filters.append((p_to_p_id.get(property_name),
+                                             {value_id for value_id, value in p_val_id_to_val[property_name].items()
+                                              if (value.decode() if isinstance(value, RawPropertyValue) else value)
+                                              == expected_value} if property_name in p_val_id_to_val else set(),
+                                             default_matches))
+
+            # If the brick record at record_offset passes every filter
+            def brick_is_kept(buffer: memoryview, record_offset: int) -> bool:
+
+                brick_type_id, _, properties_num = struct_brick_header.unpack_from(buffer, record_offset)
+                if kept_type_ids is not None and brick_type_id not in kept_type_ids:
+                    return False
+
+                property_pairs_offset: int = record_offset + struct_brick_header.size
+                property_pairs_end: int = property_pairs_offset + struct_property_pair.size * properties_num
+
+                if bbox is not None:
+                    brick_px, brick_py, brick_pz = struct_3_float.unpack_from(buffer, property_pairs_end)
+                    if not (bbox_min_x <= brick_px <= bbox_max_x and bbox_min_y <= brick_py <= bbox_max_y
+                            and bbox_min_z <= brick_pz <= bbox_max_z):
+                        return False
+
+                if property_filters:
+                    property_pairs = dict(struct_property_pair.iter_unpack(buffer[property_pairs_offset:property_pairs_end]))
+                    for property_id, value_ids, default_matches in property_filters:
+                        value_id = property_pairs.get(property_id)
+                        if value_id is None:
+                            if not default_matches[brick_type_id]:
+                                return False
+                        elif value_id not in value_ids:
+                            return False
+
+                return True
+
+        # Reading the record of a brick at the offset of brick_reader, as [brick ID, properties]
+        def read_brick(brick_reader: BinaryReader, r_brick: int) -> list:
+
+            # Retrieving the brick type, the length of the property list in bytes (unneeded so just get rids of it)
+            # and the number of properties
+            brick_type_id, _, properties_num = brick_reader.unpack(struct_brick_header)
+            brick_type: str = brick_types[brick_type_id]
 
-                            case 'list[brick_id]':
+            # Saving each property
+            properties_id: list[tuple[int, int]] = []
+            for _ in range(properties_num):
+                properties_id.append(brick_reader.unpack(struct_property_pair))
 
-                                brick_id_list: list[int] = []
+            # Reading position and rotation
+            brick_px, brick_py, brick_pz, brick_ry, brick_rz, brick_rx = brick_reader.unpack(struct_brick_transform)
 
-                                for _ in range(r_unsigned_int(b_pop(property_bin, 1))):
-                                    brick_id_list.append(r_unsigned_int(b_pop(property_bin, 2)))
+            # Converting properties to dictionary
+            properties: dict = {
+                'gbn': brick_type,
+                'Position': [brick_px, brick_py, brick_pz],
+                'Rotation': [brick_rx, brick_ry, brick_rz]
+            }
+            for property_id in properties_id:
+                property_type = p_id_to_p[property_id[0]]
+                property_value = p_val_id_to_val[property_type][property_id[1]]
+                properties[property_type] = property_value
 
-                                p_val_id_to_val[property_name] |= {i: brick_id_list.copy()}
+            return [r_brick, properties]
 
-                            case 'list[3*float]':
+        # Brick IDs used as the value of property_name replaced by brick names
+        def named_value(property_name: str, property_value):
+            if len(brick_id_to_name_table) > 0 and property_value is not None:
+                if br_property_types.get(property_name) == 'brick_id':
+                    return brick_id_to_name_table[property_value]
+                elif br_property_types.get(property_name) == 'list[brick_id]':
+                    return [brick_id_to_name_table[j] for j in property_value]
+            return property_value
 
-                                try: p_val_id_to_val[property_name] |= {i:
-                                                                       [r_bin_float(property_bin[j:j + 4]) for j in
-                                                                        range(0, len(property_bin), 4)]
-                                                                   }
-                                except ValueError:
-                                    if self.error_sensitive: raise ValueError('Invalid byte length for float. Note: '
-                                                                              'this is a common issue, that occurs when '
-                                                                              'you try to load a .brv file generated '
-                                                                              'in versions before Brick Rigs 1.7.0.')
-                                    elif 'no_warnings' not in self.logs: FM.warning_with_header('Invalid byte length for float',
-                                            'Note: this is a common issue, that occurs when you try to load a .brv file generated in versions before Brick Rigs 1.7.0.')
+        # If property_name is one of the properties a BrickInput() stands for (e.g. Input.InputAxis)
+        def is_brick_input_property(property_name: str) -> bool:
+            return property_name not in br_property_types and (property_name.endswith('.InputAxis')
+                                                               or property_name.endswith('.SourceBricks')
+                                                               or property_name.endswith('.Value'))
 
-                            case 'list[3*uint8]':
+        # Updating the BrickInput() property_name stands for (in brick_inputs, by property name) with its value
+        def update_brick_input(brick_inputs: dict[str, BrickInput], property_name: str, property_value) -> None:
 
-                                p_val_id_to_val[property_name] |= {i:
-                                                                       [property_bin[j] for j in
-                                                                        range(len(property_bin))]
-                                                                   }
+            pre_dot_name, post_dot_name = property_name.split('.')[:2]
 
-                            case 'list[3*uint16]':
+            if pre_dot_name not in brick_inputs.keys():
+                brick_inputs[pre_dot_name] = BrickInput('None', None)
 
-                                p_val_id_to_val[property_name] |= {i:
-                                                                       [r_unsigned_int(property_bin[j:j + 2]) for j in
-                                                                        range(0, len(property_bin), 2)]
-                                                                   }
+            if post_dot_name == 'InputAxis':
 
-                            case 'list[4*uint8]':
+                brick_inputs[pre_dot_name].brick_input_type = property_value
 
-                                p_val_id_to_val[property_name] |= {i:
-                                                                       [property_bin[j] for j in
-                                                                        range(len(property_bin))]
-                                                                   # For some reason this outputs little endian?
-                                                                   }
+            elif post_dot_name == 'Value':
 
-                            case 'list[6*uint2]':
+                brick_inputs[pre_dot_name].brick_input = property_value
 
-                                p_val_id_to_val[property_name] |= {
-                                    i: [(r_unsigned_int(property_bin) >> j) & 0x3 for j in range(12, -1, -2)]}
+            else:  # Assuming its .SourceBricks
 
-                            case 'str8':
+                brick_input_list: list[int | str] = property_value
 
-                                p_val_id_to_val[property_name] |= {i: r_small_bin_str(property_bin[1:])}
+                if len(brick_id_to_name_table) > 0:
+                    brick_input_list = [brick_id_to_name_table[j] for j in brick_input_list]
 
-                            case 'str16':
+                brick_inputs[pre_dot_name].brick_input = brick_input_list
 
-                                p_val_id_to_val[property_name] |= {i: r_small_bin_str(b'\xFF\xFE' + property_bin[2:])}
+        # Adding default properties to a brick read by read_brick(), with brick IDs replaced by brick names
+        # and BrickInput() rebuilt
+        def finish_brick(brick: list) -> None:
 
-                            case 'strany':
+            if brick[0] in brick_id_to_name_table:
+                brick[0] = brick_id_to_name_table[brick[0]]
 
-                                if r_signed_int(property_bin[:2]) < 0:
-                                    # It's UTF-16
-                                    # It looks like some 2IQ move is going on here but no we're getting rid of
-                                    # the property length
-                                    p_val_id_to_val[property_name] |= {i: r_bin_str(b'\xFF\xFE') + property_bin[2:]}
-                                else:
-                                    # It's UTF-8
-                                    print(f"pray this works: {property_bin}")
-                                    # pray THIS works
-                                    property_bin = property_bin[2:]
-                                    p_val_id_to_val[property_name] |= {i: r_small_bin_str(property_bin)}
+            brick[1] = create_brick(brick[1]['gbn'], brick_properties=brick[1])  # Default properties come first
 
-                            case 'uint8':
+            # brick[1] = brick properties
 
-                                p_val_id_to_val[property_name] |= {i: r_unsigned_int(property_bin)}
+            properties_to_update: dict[str, any] = {}
+            properties_to_create: dict[str, any] = {}
+            properties_to_delete: set[str] = set()
 
-                elif property_name.endswith('.InputAxis'):  # Presuming it's an input channel's type
+            for b_prop_k, b_prop_v in _shared_property_items(brick[1]):
 
-                    for i, property_bin in enumerate(properties_byte):
-                        p_val_id_to_val[property_name] |= {i: r_small_bin_str(property_bin[1:])}
+                if b_prop_k in br_property_types:
+                    if br_property_types[b_prop_k] in ('brick_id', 'list[brick_id]') and len(brick_id_to_name_table) > 0 and b_prop_v is not None:
 
-                elif property_name.endswith('.Value'):  # Presuming it's an input channel's value
+                        properties_to_update |= {b_prop_k: named_value(b_prop_k, b_prop_v)}
 
-                    for i, property_bin in enumerate(properties_byte):
-                        p_val_id_to_val[property_name] |= {i: r_bin_float(property_bin)}
+                elif is_brick_input_property(b_prop_k):
 
-                elif property_name.endswith('.SourceBricks'):  # Presuming it's a list of brick inputs
+                    update_brick_input(properties_to_create, b_prop_k, b_prop_v)
+                    properties_to_delete.add(b_prop_k)
 
-                    for i, property_bin in enumerate(properties_byte):
-                        # SIEVE THROUGH ALL PROPERTIES AGAIN TO CONVERT THEM
-                        p_val_id_to_val[property_name] |= {i: property_bin}
+            brick[1].update(properties_to_update)
 
-                else:
-                    if self.error_sensitive: raise ValueError(f"Unknown property type: {property_name}.")
-                    elif 'no_warnings' not in self.logs: FM.warning_with_header("Unknown property type",
-                            f"The vehicle file you're attempting to load contains the property {property_name}.\n"
-                            f"This property is unknown, and was ignored by BRCI. It's contents weren't loaded.")
+            for property_to_delete in properties_to_delete:
+                del brick[1][property_to_delete]
 
-        # Debug Logs
-        if 'time' in self.logs:
-            print(f"{FM.debug} Time: Properties (1)...... : {perf_counter() - previous_time :.6f} seconds")
-            # LENGTH OF TEXT : Time: ....................
-            previous_time = perf_counter()
+            brick[1] |= properties_to_create
 
-        if 'bricks' in self.logs:
-            print(f'{FM.debug} Property ID to Property... : {p_id_to_p}')
-            print(f"{FM.debug} P. Value ID to Value (1).. : {p_val_id_to_val}")
+        # IDs of the bricks kept by filters, None if they're all kept
+        kept_brick_ids: list[int] | None = [] if filter_bricks else None
 
         # Reading all bricks
-        for r_brick in range(brick_count):
-
-            # Retrieving the brick type
-            brick_type: str = brick_types[r_unsigned_int(b_pop(brv_file, 2))]
+        if load_vehicle and lazy:
+
+            # Only finding where the record of each (kept) brick begins: they're read when accessed
+            record_offsets: list[int] = []
+            record_brick_ids: list[int] = []
+            for r_brick in range(brick_count):
+                if not filter_bricks or brick_is_kept(brv_file.buffer, brv_file.offset):
+                    record_offsets.append(brv_file.offset)
+                    record_brick_ids.append(r_brick)
+                    if filter_bricks:
+                        kept_brick_ids.append(r_brick)
+                # The length doesn't include the brick type and itself, but includes the number of properties
+                _, brick_data_len, _ = brv_file.unpack(struct_brick_header)
+                brv_file.skip(brick_data_len - 1)
+
+            brick_reader = BinaryReader(brv_file.buffer)
+
+            def load_brick(brick_index: int) -> list:
+                brick_reader.offset = record_offsets[brick_index]
+                brick = read_brick(brick_reader, record_brick_ids[brick_index])
+                finish_brick(brick)
+                return brick
+
+            # It releases the file (and closes its memory map) once every brick is decoded
+            self.bricks = LazyBrickList(self.bricks, len(record_offsets), load_brick, brv_file.buffer, brv_mmap)
+
+        elif load_vehicle and columnar:
+
+            if filter_bricks:
+                record_offset: int = brv_file.offset
+                for r_brick in range(brick_count):
+                    if brick_is_kept(brv_file.buffer, record_offset):
+                        kept_brick_ids.append(r_brick)
+                    # The length doesn't include the brick type and itself, but includes the number of properties
+                    record_offset += 6 + struct_brick_header.unpack_from(brv_file.buffer, record_offset)[1]
+
+            # All records at once. Bricks are added to the columns once their names are known
+            (record_type_ids, record_pair_offsets, record_pairs, record_positions, record_rotations,
+             brv_file.offset) = np_unpack_brick_records(brv_file.buffer, brv_file.offset, brick_count)
+            # Copied, as they may be views of the file
+            record_type_ids, record_pairs, record_positions, record_rotations = (
+                record_type_ids.copy(), record_pairs.copy(), record_positions.copy(), record_rotations.copy())
 
-            # Reading properties
-            # Length of the property list in bytes (unneeded so just get rids of it)
-            b_pop(brv_file, 4)
-            # Reading the number of properties
-            properties_num: int = r_unsigned_int(b_pop(brv_file, 1))
-            # Saving each property
-            properties_id: list[tuple[int, int]] = []
-            for _ in range(properties_num):
-                property_type_id: int = r_unsigned_int(b_pop(brv_file, 2))
-                property_value_id: int = r_unsigned_int(b_pop(brv_file, 2))
-                properties_id += [(property_type_id, property_value_id)]
+        else:
 
-            # Reading position and rotation
-            brick_px: float = r_bin_float(b_pop(brv_file, 4))
-            brick_py: float = r_bin_float(b_pop(brv_file, 4))
-            brick_pz: float = r_bin_float(b_pop(brv_file, 4))
-            brick_ry: float = r_bin_float(b_pop(brv_file, 4))
-            brick_rz: float = r_bin_float(b_pop(brv_file, 4))
-            brick_rx: float = r_bin_float(b_pop(brv_file, 4))
+            for r_brick in range(brick_count):
+                if load_vehicle and (not filter_bricks or brick_is_kept(brv_file.buffer, brv_file.offset)):
+                    self.bricks.append(read_brick(brv_file, r_brick))
+                    if filter_bricks:
+                        kept_brick_ids.append(r_brick)
+                else:
+                    # The length doesn't include the brick type and itself, but includes the number of properties
+                    _, brick_data_len, _ = brv_file.unpack(struct_brick_header)
+                    brv_file.skip(brick_data_len - 1)
 
-            # Converting properties to dictionary
-            if load_vehicle:
-                properties: dict = {
-                    'gbn': brick_type,
-                    'Position': [brick_px, brick_py, brick_pz],
-                    'Rotation': [brick_rx, brick_ry, brick_rz]
-                }
-                for property_id in properties_id:
-                    property_type = p_id_to_p[property_id[0]]
-                    property_value = p_val_id_to_val[property_type][property_id[1]]
-                    properties[property_type] = property_value
-
-                self.bricks.append([r_brick, properties])
-
-        # Seats
-        seat = r_unsigned_int(b_pop(brv_file, 2))
+        # Seats. Brick IDs are replaced by brick names once they're known. There is no seat if filters didn't keep it
+        seat = brv_file.uint16()
         if load_vehicle:
-            if seat == 0:
+            if seat == 0 or (kept_brick_ids is not None and seat not in kept_brick_ids):
                 self.seat_brick = None
             else:
                 self.seat_brick = seat
@@ -1533,15 +2114,15 @@ such as emoji.")
         brick_id_to_name_table: dict[int: str] = {}
 
         # Loading additional data (names)
-        if load_brci_data and brv_file != '':
+        if load_brci_data and brv_file.remaining() > 0:
 
-            brci_data_elements = r_unsigned_int(b_pop(brv_file, 4))
+            brci_data_elements = brv_file.uint32()
 
             # Get rid of the description
-            b_pop(brv_file, r_unsigned_int(b_pop(brv_file, 4)))
+            brv_file.skip(brv_file.uint32())
             brci_data_elements -= 1
 
-            file_version: str = r_small_bin_str(b_pop(brv_file, r_unsigned_int(b_pop(brv_file, 4))))
+            file_version: str = brv_file.small_str(brv_file.uint32())
             brci_data_elements -= 1
 
             f_maj_vers, f_min_vers = file_version[0], file_version[1:]
@@ -1565,20 +2146,18 @@ such as emoji.")
 
                 # BRCI C45 BRCI DATA VERSION:
 
-                b_pop(brv_file, 4)
+                brv_file.skip(4)
 
                 for i in range(brick_count):
 
-                    brick_name = r_bin_str(b'\xFF\xFE' + b_pop(brv_file, r_unsigned_int(b_pop(brv_file, 2)) * 2))
-                    if load_vehicle:
-                        self.bricks[i][0] = brick_name
+                    brick_name = brv_file.str16(brv_file.uint16())
                     brick_id_to_name_table |= {i: brick_name}
 
                 brci_data_elements -= 1
 
             # Clear any remaining data
             while brci_data_elements > 0:
-                b_pop(brv_file, r_unsigned_int(b_pop(brv_file, 4)))
+                brv_file.skip(brv_file.uint32())
                 brci_data_elements -= 1
 
         if 'time' in self.logs:
@@ -1589,22 +2168,36 @@ such as emoji.")
         if 'bricks' in self.logs:
             print(f'{FM.debug} BRCI Data / Id to Name.... : {brick_id_to_name_table}')
 
-        if load_appendix and brv_file != '':
+        # The seat is named like its brick
+        if load_vehicle and self.seat_brick is not None:
+            self.seat_brick = brick_id_to_name_table.get(self.seat_brick, self.seat_brick)
+
+        if load_appendix and brv_file.remaining() > 0:
 
             # Getting rid of brci data if required
             if not load_brci_data:
-                brci_data_elements: int = r_unsigned_int(b_pop(brv_file, 4))
+                brci_data_elements: int = brv_file.uint32()
 
                 while brci_data_elements > 0:
-                    b_pop(brv_file, r_unsigned_int(b_pop(brv_file, 4)))
+                    brv_file.skip(brv_file.uint32())
                     brci_data_elements -= 1
 
             self.user_appendix = []
 
-            user_appendix_len: int = r_unsigned_int(b_pop(brv_file, 4))
+            user_appendix_len: int = brv_file.uint32()
 
             for _ in range(user_appendix_len):
-                self.user_appendix.append(b_pop(brv_file, r_unsigned_int(b_pop(brv_file, 4))))
+                self.user_appendix.append(bytes(brv_file.read(brv_file.uint32())))
+
+        # Every value was copied out of the file: views of it can be released, then the memory map closed.
+        # Lazy bricks still need it: LazyBrickList closes it once they're all decoded, or with data.bricks.close()
+        property_content = properties_byte = property_bin = None
+        if load_vehicle and lazy:
+            if self.bricks.not_loaded == 0:
+                self.bricks.close()
+        elif brv_mmap is not None:
+            brv_file.buffer.release()
+            brv_mmap.close()
 
         if 'time' in self.logs:
             print(f"{FM.debug} Time: Load User Appendix.. : {perf_counter() - previous_time :.6f} seconds")
@@ -1614,70 +2207,46 @@ such as emoji.")
         if 'bricks' in self.logs:
             print(f'{FM.debug} User Appendix............. : {self.user_appendix}')
 
-        # Fixing brick ids now that we have all bricks & their name (I want to sleep)
-        if load_vehicle:
-
-            for brick in self.bricks:
-
-                brick[1] = create_brick(brick[1]['gbn']) | brick[1]  # We don't do the |= thing since order matters
-
-                # brick[1] = brick properties
-
-                properties_to_update: dict[str, any] = {}
-                properties_to_create: dict[str, any] = {}
-                properties_to_delete: set[str] = set()
-
-                for b_prop_k, b_prop_v in brick[1].items():
-
-                    if b_prop_k in br_property_types:
-                        if br_property_types[b_prop_k] == 'brick_id' and len(brick_id_to_name_table) > 0:
-
-                            properties_to_update |= {b_prop_k: brick_id_to_name_table[b_prop_v]}
-
-                        elif br_property_types[b_prop_k] == 'list[brick_id]' and len(brick_id_to_name_table) > 0:
-
-                            brick_str_id_list: list[str] = []
-
-                            for i in range(len(b_prop_v)):
-                                brick_str_id_list.append(brick_id_to_name_table[b_prop_v[i]])
-
-                            properties_to_update |= {b_prop_k: brick_str_id_list}  # Todo
-
-                    elif (b_prop_k.endswith('.InputAxis')
-                          or b_prop_k.endswith('.SourceBricks')
-                          or b_prop_k.endswith('.Value')):
-
-                        pre_dot_name, post_dot_name = b_prop_k.split('.')[:2]
-
-                        if pre_dot_name not in properties_to_create.keys():
-                            properties_to_create[pre_dot_name] = BrickInput('None', None)
-
-                        if post_dot_name == 'InputAxis':
-
-                            properties_to_create[pre_dot_name].brick_input_type = b_prop_v
-
-                        elif post_dot_name == 'Value':
-
-                            properties_to_create[pre_dot_name].brick_input = b_prop_v
-
-                        else:  # Assuming its .SourceBricks
-
-                            brick_input_list: list[int | str] = [r_unsigned_int(b_prop_v[i:i + 2]) for i in
-                                                                 range(0, len(b_prop_v), 2)]
-
-                            if len(brick_id_to_name_table) > 0:
-                                brick_input_list = [brick_id_to_name_table[j - 1] for j in brick_input_list]
-
-                            properties_to_create[pre_dot_name].brick_input = brick_input_list
-
-                        properties_to_delete.add(b_prop_k)
+        # Adding bricks to the columns, with brick IDs replaced by brick names and BrickInput() rebuilt
+        if load_vehicle and columnar:
+
+            kept_record_ids: np.ndarray = (np.arange(brick_count) if kept_brick_ids is None
+                                           else np.asarray(kept_brick_ids, dtype=np.int64))
+            # Index of each kept brick in the columns added, by brick ID. -1 if it isn't kept
+            brick_indexes: np.ndarray = np.full(brick_count, -1, dtype=np.int64)
+            brick_indexes[kept_record_ids] = np.arange(len(kept_record_ids))
+            pair_brick_indexes: list[int] = brick_indexes[
+                np.repeat(np.arange(brick_count), np.diff(record_pair_offsets))].tolist()
+
+            column_properties: dict[str, dict[int, any]] = {}
+            # Brick index -> property name -> BrickInput()
+            column_brick_inputs: dict[int, dict[str, BrickInput]] = {}
+            for brick_index, (property_id, property_value_id) in zip(pair_brick_indexes, record_pairs.tolist()):
+                if brick_index < 0:
+                    continue
+                property_name: str = p_id_to_p[property_id]
+                property_value = p_val_id_to_val[property_name][property_value_id]
+                if is_brick_input_property(property_name):
+                    update_brick_input(column_brick_inputs.setdefault(brick_index, {}), property_name, property_value)
+                else:
+                    column_properties.setdefault(property_name, {})[brick_index] = named_value(property_name,
+                                                                                               property_value)
+            for brick_index, brick_inputs in column_brick_inputs.items():
+                for property_name, brick_input in brick_inputs.items():
+                    column_properties.setdefault(property_name, {})[brick_index] = brick_input
 
-                brick[1].update(properties_to_update)
+            self.bricks.extend_columns([brick_id_to_name_table.get(r_brick, r_brick) for r_brick in kept_record_ids.tolist()],
+                                       brick_types, record_type_ids[kept_record_ids], record_positions[kept_record_ids],
+                                       record_rotations[kept_record_ids], column_properties)
 
-                for property_to_delete in properties_to_delete:
-                    del brick[1][property_to_delete]
+        # Fixing brick ids now that we have all bricks & their name (I want to sleep)
+        elif load_vehicle and not lazy:
 
-                brick[1] |= properties_to_create
+            for brick in self.bricks:
+                finish_brick(brick)
+            # Bricks were renamed. Bricks loaded lazily before (LazyBrickList) aren't indexed by name
+            if isinstance(self.bricks, BrickList):
+                self.bricks.reindex()
 
         if 'time' in self.logs:
             print(f"{FM.debug} Time: Bricks (2).......... : {perf_counter() - previous_time :.6f} seconds")
@@ -1705,72 +2274,70 @@ such as emoji.")
             #print("opening metadata file")
             with open(os.path.join(self.in_project_folder_directory, file_name), 'rb') as metadata_file_reader:
                 #print(f"opening {file_name}")
-                metadata_file = bytearray(metadata_file_reader.read())
+                metadata = read_brm(BinaryReader(metadata_file_reader.read()))
 
-            # del metadata_file[:1]
-            file_version: int = r_unsigned_int(b_pop(metadata_file, 1))
-            if file_version < self.__brv_version:
+            if metadata.file_version < self.__brv_version:
                 if self.error_sensitive:
                     raise NotImplementedError(
                         f"BRCI support .brv file version {self.__brv_version} (0x{self.__brv_version:02X}) (BR 1.7) and newer.")
                 elif 'no_warnings' not in self.logs:
                     FM.warning_with_header("Unsupported .brv file version.", f"BRCI support .brv file version {self.__brv_version} (BR 1.7) and newer.")
 
-            name_len: int = r_signed_int(b_pop(metadata_file, 2))
-            #print(f"name len: {name_len}")
-            if name_len >= 0:
-                #print("UTF-8")
-                # UTF-8
-                name: str = r_small_bin_str(b_pop(metadata_file, name_len))
-                #print(f"name: {name}")
-            else:
-                #print("UTF-16")
-                # UTF-16
-                name: str = r_bin_str(b_pop(metadata_file, -name_len*2))
-                #print(f"name: {name}")
             if load_display_name:
-                #print(f"project display name set to {name}")
-                self.project_display_name = name
-
-            description_len: int = r_signed_int(b_pop(metadata_file, 2))
-            if description_len >= 0:
-                # UTF-8
-                description: str = r_small_bin_str(b_pop(metadata_file, description_len))
-            else:
-                # UTF-16
-                description: str = r_bin_str(b_pop(metadata_file, -description_len*2))
+                self.project_display_name = metadata.display_name
             if load_description:
-                self.file_description = description
+                self.file_description = metadata.description
+            if load_creation_time:
+                self.creation_timestamp = metadata.creation_timestamp
+            if load_update_time:
+                self.update_timestamp = metadata.update_timestamp
+            if load_visibility:
+                self.visibility = metadata.visibility
+            if load_tags:
+                self.tags = metadata.tags.copy()
 
-            # Get rid of brick count, vehicle size, weight & worth (we don't need that)
-            b_pop(metadata_file, 22)
+    # --------------------------------------------------
+    # ASYNC
+    # --------------------------------------------------
 
-            # Get rid of the author
-            author_len = r_unsigned_int(b_pop(metadata_file, 1))
-            b_pop(metadata_file, ceil(author_len / 2))
+    # Same as load_brv(), but awaitable: the file is loaded on a thread, so the event loop isn't blocked
+    async def aload_brv(self, *load_brv_args, **load_brv_kwargs):
+        async with async_semaphore():
+            return await asyncio.to_thread(self.load_brv, *load_brv_args, **load_brv_kwargs)
 
-            # Creation time
-            creation_timestamp = r_unsigned_int(b_pop(metadata_file, 8))
-            last_update_timestamp = r_unsigned_int(b_pop(metadata_file, 8))
-            if load_creation_time:
-                self.creation_timestamp = creation_timestamp
-            if load_update_time:
-                self.update_timestamp = last_update_timestamp
+    # Loading a project folder (folder holding a Vehicle.brv file) in a new BRCI instance, see aload_brv()
+    @classmethod
+    async def aload(cls, project_folder: str | os.PathLike, logs: list[str] | None = None,
+                    **load_brv_kwargs) -> 'BRCI':
+        project_folder = os.path.abspath(project_folder)
+        creation = cls(project_folder_directory=os.path.dirname(project_folder),
+                       project_name=os.path.basename(project_folder), logs=logs)
+        return await creation.aload_brv(**load_brv_kwargs)
 
-            visibility: int = r_unsigned_int(b_pop(metadata_file, 1))
+    # Same as write_brv(), but awaitable: the file is encoded and written on a thread, so the event loop isn't blocked.
+    # process_pool: executor (e.g. a ProcessPoolExecutor) the file is encoded in instead, so it doesn't hold the GIL of
+    # this process. The creation is then pickled, and incremental_writing doesn't apply.
+    async def awrite_brv(self, file_name: str = 'Vehicle.brv', process_pool: Executor | None = None) -> None:
+        async with async_semaphore():
 
-            if load_visibility:
-                self.visibility = visibility
-
-            tags: list[str] = []
-            for _ in range(3):
-                if metadata_file: # If there's still something to take
-                    tag_len = r_unsigned_int(b_pop(metadata_file, 1))
-                    print(f"if i dont print this, the entire read-metadata function breaks. welcome to brci: {b_pop(metadata_file, tag_len)}")
-                    tag = r_small_bin_str(b_pop(metadata_file, tag_len))
-                    tags.append(tag)
-            if load_tags:
-                self.tags = tags.copy()
+            if process_pool is None or self.write_blank:
+                await asyncio.to_thread(self.write_brv, file_name)
+                return
+
+            self.ensure_valid_variable_type('project_name', f'writing {file_name} (vehicle)')
+            brv_data: bytes = await asyncio.get_running_loop().run_in_executor(process_pool, BRCI.to_brv_bytes, self)
+
+            def write_brv_data() -> None:
+                self.ensure_project_directory_exists()
+                with open(os.path.join(self.in_project_folder_directory, file_name), 'wb') as brv_file:
+                    brv_file.write(brv_data)
+
+            await asyncio.to_thread(write_brv_data)
+
+    # Same as write_to_br(), but awaitable: the project folder is copied on a thread
+    async def awrite_to_br(self) -> None:
+        async with async_semaphore():
+            await asyncio.to_thread(self.write_to_br)
 
 
     @staticmethod
@@ -1798,4 +2365,120 @@ such as emoji.")
         return missing_values
 
 
-# --------------------------------------------------
\ No newline at end of file
+# --------------------------------------------------
+
+
+# ------------------------------------------------------------
+# ASYNC
+# ------------------------------------------------------------
+
+
+# Largest number of BRCI async calls (aload(), aload_brv(), awrite_brv(), awrite_to_br()) running at once on an event
+# loop, shared by all creations. None for the number of CPUs
+_async_concurrency: int | None = None
+# Event loop -> semaphore limiting the calls running on it
+_async_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = weakref.WeakKeyDictionary()
+
+
+# Setting how many BRCI async calls may run at once. Calls already running are not affected
+def set_async_concurrency(limit: int | None) -> None:
+    global _async_concurrency
+
+    if limit is not None and limit < 1:
+        raise ValueError(f'limit must be at least 1, not {limit}.')
+
+    _async_concurrency = limit
+    _async_semaphores.clear()
+
+
+# Semaphore limiting BRCI async calls on the running event loop. You may also use it to limit your own calls
+def async_semaphore() -> asyncio.Semaphore:
+
+    event_loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(event_loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_async_concurrency or os.cpu_count() or 1)
+        _async_semaphores[event_loop] = semaphore
+
+    return semaphore
+
+
+# ------------------------------------------------------------
+# BATCH EXPORT
+# ------------------------------------------------------------
+
+
+# Exporting creations (BRCI instances, or functions returning one) in a worker process.
+# Returns (creation index, None if exported or the traceback of the error) for each of them
+def _batch_export_chunk(jobs: list[tuple[int, bytes]], export_functions: tuple[str, ...]) -> list[tuple[int, str | None]]:
+
+    results: list[tuple[int, str | None]] = []
+
+    for job_index, pickled_job in jobs:
+        try:
+            creation = pickle.loads(pickled_job)
+            # Generator callables build the creation in the worker
+            if not isinstance(creation, BRCI) and callable(creation):
+                creation = creation()
+            if not isinstance(creation, BRCI):
+                raise TypeError(f'A BRCI instance was expected, not (a) {type(creation).__name__} ({creation!r}).')
+
+            for export_function in export_functions:
+                getattr(creation, export_function)()
+            results.append((job_index, None))
+
+        except Exception:
+            results.append((job_index, traceback.format_exc()))
+
+    return results
+
+
+# Exporting many creations at once on several processes.
+# creations: BRCI instances, or functions returning one (they must be picklable, e.g. defined at module level).
+# Creations are sent to workers by chunks of chunk_size, with at most max_in_flight chunks waiting or being exported,
+# so creations are only taken from the iterable (and kept in memory) when a worker is about to need them.
+# A creation failing to export doesn't stop the others: its error is kept in the report.
+def batch_export(creations: Iterable['BRCI | Callable[[], BRCI]'], workers: int | None = None, chunk_size: int = 16,
+                 max_in_flight: int | None = None, write_preview: bool = True, write_metadata: bool = True,
+                 write_brv: bool = True, write_to_br: bool = False, logs: list[str] | None = None) -> BatchExportReport:
+
+    if logs is None:
+        logs = ['time']
+
+    export_functions: tuple[str, ...] = tuple(export_function for export_function, enabled in (
+        ('write_preview', write_preview), ('write_metadata', write_metadata),
+        ('write_brv', write_brv), ('write_to_br', write_to_br)) if enabled)
+
+    report = BatchExportReport()
+    begin_time = perf_counter()
+
+    def pickled_creations() -> Iterable[tuple[int, bytes]]:
+        for job_index, creation in enumerate(creations):
+            # Pickling here so a creation that can't be sent to a worker only fails itself
+            try:
+                yield job_index, pickle.dumps(creation, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                report.failed[job_index] = traceback.format_exc()
+                if 'no_warnings' not in logs: FM.warning_with_header(f'Failed to export creation {job_index}',
+                        report.failed[job_index])
+
+    for chunk_jobs, chunk_results, chunk_error in process_in_chunks(
+            _batch_export_chunk, pickled_creations(), (export_functions,), workers, chunk_size, max_in_flight):
+        if chunk_error is not None:
+            # The worker itself failed (e.g. it was killed): the whole chunk failed
+            chunk_results = [(job_index, chunk_error) for job_index, _ in chunk_jobs]
+        for job_index, job_error in chunk_results:
+            if job_error is None:
+                report.exported += 1
+            else:
+                report.failed[job_index] = job_error
+                if 'no_warnings' not in logs: FM.warning_with_header(f'Failed to export creation {job_index}',
+                        job_error)
+
+    report.seconds = perf_counter() - begin_time
+
+    if 'time' in logs:
+        print(f"{FM.info} Batch export: {report.exported} creation(s) exported, {len(report.failed)} failed, "
+              f"in {report.seconds:.3f} seconds ({report.vehicles_per_second:.1f} vehicles/s)")
+
+    return report
@@ -0,0 +1,49 @@
+import argparse
+import importlib
+import sys
+
+from . import BRCI, batch_export
+
+
+# python -m BRCI batch my_module:creations [--workers 8] ...
+# my_module:creations is an iterable of creations (BRCI instances or functions returning one),
+# or a function returning such an iterable.
+def main(arguments: list[str] | None = None) -> int:
+
+    parser = argparse.ArgumentParser(prog='python -m BRCI', description='Brick Rigs Creation Interface')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch_parser = subparsers.add_parser('batch', help='export many creations at once on several processes')
+    batch_parser.add_argument('creations', help='module:attribute of the creations to export (or of a function '
+                                                'returning them), e.g. my_vehicles:build_all')
+    batch_parser.add_argument('--workers', type=int, default=None, help='number of processes (default: CPU count)')
+    batch_parser.add_argument('--chunk-size', type=int, default=16, help='creations sent to a worker at once')
+    batch_parser.add_argument('--max-in-flight', type=int, default=None,
+                              help='maximum number of chunks waiting or being exported (default: 2 per worker)')
+    batch_parser.add_argument('--no-preview', action='store_true', help="don't write Preview.png")
+    batch_parser.add_argument('--no-metadata', action='store_true', help="don't write MetaData.brm")
+    batch_parser.add_argument('--no-brv', action='store_true', help="don't write Vehicle.brv")
+    batch_parser.add_argument('--write-to-br', action='store_true', help="copy creations to Brick Rigs' folder")
+
+    parsed_arguments = parser.parse_args(arguments)
+
+    # Finding the creations
+    module_name, _, attribute_name = parsed_arguments.creations.partition(':')
+    if not attribute_name:
+        parser.error(f'creations must be given as module:attribute, not {parsed_arguments.creations!r}.')
+    # Allowing modules from the current directory, like python would for a script
+    sys.path.insert(0, '')
+    creations = getattr(importlib.import_module(module_name), attribute_name)
+    if callable(creations) and not isinstance(creations, BRCI):
+        creations = creations()
+
+    report = batch_export(creations, workers=parsed_arguments.workers, chunk_size=parsed_arguments.chunk_size,
+                          max_in_flight=parsed_arguments.max_in_flight, write_preview=not parsed_arguments.no_preview,
+                          write_metadata=not parsed_arguments.no_metadata, write_brv=not parsed_arguments.no_brv,
+                          write_to_br=parsed_arguments.write_to_br)
+
+    return 1 if report.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())